@@ -0,0 +1,87 @@
+import asyncio
+import time
+from django.conf import settings
+from .cache import carry_trees, keep_trees
+from .logic import tasks
+from .offload import Overloaded, compute_pool
+from .output import output_guard
+
+CACHED_KINDS = ('analyze', 'solve')
+
+
+def _elapsed_ms(started):
+    return round((time.perf_counter() - started) * 1000, 3)
+
+
+class BatchRunner:
+    def __init__(self, pool, workers=4, max_operations=32):
+        self.pool = pool
+        self.workers = workers
+        self.max_operations = max_operations
+
+    def plan(self, operations):
+        if not isinstance(operations, list) or not operations:
+            raise ValueError("Список операцій порожній.")
+        if len(operations) > self.max_operations:
+            raise ValueError(f"Забагато операцій: {len(operations)} (максимум {self.max_operations}).")
+        planned = []
+        for i, op in enumerate(operations):
+            if isinstance(op, str):
+                op = {'op': op}
+            if not isinstance(op, dict) or not isinstance(op.get('params') or {}, dict):
+                planned.append((f"#{i + 1}", None, None))
+                continue
+            kind = op.get('op')
+            key = str(op.get('key') or kind)
+            if any(key == other for other, _, _ in planned):
+                key = f"{key}#{i + 1}"
+            params = {k: v for k, v in op.items() if k not in ('op', 'key')}
+            params.update(op.get('params') or {})
+            planned.append((key, kind, params))
+        return planned
+
+    async def _run_one(self, graph, kind, params, slots):
+        started = time.perf_counter()
+        try:
+            if params is None:
+                raise ValueError("Операція має бути об'єктом або рядком.")
+            if kind not in tasks.TASKS:
+                raise ValueError(f"Невідома операція: {kind}. Доступні: {', '.join(tasks.TASKS)}.")
+            bounded, paged = output_guard.bound(kind, graph.n, graph.m, params)
+            async with slots:
+                if kind in CACHED_KINDS:
+                    result, hit = await self.pool.run_cached(kind, graph, bounded)
+                elif kind == 'dijkstra':
+                    result, hit = keep_trees(await self.pool.run(kind, graph, carry_trees(graph, bounded))), False
+                else:
+                    result, hit = await self.pool.run(kind, graph, bounded), False
+            if paged:
+                result = output_guard.continued(kind, graph.content_hash(), result, params)
+            return {'op': kind, 'ok': True, 'cached': hit, 'time_ms': _elapsed_ms(started), 'result': result}
+        except Overloaded:
+            raise
+        except Exception as e:
+            return {'op': kind, 'ok': False, 'time_ms': _elapsed_ms(started), 'error': str(e)}
+
+    async def run(self, graph, operations, defaults=None):
+        started = time.perf_counter()
+        planned = self.plan(operations)
+        slots = asyncio.Semaphore(max(1, min(self.workers, self.pool.workers)))
+        outcomes = await asyncio.gather(*(
+            self._run_one(graph, kind, None if params is None else {**(defaults or {}), **params}, slots)
+            for _, kind, params in planned
+        ))
+        results = {key: outcome for (key, _, _), outcome in zip(planned, outcomes)}
+        return {
+            'success': all(item['ok'] for item in results.values()),
+            'results': results,
+            'time_ms': _elapsed_ms(started),
+        }
+
+
+def _build_runner():
+    conf = getattr(settings, 'GRAPH_BATCH', {})
+    return BatchRunner(compute_pool, conf.get('WORKERS', 4), conf.get('MAX_OPERATIONS', 32))
+
+
+batch_runner = _build_runner()
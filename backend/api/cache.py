@@ -0,0 +1,141 @@
+import threading
+import time
+from collections import OrderedDict
+from django.conf import settings
+from .logic.pathfinding import TreeCarrier, tree_key
+
+
+class MemoryBackend:
+    def __init__(self, max_entries=256, ttl=600):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            expires, value = item
+            if expires is not None and expires < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        expires = time.monotonic() + self.ttl if self.ttl else None
+        with self._lock:
+            self._data[key] = (expires, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            return self._data.pop(key, None) is not None
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def size(self):
+        return len(self._data)
+
+
+class DjangoCacheBackend:
+    def __init__(self, alias='default', ttl=600):
+        from django.core.cache import caches
+        self.cache = caches[alias]
+        self.ttl = ttl
+
+    def get(self, key):
+        return self.cache.get(key)
+
+    def set(self, key, value):
+        self.cache.set(key, value, timeout=self.ttl or None)
+
+    def clear(self):
+        self.cache.clear()
+
+    def size(self):
+        return None
+
+
+class ResultCache:
+    def __init__(self, backend):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def lookup(self, namespace, key):
+        value = self.backend.get(f"graph:{namespace}:{key}")
+        with self._lock:
+            if value is not None:
+                self.hits += 1
+            else:
+                self.misses += 1
+        return value
+
+    def get_or_compute(self, namespace, key, compute):
+        value = self.lookup(namespace, key)
+        if value is not None:
+            return value, True
+        value = compute()
+        self.put(namespace, key, value)
+        return value, False
+
+    def put(self, namespace, key, value):
+        self.backend.set(f"graph:{namespace}:{key}", value)
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            'backend': type(self.backend).__name__,
+            'entries': self.backend.size(),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / total, 4) if total else 0.0,
+        }
+
+    def clear(self):
+        self.backend.clear()
+        with self._lock:
+            self.hits = self.misses = 0
+
+
+def _build_cache():
+    conf = getattr(settings, 'GRAPH_RESULT_CACHE', {})
+    ttl = conf.get('TTL', 600)
+    if conf.get('BACKEND', 'memory') == 'django':
+        return ResultCache(DjangoCacheBackend(conf.get('ALIAS', 'default'), ttl))
+    return ResultCache(MemoryBackend(conf.get('MAX_ENTRIES', 256), ttl))
+
+
+def _build_tree_cache():
+    conf = getattr(settings, 'GRAPH_RESULT_CACHE', {})
+    return MemoryBackend(conf.get('PATH_TREES', 512), conf.get('TTL', 600))
+
+
+def carry_trees(graph, params):
+    # the tree cache lives in the web process: hand a worker the trees this query can reuse
+    trees = {}
+    for node_id, reverse in ((params.get('start_node'), False), (params.get('end_node'), True)):
+        if str(node_id) in graph.index:
+            key = tree_key(graph, graph.index[str(node_id)], reverse)
+            tree = path_tree_cache.get(key)
+            if tree is not None:
+                trees[key] = tree
+    return {**params, 'tree_cache': TreeCarrier(trees)}
+
+
+def keep_trees(result):
+    for key, tree in result.pop('_trees', {}).items():
+        path_tree_cache.set(key, tree)
+    return result
+
+
+result_cache = _build_cache()
+path_tree_cache = _build_tree_cache()
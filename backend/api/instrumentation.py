@@ -0,0 +1,230 @@
+import cProfile
+import io
+import pstats
+import threading
+import time
+import tracemalloc
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from .logic import profiling
+
+TRUTHY = ('1', 'true', 'yes')
+
+
+class Metrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.started_at = time.time()
+            self.requests = {}
+            self.phases = {}
+
+    @staticmethod
+    def _bump(table, name, wall_ms, cpu_ms):
+        entry = table.setdefault(name, {'count': 0, 'wall_ms': 0.0, 'cpu_ms': 0.0, 'max_wall_ms': 0.0})
+        entry['count'] += 1
+        entry['wall_ms'] += wall_ms
+        entry['cpu_ms'] += cpu_ms
+        entry['max_wall_ms'] = max(entry['max_wall_ms'], wall_ms)
+
+    def record(self, route, wall_ms, cpu_ms, phases):
+        with self._lock:
+            self._bump(self.requests, route, wall_ms, cpu_ms)
+            for item in phases:
+                self._bump(self.phases, item['name'], item['wall_ms'], item['cpu_ms'])
+
+    @staticmethod
+    def _rounded(table):
+        return {
+            name: {**entry, 'wall_ms': round(entry['wall_ms'], 3), 'cpu_ms': round(entry['cpu_ms'], 3),
+                   'avg_wall_ms': round(entry['wall_ms'] / entry['count'], 3), 'max_wall_ms': round(entry['max_wall_ms'], 3)}
+            for name, entry in table.items()
+        }
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'since': self.started_at,
+                'requests': self._rounded(self.requests),
+                'phases': self._rounded(self.phases),
+            }
+
+
+metrics = Metrics()
+
+
+def _server_timing(phases):
+    totals = {}
+    for item in phases:
+        wall, cpu = totals.get(item['name'], (0.0, 0.0))
+        totals[item['name']] = (wall + item['wall_ms'], cpu + item['cpu_ms'])
+    return ", ".join(
+        f'{name};dur={wall:.3f};desc="cpu {cpu:.3f} ms"' for name, (wall, cpu) in totals.items()
+    )
+
+
+class MemoryTracing:
+    def __init__(self):
+        self._users = 0
+        self._owned = False
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        with self._lock:
+            if not self._users and not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._owned = True
+            self._users += 1
+
+    def release(self):
+        with self._lock:
+            self._users -= 1
+            if not self._users and self._owned:
+                tracemalloc.stop()
+                self._owned = False
+
+
+memory_tracing = MemoryTracing()
+
+
+class _Snapshot:
+    def __init__(self, stats):
+        self.stats = stats
+
+    def create_stats(self):
+        pass
+
+
+class WorkerProfile:
+    # stands in for cProfile.Profile under ASGI: merges the stats sent back by the pool workers
+    def __init__(self, recorder):
+        self.recorder = recorder
+        self.stats = {}
+
+    def enable(self):
+        pass
+
+    def disable(self):
+        pass
+
+    def create_stats(self):
+        merged = pstats.Stats()
+        for stats in self.recorder.profiles:
+            merged.add(_Snapshot(stats))
+        self.stats = merged.stats
+
+    def dump_stats(self, path):
+        pstats.Stats(self).dump_stats(path)
+
+
+class InstrumentationMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.conf = getattr(settings, 'GRAPH_INSTRUMENTATION', {})
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def _flag(self, request, name):
+        return request.GET.get(name, '').lower() in TRUTHY
+
+    def _start(self, request):
+        want_timings = self._flag(request, 'timings')
+        want_profile = self._flag(request, 'profile') and self.conf.get('ALLOW_PROFILE', settings.DEBUG)
+        # under ASGI the event loop thread serves every request at once, so its clock, tracemalloc and a
+        # thread profiler would mix them up; memory and profiles then come from the pool workers only
+        traced = want_timings and not self.async_mode
+        if traced:
+            memory_tracing.acquire()
+        recorder = profiling.PhaseRecorder(memory=want_timings, profile=want_profile)
+        profiler = None
+        if want_profile:
+            profiler = WorkerProfile(recorder) if self.async_mode else cProfile.Profile()
+        request._graph_recorder, request._graph_timings, request._graph_profiler = recorder, want_timings, profiler
+        token = profiling.activate(recorder)
+        if profiler:
+            profiler.enable()
+        return recorder, profiler, token, traced, time.perf_counter(), time.thread_time()
+
+    def _stop(self, state):
+        recorder, profiler, token, traced = state[:4]
+        if profiler:
+            profiler.disable()
+        profiling.deactivate(token)
+        if traced:
+            memory_tracing.release()
+
+    def _finish(self, request, response, state):
+        recorder, profiler, wall, cpu = state[0], state[1], state[4], state[5]
+        wall = (time.perf_counter() - wall) * 1000
+        phases = recorder.report()
+        if self.async_mode:
+            # top-level phases ran on a thread or worker of their own, or between two awaits
+            cpu = sum(item['cpu_ms'] for item in phases if '.' not in item['name'])
+        else:
+            cpu = (time.thread_time() - cpu) * 1000
+        match = getattr(request, 'resolver_match', None)
+        metrics.record(match.route if match else request.path, wall, cpu, phases)
+        timing = _server_timing(phases + [{'name': 'total', 'wall_ms': wall, 'cpu_ms': cpu}])
+        response['Server-Timing'] = timing
+        if profiler and self.conf.get('PROFILE_DIR'):
+            name = f"{time.strftime('%Y%m%d-%H%M%S')}-{request.path.strip('/').replace('/', '_') or 'root'}.prof"
+            profiler.dump_stats(f"{self.conf['PROFILE_DIR']}/{name}")
+            response['X-Profile'] = name
+        return response
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        if not self.conf.get('ENABLED', True):
+            return self.get_response(request)
+        state = self._start(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            self._stop(state)
+        return self._finish(request, response, state)
+
+    async def __acall__(self, request):
+        if not self.conf.get('ENABLED', True):
+            return await self.get_response(request)
+        state = self._start(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            self._stop(state)
+        return self._finish(request, response, state)
+
+    def _profile_text(self, profiler):
+        stream = io.StringIO()
+        pstats.Stats(profiler, stream=stream).sort_stats('cumulative').print_stats(self.conf.get('PROFILE_LINES', 30))
+        return stream.getvalue().splitlines()
+
+    def process_template_response(self, request, response):
+        recorder = getattr(request, '_graph_recorder', None)
+        if recorder is None:
+            return response
+        data = getattr(response, 'data', None)
+        if isinstance(data, dict):
+            extra = {}
+            if getattr(request, '_graph_timings', False):
+                extra['_timings'] = recorder.report()
+            profiler = getattr(request, '_graph_profiler', None)
+            if profiler is not None:
+                profiler.disable()
+                extra['_profile'] = self._profile_text(profiler)
+            if extra:
+                response.data = {**data, **extra}
+        started = time.perf_counter(), time.thread_time()
+
+        def serialized(rendered):
+            recorder.add('serialize', (time.perf_counter() - started[0]) * 1000, (time.thread_time() - started[1]) * 1000)
+
+        response.add_post_render_callback(serialized)
+        return response
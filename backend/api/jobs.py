@@ -0,0 +1,174 @@
+import multiprocessing
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.db import close_old_connections
+from .cache import result_cache
+from .logic import tasks
+from .logic.graph_core import compile_graph
+
+FINISHED = ('done', 'failed', 'timeout', 'cancelled')
+CACHED_KINDS = ('analyze', 'solve')
+
+
+class MemoryJobStore:
+    def __init__(self, retention):
+        self.retention = retention
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def create(self, kind):
+        job_id = str(uuid.uuid4())
+        now = time.time()
+        with self._lock:
+            self._jobs = {k: j for k, j in self._jobs.items()
+                          if j['status'] not in FINISHED or now - j['updated_at'] < self.retention}
+            self._jobs[job_id] = {'id': job_id, 'kind': kind, 'status': 'queued', 'progress': 0.0,
+                                  'result': None, 'error': '', 'created_at': now, 'updated_at': now}
+        return job_id
+
+    def get(self, job_id):
+        with self._lock:
+            job = self._jobs.get(str(job_id))
+            return dict(job) if job else None
+
+    def update(self, job_id, **fields):
+        with self._lock:
+            job = self._jobs.get(str(job_id))
+            if job is None:
+                return
+            if job['status'] in FINISHED and fields.get('status') != job['status']:
+                return
+            job.update(fields, updated_at=time.time())
+
+
+class DatabaseJobStore:
+    def __init__(self, retention):
+        self.retention = retention
+
+    def create(self, kind):
+        from django.utils import timezone
+        from .models import AnalysisJob
+        AnalysisJob.objects.filter(
+            status__in=FINISHED, updated_at__lt=timezone.now() - timezone.timedelta(seconds=self.retention)
+        ).delete()
+        return str(AnalysisJob.objects.create(kind=kind).id)
+
+    def get(self, job_id):
+        from .models import AnalysisJob
+        job = AnalysisJob.objects.filter(id=job_id).values().first()
+        if job is None:
+            return None
+        job['id'] = str(job['id'])
+        job['created_at'] = job['created_at'].timestamp()
+        job['updated_at'] = job['updated_at'].timestamp()
+        return job
+
+    def update(self, job_id, **fields):
+        from django.utils import timezone
+        from .models import AnalysisJob
+        AnalysisJob.objects.filter(id=job_id).exclude(status__in=FINISHED).update(updated_at=timezone.now(), **fields)
+
+
+class JobRunner:
+    def __init__(self, store, workers=2, timeout=60):
+        self.store = store
+        self.timeout = timeout
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='graph-job')
+        self._procs = {}
+        self._lock = threading.Lock()
+        method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+        self._ctx = multiprocessing.get_context(method)
+        if method == 'forkserver':
+            self._ctx.set_forkserver_preload(['api.logic.tasks'])
+
+    def time_limit(self, timeout=None):
+        if timeout is None:
+            return self.timeout
+        try:
+            timeout = float(timeout)
+        except (TypeError, ValueError):
+            raise ValueError(f"Некоректний ліміт часу: {timeout}.")
+        if timeout <= 0:
+            raise ValueError("Ліміт часу має бути додатним.")
+        return min(timeout, self.timeout)
+
+    def submit(self, kind, payload, timeout=None):
+        timeout = self.time_limit(timeout)
+        job_id = self.store.create(kind)
+        self._pool.submit(self._supervise, job_id, kind, payload, timeout)
+        return job_id
+
+    def cancel(self, job_id):
+        job = self.store.get(job_id)
+        if job is None or job['status'] in FINISHED:
+            return job
+        self.store.update(job_id, status='cancelled')
+        with self._lock:
+            proc = self._procs.get(str(job_id))
+        if proc is not None:
+            proc.terminate()
+        return self.store.get(job_id)
+
+    def _supervise(self, job_id, kind, payload, timeout):
+        try:
+            job = self.store.get(job_id)
+            if job is None or job['status'] != 'queued':
+                return
+            receiver, sender = self._ctx.Pipe(duplex=False)
+            proc = self._ctx.Process(target=tasks.process_main, args=(kind, payload, sender), daemon=True)
+            proc.start()
+            sender.close()
+            with self._lock:
+                self._procs[job_id] = proc
+            self.store.update(job_id, status='running')
+            self._wait(job_id, kind, payload, proc, receiver, timeout)
+            proc.join(timeout=1)
+        except Exception as e:
+            self.store.update(job_id, status='failed', error=str(e))
+        finally:
+            with self._lock:
+                self._procs.pop(job_id, None)
+            close_old_connections()
+
+    def _wait(self, job_id, kind, payload, proc, receiver, timeout):
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                proc.terminate()
+                self.store.update(job_id, status='timeout', error=f"Перевищено ліміт часу ({timeout:g} с)")
+                return
+            if not receiver.poll(min(remaining, 0.5)):
+                continue
+            try:
+                event, value = receiver.recv()
+            except EOFError:
+                self.store.update(job_id, status='failed', error="Обчислювальний процес завершився аварійно")
+                return
+            if event == 'progress':
+                self.store.update(job_id, progress=value)
+            elif event == 'done':
+                self.store.update(job_id, status='done', progress=1.0, result=value)
+                if kind in CACHED_KINDS:
+                    self._remember(kind, payload, value)
+                return
+            else:
+                self.store.update(job_id, status='failed', error=value)
+                return
+
+    def _remember(self, kind, payload, result):
+        graph = compile_graph(payload.get('nodes', []), payload.get('edges', []), payload.get('is_directed', False))
+        result_cache.put(tasks.cache_namespace(kind, payload), graph.content_hash(), result)
+
+
+def _build_runner():
+    conf = getattr(settings, 'GRAPH_JOBS', {})
+    retention = conf.get('RETENTION', 3600)
+    store = DatabaseJobStore(retention) if conf.get('STORE', 'memory') == 'database' else MemoryJobStore(retention)
+    return JobRunner(store, conf.get('WORKERS', 2), conf.get('TIMEOUT', 60))
+
+
+job_runner = _build_runner()
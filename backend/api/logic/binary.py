@@ -0,0 +1,132 @@
+import json
+import struct
+import numpy as np
+
+GRAPH_MAGIC = b'GRPH'
+MATRIX_MAGIC = b'GMTX'
+VERSION = 1
+
+FLAG_DIRECTED = 1
+FLAG_LABELS = 2
+FLAG_OPTIONS = 4
+
+GRAPH_HEADER = struct.Struct('<4sBBHII')
+MATRIX_HEADER = struct.Struct('<4sBBBxIIII')
+SECTION = struct.Struct('<I')
+
+MATRIX_LAYOUTS = ('dense', 'coo', 'csr')
+MATRIX_DTYPES = ('int8', 'int16', 'int32', 'int64', 'float64')
+
+
+def _take(buffer, offset, dtype, count):
+    size = np.dtype(dtype).itemsize * count
+    if offset + size > len(buffer):
+        raise ValueError("Пошкоджений бінарний граф: дані обрізано.")
+    return np.frombuffer(buffer, dtype=dtype, count=count, offset=offset), offset + size
+
+
+def _section(buffer, offset):
+    (size,), offset = SECTION.unpack_from(buffer, offset), offset + SECTION.size
+    if offset + size > len(buffer):
+        raise ValueError("Пошкоджений бінарний граф: дані обрізано.")
+    return buffer[offset:offset + size], offset + size
+
+
+def decode_graph(data):
+    buffer = memoryview(data).cast('B')
+    if len(buffer) < GRAPH_HEADER.size:
+        raise ValueError("Пошкоджений бінарний граф: заголовок обрізано.")
+    magic, version, flags, _, n, m = GRAPH_HEADER.unpack_from(buffer)
+    if magic != GRAPH_MAGIC:
+        raise ValueError("Невідомий бінарний формат графа.")
+    if version != VERSION:
+        raise ValueError(f"Непідтримувана версія бінарного графа: {version}.")
+    offset = GRAPH_HEADER.size
+    weight, offset = _take(buffer, offset, '<f8', m)
+    ids, offset = _take(buffer, offset, '<i4', n)
+    src, offset = _take(buffer, offset, '<i4', m)
+    dst, offset = _take(buffer, offset, '<i4', m)
+    nodes = {'id': ids}
+    if flags & FLAG_LABELS:
+        bounds, offset = _take(buffer, offset, '<u4', n + 1)
+        blob, offset = _section(buffer, offset)
+        text = bytes(blob)
+        bounds = bounds.tolist()
+        nodes['label'] = [text[bounds[i]:bounds[i + 1]].decode() for i in range(n)]
+    payload = {}
+    if flags & FLAG_OPTIONS:
+        blob, offset = _section(buffer, offset)
+        payload = json.loads(bytes(blob))
+        if not isinstance(payload, dict):
+            raise ValueError("Пошкоджений бінарний граф: параметри мають бути об'єктом.")
+    has_weight = ~np.isnan(weight)
+    payload.update({
+        'nodes': nodes,
+        'edges': {'from': src, 'to': dst, 'weight': np.where(has_weight, weight, 1.0), 'hasWeight': has_weight},
+        'is_directed': bool(flags & FLAG_DIRECTED),
+    })
+    return payload
+
+
+def encode_graph(ids, src, dst, weight=None, labels=None, is_directed=False, options=None):
+    ids = np.ascontiguousarray(ids, dtype='<i4')
+    src = np.ascontiguousarray(src, dtype='<i4')
+    dst = np.ascontiguousarray(dst, dtype='<i4')
+    if weight is None:
+        weight = np.full(len(src), np.nan)
+    weight = np.ascontiguousarray(weight, dtype='<f8')
+    flags = (FLAG_DIRECTED if is_directed else 0) | (FLAG_LABELS if labels is not None else 0) | (FLAG_OPTIONS if options else 0)
+    parts = [GRAPH_HEADER.pack(GRAPH_MAGIC, VERSION, flags, 0, len(ids), len(src)),
+             weight.tobytes(), ids.tobytes(), src.tobytes(), dst.tobytes()]
+    if labels is not None:
+        encoded = [str(label).encode() for label in labels]
+        parts.append(np.cumsum([0] + [len(label) for label in encoded], dtype='<u4').tobytes())
+        blob = b''.join(encoded)
+        parts += [SECTION.pack(len(blob)), blob]
+    if options:
+        blob = json.dumps(options, ensure_ascii=False).encode()
+        parts += [SECTION.pack(len(blob)), blob]
+    return b''.join(parts)
+
+
+def encode_matrix(matrix, layout='dense'):
+    if layout not in MATRIX_LAYOUTS:
+        raise ValueError(f"Невідомий формат матриці: {layout}. Доступні: {', '.join(MATRIX_LAYOUTS)}.")
+    matrix = matrix.tocsr()
+    matrix.sum_duplicates()
+    dtype = np.dtype(matrix.dtype.name)
+    if dtype.name not in MATRIX_DTYPES:
+        matrix, dtype = matrix.astype(np.float64), np.dtype(np.float64)
+    little = dtype.newbyteorder('<')
+    rows, cols = matrix.shape
+    header = MATRIX_HEADER.pack(MATRIX_MAGIC, VERSION, MATRIX_LAYOUTS.index(layout),
+                                MATRIX_DTYPES.index(dtype.name), rows, cols, matrix.nnz, 0)
+    if layout == 'dense':
+        return header + np.ascontiguousarray(matrix.toarray(), dtype=little).tobytes()
+    if layout == 'csr':
+        index = [matrix.indptr, matrix.indices]
+    else:
+        coo = matrix.tocoo()
+        index = [coo.row, coo.col]
+        matrix = coo
+    return header + b''.join(np.ascontiguousarray(a, dtype='<i4').tobytes() for a in index) \
+        + np.ascontiguousarray(matrix.data, dtype=little).tobytes()
+
+
+def decode_matrix(data):
+    buffer = memoryview(data).cast('B')
+    if len(buffer) < MATRIX_HEADER.size:
+        raise ValueError("Пошкоджена бінарна матриця: заголовок обрізано.")
+    magic, version, layout, dtype, rows, cols, nnz, _ = MATRIX_HEADER.unpack_from(buffer)
+    if magic != MATRIX_MAGIC or version != VERSION:
+        raise ValueError("Невідомий бінарний формат матриці.")
+    layout, dtype = MATRIX_LAYOUTS[layout], np.dtype(MATRIX_DTYPES[dtype]).newbyteorder('<')
+    offset = MATRIX_HEADER.size
+    if layout == 'dense':
+        values, _ = _take(buffer, offset, dtype, rows * cols)
+        return {'format': layout, 'shape': [rows, cols], 'data': values.reshape(rows, cols)}
+    first, offset = _take(buffer, offset, '<i4', rows + 1 if layout == 'csr' else nnz)
+    second, offset = _take(buffer, offset, '<i4', nnz)
+    values, _ = _take(buffer, offset, dtype, nnz)
+    keys = ('indptr', 'indices') if layout == 'csr' else ('row', 'col')
+    return {'format': layout, 'shape': [rows, cols], keys[0]: first, keys[1]: second, 'data': values}
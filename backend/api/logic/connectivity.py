@@ -0,0 +1,72 @@
+import numpy as np
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import maximum_flow
+
+
+class ConnectivityEngine:
+    def __init__(self, graph):
+        self.graph = graph
+        self.n = graph.n
+        keep = graph.src != graph.dst
+        self.src, self.dst = graph.src[keep], graph.dst[keep]
+        self.degree = (np.bincount(self.src, minlength=self.n) + np.bincount(self.dst, minlength=self.n)).tolist()
+        self.neighbors = graph.undirected_neighbors()
+
+    def _connected(self):
+        return self.n > 1 and self.graph.components_count() == 1
+
+    def _split_network(self):
+        n = self.n
+        pairs = np.array([(u, v) for u in range(n) for v in self.neighbors[u]], dtype=np.int32).reshape(-1, 2)
+        rows = np.concatenate([np.arange(n, dtype=np.int32), pairs[:, 0] + n])
+        cols = np.concatenate([np.arange(n, dtype=np.int32) + n, pairs[:, 1]])
+        return csr_matrix((np.ones(len(rows), dtype=np.int32), (rows, cols)), shape=(2 * n, 2 * n))
+
+    def _multi_network(self):
+        rows = np.concatenate([self.src, self.dst])
+        cols = np.concatenate([self.dst, self.src])
+        return csr_matrix((np.ones(len(rows), dtype=np.int32), (rows, cols)), shape=(self.n, self.n))
+
+    def vertex_connectivity(self):
+        n, adj = self.n, self.neighbors
+        if not self._connected():
+            return 0
+        best = min(len(row) for row in adj)
+        if best == n - 1:
+            return best
+        if n >= 3 and self.graph.cut_structure()[0]:
+            return 1
+        v = min(range(n), key=lambda u: len(adj[u]))
+        pairs = [(v, w) for w in range(n) if w != v and w not in adj[v]]
+        around = sorted(adj[v])
+        pairs += [(x, y) for i, x in enumerate(around) for y in around[i + 1:] if y not in adj[x]]
+        network = None
+        for s, t in pairs:
+            if len(adj[s] & adj[t]) >= best:
+                continue
+            if network is None:
+                network = self._split_network()
+            best = min(best, int(maximum_flow(network, s + n, t, method='dinic').flow_value))
+            if best <= 2:
+                break
+        return best
+
+    def edge_connectivity(self, lower=0):
+        n = self.n
+        if not self._connected():
+            return 0
+        best = min(self.degree)
+        if best <= max(lower, 1):
+            return best
+        if self.graph.cut_structure()[1]:
+            return 1
+        network = self._multi_network()
+        for s in range(n - 1):
+            best = min(best, int(maximum_flow(network, s, s + 1, method='dinic').flow_value))
+            if best <= max(lower, 2):
+                break
+        return best
+
+    def summary(self):
+        kappa = self.vertex_connectivity()
+        return kappa, self.edge_connectivity(kappa)
@@ -0,0 +1,112 @@
+import time
+from collections import deque
+
+
+def _is_acyclic(n, out):
+    indeg = [0] * n
+    for u in range(n):
+        for v in out[u]:
+            indeg[v] += 1
+    queue = deque(u for u in range(n) if indeg[u] == 0)
+    seen = 0
+    while queue:
+        u = queue.popleft()
+        seen += 1
+        for v in out[u]:
+            indeg[v] -= 1
+            if indeg[v] == 0:
+                queue.append(v)
+    return seen == n
+
+
+def _trace(parent, u):
+    path = []
+    while u != -1:
+        path.append(u)
+        u = parent[u]
+    return path
+
+
+def _girth_directed(n, out, lower_bound):
+    best, cycle = n + 1, []
+    dist, parent, stamp = [0] * n, [-1] * n, [-1] * n
+    for s in range(n):
+        stamp[s], dist[s], parent[s] = s, 0, -1
+        queue = deque([s])
+        while queue:
+            u = queue.popleft()
+            if dist[u] + 1 >= best:
+                break
+            closed = False
+            for w in out[u]:
+                if w == s:
+                    best = dist[u] + 1
+                    cycle = _trace(parent, u)[::-1] + [s]
+                    closed = True
+                    break
+                if stamp[w] != s:
+                    stamp[w], dist[w], parent[w] = s, dist[u] + 1, u
+                    queue.append(w)
+            if closed:
+                break
+        if best == lower_bound:
+            break
+    return cycle
+
+
+def _girth_undirected(n, adj):
+    best, cycle = n + 1, []
+    dist, parent, stamp = [0] * n, [-1] * n, [-1] * n
+    for r in range(n):
+        stamp[r], dist[r], parent[r] = r, 0, -1
+        queue = deque([r])
+        while queue:
+            u = queue.popleft()
+            if 2 * dist[u] >= best:
+                break
+            for w in adj[u]:
+                if stamp[w] != r:
+                    stamp[w], dist[w], parent[w] = r, dist[u] + 1, u
+                    queue.append(w)
+                elif w != parent[u] and dist[u] + dist[w] + 1 < best:
+                    best = dist[u] + dist[w] + 1
+                    cycle = _trace(parent, u)[::-1] + _trace(parent, w)
+        if best == 3:
+            break
+    return cycle
+
+
+def _find_shortest_cycle(graph):
+    n = graph.n
+    if not n or not graph.m:
+        return []
+    loops = graph.src[graph.src == graph.dst]
+    if len(loops):
+        u = int(loops.min())
+        return [u, u]
+    adj = graph.simple_neighbors()
+    if not graph.is_directed:
+        for u in range(n):
+            seen = set()
+            for v, e in graph.adjacency()[u]:
+                if v in seen:
+                    return [u, v, u]
+                seen.add(v)
+        simple_edges = sum(len(nbrs) for nbrs in adj) // 2
+        if simple_edges <= n - graph.components_count():
+            return []
+        return _girth_undirected(n, adj)
+    sets = [set(nbrs) for nbrs in adj]
+    for u in range(n):
+        for v in adj[u]:
+            if u in sets[v]:
+                return [u, v, u]
+    if _is_acyclic(n, adj):
+        return []
+    return _girth_directed(n, adj, 3)
+
+
+def shortest_cycle(graph):
+    started = time.perf_counter()
+    cycle = _find_shortest_cycle(graph)
+    return cycle, round((time.perf_counter() - started) * 1000, 3)
@@ -0,0 +1,128 @@
+import numpy as np
+import networkx as nx
+from scipy.optimize import linear_sum_assignment
+from .graph_core import _csr
+from .pathfinding import PathFinder, INF
+
+EULER_MODES = ('auto', 'postman')
+
+
+def _hierholzer(n, src, dst, is_directed, start):
+    m = len(src)
+    e_idx = np.arange(m, dtype=np.int32)
+    if is_directed:
+        ptr, nbr, eid = _csr(n, src, dst, e_idx)
+    else:
+        back = src != dst
+        ptr, nbr, eid = _csr(n, np.concatenate([src, dst[back]]), np.concatenate([dst, src[back]]),
+                             np.concatenate([e_idx, e_idx[back]]))
+    ptr, nbr, eid = ptr.tolist(), nbr.tolist(), eid.tolist()
+    cursor, used = ptr[:-1], bytearray(m)
+    stack, stack_edges = [start], [-1]
+    path, edges = [], []
+    while stack:
+        u = stack[-1]
+        i, end = cursor[u], ptr[u + 1]
+        while i < end and used[eid[i]]:
+            i += 1
+        if i == end:
+            cursor[u] = i
+            path.append(stack.pop())
+            edges.append(stack_edges.pop())
+        else:
+            cursor[u] = i + 1
+            used[eid[i]] = 1
+            stack.append(nbr[i])
+            stack_edges.append(eid[i])
+    path.reverse()
+    edges.reverse()
+    return path, edges[1:]
+
+
+class EulerEngine:
+    def __init__(self, graph):
+        self.graph = graph
+        self.n, self.m = graph.n, graph.m
+        self.is_directed = graph.is_directed
+        if self.is_directed:
+            self.balance = graph.out_degrees() - graph.in_degrees()
+        else:
+            self.balance = graph.degrees() % 2
+        self.touched = graph.degrees() > 0
+
+    def _start(self):
+        if self.is_directed:
+            heads = np.flatnonzero(self.balance)
+            if not len(heads):
+                return 'cycle', int(np.argmax(self.touched))
+            if len(heads) == 2 and sorted(self.balance[heads].tolist()) == [-1, 1]:
+                return 'path', int(heads[self.balance[heads] == 1][0])
+            return None, None
+        odd = np.flatnonzero(self.balance)
+        if not len(odd):
+            return 'cycle', int(np.argmax(self.touched))
+        if len(odd) == 2:
+            return 'path', int(odd[0])
+        return None, None
+
+    def trail(self):
+        if not self.m:
+            return None, [], []
+        kind, start = self._start()
+        if kind is None:
+            return None, [], []
+        g = self.graph
+        path, edges = _hierholzer(self.n, g.src, g.dst, self.is_directed, start)
+        if len(edges) < self.m:
+            return None, [], []
+        return kind, path, edges
+
+    def _pairs(self, finder):
+        if self.is_directed:
+            tails = np.repeat(np.flatnonzero(self.balance < 0), -self.balance[self.balance < 0])
+            heads = np.repeat(np.flatnonzero(self.balance > 0), self.balance[self.balance > 0])
+        else:
+            tails = heads = np.flatnonzero(self.balance)
+        if not len(tails):
+            return None, {}
+        trees = {int(u): finder.shortest_path_tree(int(u)) for u in np.unique(tails)}
+        cost = np.array([[trees[int(u)][0][int(v)] for v in heads] for u in tails])
+        if self.is_directed:
+            finite = np.where(np.isinf(cost), 0, cost)
+            rows, cols = linear_sum_assignment(np.where(np.isinf(cost), finite.sum() + 1, cost))
+            pairs = [(int(tails[r]), int(heads[c])) for r, c in zip(rows, cols)]
+        else:
+            complete = nx.Graph()
+            for i, u in enumerate(tails.tolist()):
+                for j in range(i + 1, len(tails)):
+                    if cost[i, j] < INF:
+                        complete.add_edge(u, int(tails[j]), weight=cost[i, j])
+            pairs = list(nx.min_weight_matching(complete))
+            if 2 * len(pairs) != len(tails):
+                return None, trees
+        if any(trees[u][0][v] == INF for u, v in pairs):
+            return None, trees
+        return pairs, trees
+
+    def postman(self):
+        g = self.graph
+        if not self.m or (g.weight < 0).any():
+            return None, [], [], []
+        kind, path, edges = self.trail()
+        if kind == 'cycle':
+            return kind, path, edges, []
+        pairs, trees = self._pairs(PathFinder(g))
+        if pairs is None:
+            return None, [], [], []
+        duplicated = []
+        for u, v in pairs:
+            pred, pred_edge = trees[u][1], trees[u][2]
+            while v != u:
+                duplicated.append(pred_edge[v])
+                v = pred[v]
+        origin = np.concatenate([np.arange(self.m), np.asarray(duplicated, dtype=np.int64)])
+        start = int(np.argmax(self.touched))
+        path, edges = _hierholzer(self.n, g.src[origin], g.dst[origin], self.is_directed, start)
+        if len(edges) < len(origin):
+            return None, [], [], []
+        return 'postman', path, origin[edges].tolist(), sorted(duplicated)
@@ -0,0 +1,339 @@
+import hashlib
+import json
+import numpy as np
+import networkx as nx
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
+from .profiling import instrumented, phase
+
+
+def _weight_value(raw_weight, has_weight):
+    try:
+        w = float(raw_weight) if raw_weight is not None else 1.0
+    except (ValueError, TypeError):
+        w = 1.0
+    return w, bool(has_weight) or (raw_weight is not None)
+
+
+def parse_weight(edge):
+    return _weight_value(edge.get('weight'), edge.get('hasWeight'))
+
+
+def _column(table, key, size=0, default=None):
+    values = table.get(key)
+    if values is None:
+        return [default] * size
+    return values.tolist() if isinstance(values, np.ndarray) else values
+
+
+def _packed(nodes, edges):
+    return (isinstance(nodes, dict) and isinstance(nodes.get('id'), np.ndarray)
+            and isinstance(edges, dict) and isinstance(edges.get('from'), np.ndarray))
+
+
+def _node_rows(nodes):
+    if isinstance(nodes, dict):
+        ids = _column(nodes, 'id')
+        labels = _column(nodes, 'label', len(ids))
+        return ((n_id, f"v{n_id}" if label is None else label) for n_id, label in zip(ids, labels))
+    return ((node['id'], node.get('label', f"v{node['id']}")) for node in nodes or [])
+
+
+def _edge_rows(edges):
+    if isinstance(edges, dict):
+        src = _column(edges, 'from')
+        m = len(src)
+        return zip(src, _column(edges, 'to', m), _column(edges, 'weight', m),
+                   _column(edges, 'hasWeight', m, False), _column(edges, 'id', m))
+    return ((edge.get('from'), edge.get('to'), edge.get('weight'), edge.get('hasWeight'), edge.get('id'))
+            for edge in edges or [])
+
+
+def _csr(n, rows, cols, slots):
+    order = np.lexsort((slots, rows))
+    ptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=n), out=ptr[1:])
+    return ptr, cols[order].astype(np.int32), slots[order].astype(np.int32)
+
+
+def _cut_structure(n, adj):
+    disc, low = [-1] * n, [0] * n
+    articulation, bridges = set(), []
+    t = 0
+    for root in range(n):
+        if disc[root] != -1: continue
+        disc[root] = low[root] = t
+        t += 1
+        children = 0
+        stack = [(root, -1, iter(adj[root]))]
+        while stack:
+            u, parent_edge, it = stack[-1]
+            descended = False
+            for v, e in it:
+                if e == parent_edge or v == u: continue
+                if disc[v] == -1:
+                    disc[v] = low[v] = t
+                    t += 1
+                    stack.append((v, e, iter(adj[v])))
+                    descended = True
+                    break
+                if disc[v] < low[u]:
+                    low[u] = disc[v]
+            if descended: continue
+            stack.pop()
+            if not stack: continue
+            p = stack[-1][0]
+            if low[u] < low[p]:
+                low[p] = low[u]
+            if low[u] > disc[p]:
+                bridges.append(parent_edge)
+            if len(stack) == 1:
+                children += 1
+            elif low[u] >= disc[p]:
+                articulation.add(p)
+        if children > 1:
+            articulation.add(root)
+    return articulation, bridges
+
+
+def node_count(nodes):
+    if isinstance(nodes, dict):
+        ids = nodes.get('id')
+        return 0 if ids is None else len(ids)
+    return len(nodes or [])
+
+
+def node_dicts(nodes):
+    if not isinstance(nodes, dict):
+        return nodes or []
+    return [{'id': n_id, 'label': label} for n_id, label in _node_rows(nodes)]
+
+
+def edge_dicts(edges):
+    if not isinstance(edges, dict):
+        return edges or []
+    return [{'id': edge_id, 'from': frm, 'to': to, 'weight': w, 'hasWeight': bool(has_w)}
+            for frm, to, w, has_w, edge_id in _edge_rows(edges)]
+
+
+class CompiledGraph:
+    def __init__(self, nodes, edges, is_directed=False):
+        self.is_directed = bool(is_directed)
+        if _packed(nodes, edges):
+            self._load_arrays(nodes, edges)
+        else:
+            self._load_rows(nodes, edges)
+        self._build_csr()
+        self._adj = None
+        self._undirected_adj = None
+        self._cut = None
+        self._nx = None
+        self._components = None
+        self._simple = None
+        self._undirected_sets = None
+        self._hash = None
+
+    def _load_rows(self, nodes, edges):
+        self.raw_ids, self.ids, self.labels = [], [], []
+        self.index = {}
+        for raw_id, label in _node_rows(nodes):
+            n_id = str(raw_id)
+            if n_id in self.index: continue
+            self.index[n_id] = len(self.ids)
+            self.raw_ids.append(raw_id)
+            self.ids.append(n_id)
+            self.labels.append(label)
+        src, dst, weight, has_weight, edge_ids = [], [], [], [], []
+        for frm, to, raw_weight, raw_has_weight, edge_id in _edge_rows(edges):
+            u = self.index.get(str(frm))
+            v = self.index.get(str(to))
+            if u is None or v is None: continue
+            w, has_w = _weight_value(raw_weight, raw_has_weight)
+            src.append(u)
+            dst.append(v)
+            weight.append(w)
+            has_weight.append(has_w)
+            edge_ids.append(edge_id)
+        self.n, self.m = len(self.ids), len(edge_ids)
+        self.src = np.array(src, dtype=np.int32)
+        self.dst = np.array(dst, dtype=np.int32)
+        self.weight = np.array(weight, dtype=np.float64)
+        self.has_weight = np.array(has_weight, dtype=bool)
+        self.edge_ids = edge_ids
+
+    def _load_arrays(self, nodes, edges):
+        raw = nodes['id']
+        unique, first = np.unique(raw, return_index=True)
+        keep = np.sort(first)
+        rank = np.empty(len(unique), dtype=np.int32)
+        rank[np.argsort(first)] = np.arange(len(unique), dtype=np.int32)
+        self.raw_ids = raw[keep].tolist()
+        self.ids = [str(n_id) for n_id in self.raw_ids]
+        self.index = dict(zip(self.ids, range(len(self.ids))))
+        labels = nodes.get('label')
+        if labels is None:
+            self.labels = [f"v{n_id}" for n_id in self.raw_ids]
+        else:
+            self.labels = [labels[i] for i in keep.tolist()]
+
+        def lookup(values):
+            pos = np.minimum(np.searchsorted(unique, values), max(len(unique) - 1, 0))
+            found = unique[pos] == values if len(unique) else np.zeros(len(values), dtype=bool)
+            return rank[pos] if len(unique) else pos.astype(np.int32), found
+
+        u, u_ok = lookup(edges['from'])
+        v, v_ok = lookup(edges['to'])
+        valid = u_ok & v_ok
+        m = len(valid)
+        weight = edges.get('weight')
+        weight = np.ones(m) if weight is None else np.asarray(weight, dtype=np.float64)
+        has_weight = edges.get('hasWeight')
+        has_weight = np.zeros(m, dtype=bool) if has_weight is None else np.asarray(has_weight, dtype=bool)
+        edge_ids = edges.get('id')
+        self.n, self.m = len(self.ids), int(valid.sum())
+        self.src = u[valid].astype(np.int32)
+        self.dst = v[valid].astype(np.int32)
+        self.weight = weight[valid]
+        self.has_weight = has_weight[valid]
+        self.edge_ids = (np.flatnonzero(valid) if edge_ids is None else np.asarray(edge_ids)[valid]).tolist()
+
+    def _build_csr(self):
+        e_idx = np.arange(self.m, dtype=np.int32)
+        if self.is_directed:
+            self.out_ptr, self.out_nbr, self.out_edge = _csr(self.n, self.src, self.dst, e_idx)
+            self.in_ptr, self.in_nbr, self.in_edge = _csr(self.n, self.dst, self.src, e_idx)
+            return
+        back = self.src != self.dst
+        rows = np.concatenate([self.src, self.dst[back]])
+        cols = np.concatenate([self.dst, self.src[back]])
+        slots = np.concatenate([e_idx, e_idx[back]])
+        self.out_ptr, self.out_nbr, self.out_edge = _csr(self.n, rows, cols, slots)
+        self.in_ptr, self.in_nbr, self.in_edge = self.out_ptr, self.out_nbr, self.out_edge
+
+    def set_weight(self, e, weight, has_weight=True):
+        self.weight[e] = weight
+        self.has_weight[e] = has_weight
+        self._hash = None
+        self._nx = None
+
+    def content_hash(self):
+        if self._hash is None:
+            h = hashlib.blake2b(digest_size=20)
+            h.update(b'D' if self.is_directed else b'U')
+            h.update(json.dumps([self.ids, self.labels, self.edge_ids], default=str, ensure_ascii=False).encode())
+            for arr in (self.src, self.dst, self.weight, self.has_weight):
+                h.update(arr.tobytes())
+            self._hash = h.hexdigest()
+        return self._hash
+
+    def fingerprints(self):
+        def digest(*parts):
+            h = hashlib.blake2b(digest_size=12)
+            for part in parts:
+                h.update(part if isinstance(part, bytes) else json.dumps(part, default=str, ensure_ascii=False).encode())
+            return h.hexdigest()
+        return {
+            'structure': digest(b'D' if self.is_directed else b'U', self.n, self.src.tobytes(), self.dst.tobytes()),
+            'ids': digest(self.ids),
+            'labels': digest(self.labels),
+            'edge_ids': digest(self.edge_ids),
+            'weights': digest(self.weight.tobytes(), self.has_weight.tobytes()),
+        }
+
+    def adjacency(self):
+        if self._adj is None:
+            ptr, nbr, eid = self.out_ptr.tolist(), self.out_nbr.tolist(), self.out_edge.tolist()
+            self._adj = [list(zip(nbr[ptr[u]:ptr[u + 1]], eid[ptr[u]:ptr[u + 1]])) for u in range(self.n)]
+        return self._adj
+
+    def undirected_adjacency(self):
+        if not self.is_directed:
+            return self.adjacency()
+        if self._undirected_adj is None:
+            back = self.src != self.dst
+            e_idx = np.arange(self.m, dtype=np.int32)
+            ptr, nbr, eid = _csr(self.n, np.concatenate([self.src, self.dst[back]]),
+                                 np.concatenate([self.dst, self.src[back]]), np.concatenate([e_idx, e_idx[back]]))
+            ptr, nbr, eid = ptr.tolist(), nbr.tolist(), eid.tolist()
+            self._undirected_adj = [list(zip(nbr[ptr[u]:ptr[u + 1]], eid[ptr[u]:ptr[u + 1]])) for u in range(self.n)]
+        return self._undirected_adj
+
+    def cut_structure(self):
+        if self._cut is None:
+            self._cut = _cut_structure(self.n, self.undirected_adjacency())
+        return self._cut
+
+    def neighbor_edges(self, u):
+        seen = {}
+        for v, e in self.adjacency()[u]:
+            if v not in seen:
+                seen[v] = e
+        return list(seen.items())
+
+    def simple_neighbors(self):
+        if self._simple is None:
+            self._simple = [[v for v, e in self.neighbor_edges(u) if v != u] for u in range(self.n)]
+        return self._simple
+
+    def undirected_neighbors(self):
+        if self._undirected_sets is None:
+            sets = [set(nbrs) for nbrs in self.simple_neighbors()]
+            if self.is_directed:
+                for u, nbrs in enumerate(self.simple_neighbors()):
+                    for v in nbrs:
+                        sets[v].add(u)
+            self._undirected_sets = sets
+        return self._undirected_sets
+
+    def edge_between(self, u, v, used=()):
+        first = None
+        for w, e in self.adjacency()[u]:
+            if w != v: continue
+            if e not in used: return e
+            if first is None: first = e
+        return first
+
+    def path_edge_indices(self, path):
+        used = []
+        for i in range(len(path) - 1):
+            e = self.edge_between(path[i], path[i + 1], used)
+            if e is not None:
+                used.append(e)
+        return used
+
+    def out_degrees(self):
+        return np.bincount(self.src, minlength=self.n)
+
+    def in_degrees(self):
+        return np.bincount(self.dst, minlength=self.n)
+
+    def degrees(self):
+        return self.out_degrees() + self.in_degrees()
+
+    def component_labels(self):
+        if self._components is None:
+            mat = coo_matrix((np.ones(self.m, dtype=np.int8), (self.src, self.dst)), shape=(self.n, self.n))
+            self._components = connected_components(mat, directed=True, connection='weak')
+        return self._components
+
+    def components_count(self):
+        return int(self.component_labels()[0]) if self.n else 0
+
+    def to_networkx(self):
+        if self._nx is None:
+            with phase('to_networkx'):
+                G = nx.MultiDiGraph() if self.is_directed else nx.MultiGraph()
+                for n_id, label in zip(self.ids, self.labels):
+                    G.add_node(n_id, label=label)
+                src, dst = self.src.tolist(), self.dst.tolist()
+                weight, has_weight = self.weight.tolist(), self.has_weight.tolist()
+                for e in range(self.m):
+                    G.add_edge(self.ids[src[e]], self.ids[dst[e]], key=e,
+                               weight=weight[e], edge_id=self.edge_ids[e], has_weight=has_weight[e])
+                self._nx = G
+        return self._nx
+
+
+@instrumented
+def compile_graph(nodes, edges, is_directed=False):
+    return CompiledGraph(nodes, edges, is_directed)
@@ -1,165 +1,218 @@
-import networkx as nx
 import numpy as np
+from scipy.sparse import csr_matrix
+from .connectivity import ConnectivityEngine
+from .cycles import shortest_cycle
+from .graph_core import compile_graph
+from .profiling import instrumented
+
+MATRIX_FORMATS = ('dense', 'coo', 'csr')
+MATRIX_KINDS = ('adjacency', 'incidence')
+MATRIX_TILE_MAX_CELLS = 250_000
+
+def _compact_dtype(data):
+    if not len(data): return np.int8
+    low, high = int(data.min()), int(data.max())
+    for dtype in (np.int8, np.int16, np.int32):
+        info = np.iinfo(dtype)
+        if info.min <= low and high <= info.max:
+            return dtype
+    return np.int64
+
+def _encode_sparse(matrix, fmt):
+    matrix = matrix.tocsr()
+    matrix.sum_duplicates()
+    matrix = matrix.astype(_compact_dtype(matrix.data))
+    if fmt == 'csr':
+        return {
+            "format": "csr", "shape": list(matrix.shape), "dtype": matrix.dtype.name,
+            "indptr": matrix.indptr.tolist(), "indices": matrix.indices.tolist(), "data": matrix.data.tolist()
+        }
+    coo = matrix.tocoo()
+    return {
+        "format": "coo", "shape": list(matrix.shape), "dtype": matrix.dtype.name,
+        "row": coo.row.tolist(), "col": coo.col.tolist(), "data": coo.data.tolist()
+    }
+
+def _dump_matrix(matrix, fmt):
+    return matrix.toarray().tolist() if fmt == 'dense' else _encode_sparse(matrix, fmt)
+
+def _window(bounds, size):
+    start, stop = (bounds or (0, size))[:2]
+    start, stop = max(0, int(start)), min(size, int(stop))
+    return start, max(start, stop)
 
 class GraphAnalyzer:
-    def __init__(self, nodes, edges, is_directed=False):
-        self.is_directed = is_directed
-        self.G = nx.MultiDiGraph() if is_directed else nx.MultiGraph()
-        for node in nodes:
-            self.G.add_node(str(node['id']), label=node.get('label', f"v{node['id']}"))
-        for edge in edges:
-            self.G.add_edge(str(edge['from']), str(edge['to']), weight=float(edge.get('weight', 1)))
-
-    def get_adjacency_matrix(self):
-        if not self.G.nodes: return []
-        matrix = nx.adjacency_matrix(self.G, weight=None).todense()
-        return matrix.tolist()
-
-    def get_incidence_matrix(self):
-        nodes = list(self.G.nodes())
-        edges = list(self.G.edges(keys=True))
-        if not nodes or not edges: 
+    def __init__(self, graph):
+        self.graph = graph
+        self.is_directed = graph.is_directed
+        self._memo = {}
+
+    def _memoized(self, key, compute):
+        if key not in self._memo:
+            self._memo[key] = compute()
+        return self._memo[key]
+
+    @property
+    def G(self):
+        return self.graph.to_networkx()
+
+    def adjacency_sparse(self):
+        return self._memoized('adjacency_sparse', self._adjacency_sparse)
+
+    def _adjacency_sparse(self):
+        g = self.graph
+        rows, cols = g.src, g.dst
+        if not self.is_directed:
+            back = g.src != g.dst
+            rows = np.concatenate([g.src, g.dst[back]])
+            cols = np.concatenate([g.dst, g.src[back]])
+        return csr_matrix((np.ones(len(rows), dtype=np.int32), (rows, cols)), shape=(g.n, g.n))
+
+    def incidence_sparse(self):
+        return self._memoized('incidence_sparse', self._incidence_sparse)
+
+    def _incidence_sparse(self):
+        g = self.graph
+        e_idx = np.arange(g.m)
+        loops = g.src == g.dst
+        rows = np.concatenate([g.src[~loops], g.dst[~loops], g.src[loops]])
+        cols = np.concatenate([e_idx[~loops], e_idx[~loops], e_idx[loops]])
+        data = np.concatenate([
+            np.full((~loops).sum(), -1 if self.is_directed else 1, dtype=np.int8),
+            np.ones((~loops).sum(), dtype=np.int8),
+            np.full(loops.sum(), 2, dtype=np.int8)
+        ])
+        return csr_matrix((data, (rows, cols)), shape=(g.n, g.m))
+
+    @instrumented
+    def get_adjacency_matrix(self, fmt='dense'):
+        if not self.graph.n: return []
+        return self._memoized(('adjacency_matrix', fmt), lambda: _dump_matrix(self.adjacency_sparse(), fmt))
+
+    @instrumented
+    def get_incidence_matrix(self, fmt='dense'):
+        if not self.graph.n or not self.graph.m:
             return []
-        num_nodes = len(nodes)
-        num_edges = len(edges)
-        matrix = np.zeros((num_nodes, num_edges), dtype=int)
-        node_to_idx = {node_id: i for i, node_id in enumerate(nodes)}
-        for j, (u, v, key) in enumerate(edges):
-            u_idx = node_to_idx[u]
-            v_idx = node_to_idx[v]
-            if u == v:
-                matrix[u_idx, j] = 2
-            else:
-                if self.is_directed:
-                    matrix[u_idx, j] = -1
-                    matrix[v_idx, j] = 1
-                else:
-                    matrix[u_idx, j] = 1
-                    matrix[v_idx, j] = 1
-        return matrix.tolist()
-    
+        return self._memoized(('incidence_matrix', fmt), lambda: _dump_matrix(self.incidence_sparse(), fmt))
+
+    def matrix_window(self, kind, rows=None, cols=None, fmt='dense'):
+        if kind not in MATRIX_KINDS:
+            raise ValueError(f"Невідома матриця: {kind}. Доступні: {', '.join(MATRIX_KINDS)}.")
+        if fmt not in MATRIX_FORMATS:
+            raise ValueError(f"Невідомий формат матриці: {fmt}. Доступні: {', '.join(MATRIX_FORMATS)}.")
+        matrix = self.adjacency_sparse() if kind == 'adjacency' else self.incidence_sparse()
+        r0, r1 = _window(rows, matrix.shape[0])
+        c0, c1 = _window(cols, matrix.shape[1])
+        if fmt == 'dense' and (r1 - r0) * (c1 - c0) > MATRIX_TILE_MAX_CELLS:
+            raise ValueError(f"Завеликий фрагмент матриці: більше {MATRIX_TILE_MAX_CELLS} клітинок.")
+        return matrix.shape, (r0, r1), (c0, c1), matrix[r0:r1, c0:c1]
+
+    @instrumented
+    def get_matrix_tile(self, kind, rows=None, cols=None, fmt='dense'):
+        shape, (r0, r1), (c0, c1), tile = self.matrix_window(kind, rows, cols, fmt)
+        return {
+            "kind": kind,
+            "shape": list(shape),
+            "rows": [r0, r1],
+            "cols": [c0, c1],
+            "row_labels": self.graph.labels[r0:r1],
+            "matrix": _dump_matrix(tile, fmt)
+        }
+
+    @instrumented
     def get_adjacency_list(self):
+        return self._memoized('adjacency_list', self._adjacency_list)
+
+    def _adjacency_list(self):
+        g = self.graph
         adj_list = []
-        for n_id in sorted(self.G.nodes()):
-            label = self.G.nodes[n_id].get('label', f"v{n_id}")
-            neighbors = self.G.neighbors(n_id)
-            neighbor_labels = [self.G.nodes[nb].get('label', nb) for nb in neighbors]
+        for u in sorted(range(g.n), key=lambda i: g.ids[i]):
+            neighbor_labels = [g.labels[v] for v, e in g.neighbor_edges(u)]
             adj_list.append({
-                'vertex': label,
+                'vertex': g.labels[u],
                 'neighbors': ", ".join(neighbor_labels) if neighbor_labels else "—"
             })
         return adj_list
 
+    @instrumented
     def get_degrees_info(self):
+        return self._memoized('degrees', self._degrees_info)
+
+    def _degrees_info(self):
+        g = self.graph
         degree_list = []
-        degrees_values = []
-        for n_id, data in self.G.nodes(data=True):
-            label = data.get('label', f"v{n_id}")
-            if self.is_directed:
-                in_deg, out_deg = self.G.in_degree(n_id), self.G.out_degree(n_id)
+        if self.is_directed:
+            in_degs, out_degs = g.in_degrees().tolist(), g.out_degrees().tolist()
+            for label, in_deg, out_deg in zip(g.labels, in_degs, out_degs):
                 degree_list.append({'label': label, 'in_degree': in_deg, 'out_degree': out_deg, 'total': in_deg + out_deg})
-                degrees_values.append((in_deg, out_deg))
-            else:
-                deg = self.G.degree(n_id)
+            degrees_values = list(zip(in_degs, out_degs))
+        else:
+            degrees_values = g.degrees().tolist()
+            for label, deg in zip(g.labels, degrees_values):
                 degree_list.append({'label': label, 'degree': deg})
-                degrees_values.append(deg)
         is_regular = all(d == degrees_values[0] for d in degrees_values) if degrees_values else False
         return degree_list, is_regular
     
-    def _get_edges_for_path(self, path_nodes):
-        edge_ids = []
-        if not path_nodes or len(path_nodes) < 2: return []
-        for i in range(len(path_nodes) - 1):
-            u, v = path_nodes[i], path_nodes[i+1]
-            edges_data = self.G.get_edge_data(u, v)
-            if edges_data:
-                first_key = list(edges_data.keys())[0]
-                edge_ids.append(edges_data[first_key].get('edge_id'))
-        return edge_ids
-
+    @instrumented
     def get_cycle_info(self):
-        res = {"has_cycle": "Ні", "girth": "—", "cycle_path": [], "cycle_edges": []}
-        if not self.G.nodes: return res
-        try:
-            shortest_cycle = []
-            try:
-                loop_node = next(nx.nodes_with_selfloops(self.G))
-                shortest_cycle = [loop_node, loop_node]
-                res["girth"] = 1
-            except StopIteration:
-                pass
-            if not shortest_cycle and not self.is_directed:
-                for u in self.G.nodes():
-                    for v in self.G.neighbors(u):
-                        if self.G.number_of_edges(u, v) > 1:
-                            shortest_cycle = [u, v, u]
-                            res["girth"] = 2
-                            break
-                    if shortest_cycle: break
-            if not shortest_cycle:
-                try:
-                    if self.is_directed:
-                        cycles = sorted(list(nx.simple_cycles(self.G)), key=len)
-                        if cycles:
-                            shortest_cycle = cycles[0]
-                            shortest_cycle.append(shortest_cycle[0])
-                            res["girth"] = len(shortest_cycle) - 1
-                    else:
-                        simple_G = nx.Graph(self.G)
-                        basis = nx.minimum_cycle_basis(simple_G)
-                        if basis:
-                            basis.sort(key=len)
-                            shortest_cycle = basis[0]
-                            shortest_cycle.append(shortest_cycle[0])
-                            res["girth"] = len(shortest_cycle) - 1
-                except Exception:
-                    pass
-            if shortest_cycle:
-                res["has_cycle"] = "Так"
-                labels = [self.G.nodes[n].get('label', n) for n in shortest_cycle]
-                res["cycle_path"] = labels
-                res["cycle_edges"] = self._get_edges_for_path(shortest_cycle)
-            return res
-        except Exception as e:
-            print(f"Cycle error: {e}")
-            return res
+        return self._memoized('cycles', self._cycle_info)
+
+    def _cycle_info(self):
+        res = {"has_cycle": "Ні", "girth": "—", "cycle_path": [], "cycle_edges": [], "time_ms": 0}
+        if not self.graph.n: return res
+        g = self.graph
+        cycle, res["time_ms"] = shortest_cycle(g)
+        if cycle:
+            res["has_cycle"] = "Так"
+            res["girth"] = len(cycle) - 1
+            res["cycle_path"] = [g.labels[u] for u in cycle]
+            res["cycle_edges"] = [g.edge_ids[e] for e in g.path_edge_indices(cycle)]
+        return res
 
+    @instrumented
     def get_connectivity_info(self):
+        return self._memoized('connectivity', self._connectivity_info)
+
+    def _connectivity_info(self):
         res = {'components_count': 0, 'vertex_connectivity': 0, 'edge_connectivity': 0}
-        if not self.G.nodes: return res
-        res['components_count'] = (
-            nx.number_weakly_connected_components(self.G) 
-            if self.is_directed else nx.number_connected_components(self.G)
-        )
-        try:
-            simple_ug = nx.Graph(self.G.to_undirected())
-            simple_ug.remove_edges_from(nx.selfloop_edges(simple_ug))
-            multi_ug = self.G.to_undirected()
-            multi_ug.remove_edges_from(nx.selfloop_edges(multi_ug))
-            if nx.is_connected(simple_ug):
-                res['vertex_connectivity'] = nx.node_connectivity(simple_ug)
-                res['edge_connectivity'] = nx.edge_connectivity(multi_ug)
-            else:
-                res['vertex_connectivity'] = 0
-                res['edge_connectivity'] = 0
-        except Exception as e:
-            print(f"Connectivity calculation error: {e}")
-            pass
+        if not self.graph.n: return res
+        res['components_count'] = self.graph.components_count()
+        res['vertex_connectivity'], res['edge_connectivity'] = ConnectivityEngine(self.graph).summary()
         return res
 
-    def get_all_properties(self):
-        degrees, is_regular = self.get_degrees_info()
-        cycle_info = self.get_cycle_info()
-        return {
-            'adjacency_matrix': self.get_adjacency_matrix(),
-            'incidence_matrix': self.get_incidence_matrix(),
-            'adjacency_list': self.get_adjacency_list(),
-            'degrees': degrees,
-            'is_regular': is_regular,
-            'connectivity': self.get_connectivity_info(),
-            'is_directed': self.is_directed,
-            'has_cycle': cycle_info['has_cycle'],
-            'girth': cycle_info['girth'],
-            'cycle_path': cycle_info['cycle_path'],
-            'cycle_edges': cycle_info['cycle_edges']
-        }
\ No newline at end of file
+    @instrumented
+    def get_all_properties(self, matrix_format='dense', fields=None):
+        if matrix_format not in MATRIX_FORMATS:
+            raise ValueError(f"Невідомий формат матриці: {matrix_format}. Доступні: {', '.join(MATRIX_FORMATS)}.")
+        return {name: ANALYSIS_FIELDS[name](self, matrix_format) for name in parse_fields(fields)}
+
+
+# field: getter(analyzer, matrix_format); order matches the full analyze response
+ANALYSIS_FIELDS = {
+    'adjacency_matrix': lambda a, fmt: a.get_adjacency_matrix(fmt),
+    'incidence_matrix': lambda a, fmt: a.get_incidence_matrix(fmt),
+    'adjacency_list': lambda a, fmt: a.get_adjacency_list(),
+    'degrees': lambda a, fmt: a.get_degrees_info()[0],
+    'is_regular': lambda a, fmt: a.get_degrees_info()[1],
+    'connectivity': lambda a, fmt: a.get_connectivity_info(),
+    'is_directed': lambda a, fmt: a.is_directed,
+    'has_cycle': lambda a, fmt: a.get_cycle_info()['has_cycle'],
+    'girth': lambda a, fmt: a.get_cycle_info()['girth'],
+    'cycle_path': lambda a, fmt: a.get_cycle_info()['cycle_path'],
+    'cycle_edges': lambda a, fmt: a.get_cycle_info()['cycle_edges'],
+    'girth_time_ms': lambda a, fmt: a.get_cycle_info()['time_ms'],
+}
+
+
+def parse_fields(fields):
+    if not fields:
+        return tuple(ANALYSIS_FIELDS)
+    if isinstance(fields, str):
+        fields = [name.strip() for name in fields.split(',') if name.strip()]
+    unknown = [name for name in fields if name not in ANALYSIS_FIELDS]
+    if unknown:
+        raise ValueError(f"Невідомі поля: {', '.join(map(str, unknown))}. Доступні: {', '.join(ANALYSIS_FIELDS)}.")
+    return tuple(name for name in ANALYSIS_FIELDS if name in fields)
+
+def run_analyze(nodes, edges, is_directed, matrix_format='dense', fields=None):
+    return GraphAnalyzer(compile_graph(nodes, edges, is_directed)).get_all_properties(matrix_format, fields)
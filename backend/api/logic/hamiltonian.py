@@ -0,0 +1,250 @@
+import time
+
+TIME_BUDGET = 5.0
+STEP_BUDGET = 2_000_000
+HEURISTIC_STEPS = 64
+
+
+class BudgetExceeded(Exception):
+    pass
+
+
+def _bits(mask):
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def _lowest(mask):
+    return (mask & -mask).bit_length() - 1
+
+
+class HamiltonianEngine:
+    def __init__(self, graph, time_budget=TIME_BUDGET, step_budget=STEP_BUDGET, pool=None):
+        self.graph = graph
+        self.pool = pool
+        self.n = graph.n
+        self.is_directed = graph.is_directed
+        self.time_budget = time_budget
+        self.step_budget = step_budget
+        self.out_mask = [0] * self.n
+        self.in_mask = [0] * self.n
+        self.loops = set()
+        for u, v in zip(graph.src.tolist(), graph.dst.tolist()):
+            if u == v:
+                self.loops.add(u)
+                continue
+            self.out_mask[u] |= 1 << v
+            self.in_mask[v] |= 1 << u
+            if not self.is_directed:
+                self.out_mask[v] |= 1 << u
+                self.in_mask[u] |= 1 << v
+        self.steps = 0
+        self.cycle_known = True
+        self._step_limit, self._deadline = step_budget, None
+        self._abort = None
+
+    def __getstate__(self):
+        return {**self.__dict__, 'graph': None, 'pool': None, '_abort': None}
+
+    def _tick(self):
+        self.steps += 1
+        if self.steps > self._step_limit or time.monotonic() > self._deadline:
+            raise BudgetExceeded()
+        if self._abort is not None and not self.steps & 1023 and self._abort():
+            raise BudgetExceeded()
+
+    def _cycle_impossible(self):
+        if self.n == 1:
+            return not self.is_directed or 0 not in self.loops
+        if not self.is_directed and self.n < 3:
+            return True
+        if any(out == 0 for out in self.out_mask) or any(inc == 0 for inc in self.in_mask):
+            return True
+        if not self.is_directed and any(out.bit_count() < 2 for out in self.out_mask):
+            return True
+        if self.graph.components_count() > 1:
+            return True
+        if self.n >= 3:
+            articulation, bridges = self.graph.cut_structure()
+            if articulation or bridges:
+                return True
+        return False
+
+    def _path_starts(self):
+        if self.n == 1:
+            return [0]
+        if self.graph.components_count() > 1:
+            return []
+        if self.is_directed:
+            sources = [u for u in range(self.n) if self.in_mask[u] == 0]
+            sinks = [u for u in range(self.n) if self.out_mask[u] == 0]
+            if len(sources) > 1 or len(sinks) > 1:
+                return []
+            return sources or list(range(self.n))
+        leaves = [u for u in range(self.n) if self.out_mask[u].bit_count() == 1]
+        if len(leaves) > 2:
+            return []
+        return leaves[:1] or list(range(self.n))
+
+    def _ordered(self, v, visited):
+        options = list(_bits(self.out_mask[v] & ~visited))
+        options.sort(key=lambda w: ((self.out_mask[w] & ~visited).bit_count(), w), reverse=True)
+        return options
+
+    def _greedy(self, prefix, want_cycle, limit, closing=-1):
+        n, start = self.n, prefix[0]
+        path, visited = list(prefix), 0
+        for u in prefix:
+            visited |= 1 << u
+        stack = [self._ordered(path[-1], visited)]
+        steps = 0
+        while stack:
+            if len(path) == n and (not want_cycle or self.out_mask[path[-1]] >> start & 1) and closing >> path[-1] & 1:
+                return path + [start] if want_cycle else path
+            options = stack[-1]
+            if not options or len(path) == n:
+                stack.pop()
+                visited ^= 1 << path.pop()
+                continue
+            steps += 1
+            if steps > limit:
+                return None
+            self._tick()
+            v = options.pop()
+            path.append(v)
+            visited |= 1 << v
+            stack.append(self._ordered(v, visited))
+        return None
+
+    def _held_karp(self, seeds, want_cycle, closing=-1):
+        n, depth = self.n, len(seeds[0])
+        full = (1 << n) - 1
+        layer, origin = {}, {}
+        for prefix in seeds:
+            mask = sum(1 << u for u in prefix)
+            layer[mask] = layer.get(mask, 0) | (1 << prefix[-1])
+            origin[mask] = prefix
+        layers = [layer]
+        for k in range(depth, n):
+            nxt = {}
+            for mask, ends in layer.items():
+                self._tick()
+                reach = 0
+                for v in _bits(ends):
+                    reach |= self.out_mask[v]
+                for w in _bits(reach & ~mask):
+                    grown = mask | (1 << w)
+                    nxt[grown] = nxt.get(grown, 0) | (1 << w)
+            if not nxt:
+                return None
+            layers.append(nxt)
+            layer = nxt
+        ends = layer.get(full, 0) & closing
+        if want_cycle:
+            ends &= self.in_mask[seeds[0][0]]
+        if not ends:
+            return None
+        v = _lowest(ends)
+        path, mask = [v], full
+        for k in range(n - depth, 0, -1):
+            mask ^= 1 << v
+            v = _lowest(layers[k - 1][mask] & self.in_mask[v])
+            path.append(v)
+        path.reverse()
+        path = list(origin[mask][:-1]) + path
+        return path + [path[0]] if want_cycle else path
+
+    def _find(self, starts, want_cycle):
+        if self.n == 1:
+            return [0, 0] if want_cycle else [0]
+        for start in starts[:8]:
+            found = self._greedy((start,), want_cycle, HEURISTIC_STEPS * self.n)
+            if found:
+                return found
+        return self._held_karp([(s,) for s in starts], want_cycle)
+
+    def _cycle_parts(self):
+        order = self._ordered(0, 1)[::-1]
+        parts, later = [], 0
+        for v in reversed(order):
+            parts.append(((0, v), True, -1 if self.is_directed else later))
+            later |= 1 << v
+        parts.reverse()
+        return [part for part in parts if part[2]]
+
+    def _path_parts(self, starts):
+        if self.is_directed or len(starts) < self.n:
+            return [((s,), False, -1) for s in starts]
+        parts, later = [], 0
+        for s in reversed(starts):
+            parts.append(((s,), False, later))
+            later |= 1 << s
+        parts.reverse()
+        return [part for part in parts if part[2]]
+
+    def solve_part(self, index, part):
+        prefix, want_cycle, closing = part
+        found = self._greedy(prefix, want_cycle, HEURISTIC_STEPS * self.n, closing)
+        found = found or self._held_karp([prefix], want_cycle, closing)
+        return ('found', found) if found else ('none', None)
+
+    def _first(self, parts, deadline, step_limit):
+        results = self.pool.run(self, 'solve_part', (), parts, deadline, step_limit, stop_on_witness=True)
+        found = next((value for index, status, value in results if status == 'found'), None)
+        return found, any(status == 'budget' for index, status, value in results)
+
+    def _search_parallel(self):
+        started, wall = time.monotonic(), time.time()
+        self.steps = 0
+        self._step_limit, self._deadline = self.step_budget // 2, started + self.time_budget / 2
+        try:
+            if not self._cycle_impossible():
+                cycle = self._greedy((0,), True, HEURISTIC_STEPS * self.n)
+                if not cycle:
+                    cycle, exhausted = self._first(self._cycle_parts(), wall + self.time_budget / 2, self.step_budget // 2)
+                    self.cycle_known = not exhausted
+                if cycle:
+                    return "cycle", cycle
+        except BudgetExceeded:
+            self.cycle_known = False
+        self._step_limit, self._deadline = self.step_budget, started + self.time_budget
+        try:
+            starts = self._path_starts()
+            path = self._greedy((starts[0],), False, HEURISTIC_STEPS * self.n) if starts else None
+        except BudgetExceeded:
+            return "unknown", []
+        if starts and not path:
+            path, exhausted = self._first(self._path_parts(starts), wall + self.time_budget, self.step_budget)
+            if not path and exhausted:
+                return "unknown", []
+        if path:
+            return "path", path
+        return ("none" if self.cycle_known else "unknown"), []
+
+    def search(self):
+        self.cycle_known = True
+        if not self.n:
+            return "none", []
+        if self.pool is not None and self.pool.parallel and self.n >= self.pool.min_vertices:
+            return self._search_parallel()
+        started = time.monotonic()
+        self.steps = 0
+        self._step_limit, self._deadline = self.step_budget // 2, started + self.time_budget / 2
+        try:
+            if not self._cycle_impossible():
+                cycle = self._find([0], True)
+                if cycle:
+                    return "cycle", cycle
+        except BudgetExceeded:
+            self.cycle_known = False
+        self._step_limit, self._deadline = self.step_budget, started + self.time_budget
+        try:
+            starts = self._path_starts()
+            path = self._find(starts, False) if starts else None
+        except BudgetExceeded:
+            return "unknown", []
+        if path:
+            return "path", path
+        return ("none" if self.cycle_known else "unknown"), []
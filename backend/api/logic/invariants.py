@@ -0,0 +1,239 @@
+import heapq
+import time
+from .hamiltonian import BudgetExceeded, TIME_BUDGET, STEP_BUDGET, _bits, _lowest
+from .search import beats, offer
+
+
+class InvariantsEngine:
+    def __init__(self, graph, time_budget=TIME_BUDGET, step_budget=STEP_BUDGET, pool=None):
+        self.graph = graph
+        self.pool = pool
+        self.n = graph.n
+        self.time_budget = time_budget
+        self.step_budget = step_budget
+        self.adj = [0] * self.n
+        for u, v in zip(graph.src.tolist(), graph.dst.tolist()):
+            if u != v:
+                self.adj[u] |= 1 << v
+                self.adj[v] |= 1 << u
+        self.steps = 0
+        self._step_limit, self._deadline = step_budget, None
+        self._abort = None
+
+    def __getstate__(self):
+        return {**self.__dict__, 'graph': None, 'pool': None, '_abort': None}
+
+    def _tick(self):
+        self.steps += 1
+        if self.steps > self._step_limit or time.monotonic() > self._deadline:
+            raise BudgetExceeded()
+        if self._abort is not None and not self.steps & 1023 and self._abort():
+            raise BudgetExceeded()
+
+    def _budget(self, share, started):
+        self.steps = 0
+        self._step_limit = int(self.step_budget * share)
+        self._deadline = time.monotonic() + (self.time_budget - (time.monotonic() - started)) * share
+
+    @staticmethod
+    def _color_sort(adj, candidates):
+        order, color, uncolored = [], 0, candidates
+        while uncolored:
+            color += 1
+            free = uncolored
+            while free:
+                v = _lowest(free)
+                free &= ~adj[v] & ~(1 << v)
+                uncolored ^= 1 << v
+                order.append((v, color))
+        return order
+
+    @staticmethod
+    def _greedy_clique(adj, candidates):
+        clique = []
+        while candidates:
+            v = max(_bits(candidates), key=lambda u: (adj[u] & candidates).bit_count())
+            clique.append(v)
+            candidates &= adj[v]
+        return clique
+
+    def clique_part(self, adj, index, part):
+        v, color, grown = part
+        owner, best = index + 1, []
+
+        def expand(clique, pool, order):
+            nonlocal best
+            for w, c in reversed(order):
+                if not beats(len(clique) + c, owner):
+                    return
+                self._tick()
+                nested = pool & adj[w]
+                if nested:
+                    expand(clique + [w], nested, self._color_sort(adj, nested))
+                elif beats(len(clique) + 1, owner):
+                    best = clique + [w]
+                    offer(len(best), owner)
+                pool &= ~(1 << w)
+
+        try:
+            expand([], grown | (1 << v), [(v, color)])
+            return ('found' if best else 'none'), best
+        except BudgetExceeded:
+            return 'budget', best
+
+    def _max_clique_parallel(self, adj, best, root, upper):
+        parts, pool = [], 0
+        for v, color in root:
+            pool |= 1 << v
+            parts.append((v, color, pool & adj[v]))
+        parts.reverse()
+        deadline = time.time() + self._deadline - time.monotonic()
+        results = self.pool.run(self, 'clique_part', (adj,), parts, deadline, self._step_limit, incumbent=len(best))
+        for index, status, value in results:
+            if len(value or ()) > len(best):
+                best = value
+        exact = not any(status == 'budget' for index, status, value in results)
+        return best, len(best) if exact else upper, exact
+
+    def _max_clique(self, adj, candidates):
+        best = self._greedy_clique(adj, candidates)
+        root = self._color_sort(adj, candidates)
+        upper = root[-1][1] if root else 0
+        if (len(best) < upper and self.pool is not None and self.pool.parallel
+                and candidates.bit_count() >= self.pool.min_vertices):
+            return self._max_clique_parallel(adj, best, root, upper)
+
+        def expand(clique, pool, order):
+            nonlocal best
+            for v, color in reversed(order):
+                if len(clique) + color <= len(best):
+                    return
+                self._tick()
+                grown = pool & adj[v]
+                if grown:
+                    expand(clique + [v], grown, self._color_sort(adj, grown))
+                elif len(clique) + 1 > len(best):
+                    best = clique + [v]
+                pool &= ~(1 << v)
+
+        try:
+            if len(best) < upper:
+                expand([], candidates, root)
+            return best, len(best), True
+        except BudgetExceeded:
+            return best, upper, False
+
+    def clique(self, share=1.0, started=None):
+        self._budget(share, started or time.monotonic())
+        return self._max_clique(self.adj, (1 << self.n) - 1)
+
+    def independent_set(self, share=1.0, started=None):
+        self._budget(share, started or time.monotonic())
+        labels = self.graph.component_labels()[1].tolist() if self.n else []
+        components = {}
+        for u, c in enumerate(labels):
+            components[c] = components.get(c, 0) | (1 << u)
+        complement = [0] * self.n
+        for mask in components.values():
+            for u in _bits(mask):
+                complement[u] = mask & ~self.adj[u] & ~(1 << u)
+        found, upper, exact = [], 0, True
+        pending = sorted(components.values(), key=int.bit_count)
+        for mask in pending:
+            if not exact:
+                found += self._greedy_clique(complement, mask)
+                upper += self._color_sort(complement, mask)[-1][1]
+                continue
+            best, bound, exact = self._max_clique(complement, mask)
+            found += best
+            upper += bound
+        return found, upper, exact
+
+    def _dsatur(self, degree):
+        color, saturation = [-1] * self.n, [0] * self.n
+        heap = [(0, -degree[v], v) for v in range(self.n)]
+        heapq.heapify(heap)
+        while heap:
+            _, _, v = heapq.heappop(heap)
+            if color[v] >= 0:
+                continue
+            color[v] = c = _lowest(~saturation[v])
+            for w in _bits(self.adj[v]):
+                if color[w] < 0 and not saturation[w] >> c & 1:
+                    saturation[w] |= 1 << c
+                    heapq.heappush(heap, (-saturation[w].bit_count(), -degree[w], w))
+        return color
+
+    def coloring(self, clique, share=1.0, started=None):
+        self._budget(share, started or time.monotonic())
+        n, adj = self.n, self.adj
+        if not n:
+            return [], 0, 0, True
+        degree = [a.bit_count() for a in adj]
+        best = self._dsatur(degree)
+        best_k = max(best) + 1
+        lower = max(len(clique), 1 if n else 0)
+        if best_k <= lower:
+            return best, best_k, lower, True
+        color = [-1] * n
+        counts = [[0] * best_k for _ in range(n)]
+        saturation = [0] * n
+
+        def assign(v, c):
+            color[v] = c
+            for w in _bits(adj[v]):
+                counts[w][c] += 1
+                if counts[w][c] == 1:
+                    saturation[w] |= 1 << c
+
+        def release(v):
+            c = color[v]
+            color[v] = -1
+            for w in _bits(adj[v]):
+                counts[w][c] -= 1
+                if counts[w][c] == 0:
+                    saturation[w] &= ~(1 << c)
+
+        def search():
+            nonlocal best, best_k
+            stack, descend = [], True
+            colored = used = len(clique)
+            while True:
+                if descend:
+                    if colored == n:
+                        best, best_k = list(color), used
+                    else:
+                        self._tick()
+                        v = max((u for u in range(n) if color[u] < 0),
+                                key=lambda u: (saturation[u].bit_count(), degree[u]))
+                        stack.append([v, 0, used])
+                descend = False
+                while stack:
+                    frame = stack[-1]
+                    v, c, base = frame
+                    if color[v] >= 0:
+                        release(v)
+                        colored -= 1
+                    if best_k <= lower:
+                        return
+                    limit = min(base + 1, best_k - 1)
+                    while c < limit and saturation[v] >> c & 1:
+                        c += 1
+                    if c < limit:
+                        frame[1] = c + 1
+                        assign(v, c)
+                        colored += 1
+                        used = max(base, c + 1)
+                        descend = True
+                        break
+                    stack.pop()
+                if not descend:
+                    return
+
+        for c, v in enumerate(clique):
+            assign(v, c)
+        try:
+            search()
+            return best, best_k, best_k, True
+        except BudgetExceeded:
+            return best, best_k, lower, False
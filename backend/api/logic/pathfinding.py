@@ -1,130 +1,519 @@
-import networkx as nx
+import heapq
+from itertools import islice
+import numpy as np
+from .graph_core import compile_graph
+from .profiling import instrumented
+
+FLOYD_MODES = ('final_only', 'every_k', 'stream')
+DIJKSTRA_MODES = ('tree', 'bidirectional', 'all', 'k_shortest', 'multi_source', 'bellman_ford')
+K_SHORTEST_DEFAULT = 3
+K_SHORTEST_MAX = 100
+INF = float('inf')
+
+
+class NegativeCycle(Exception):
+    pass
+
+
+def tree_key(graph, source, reverse=False):
+    return f"{graph.content_hash()}:{'r' if reverse else ''}{source}"
+
+
+class TreeCarrier:
+    # takes cached trees into a pool worker and brings the ones it builds back out
+    def __init__(self, trees=None):
+        self.trees = dict(trees or {})
+        self.computed = {}
+
+    def get(self, key):
+        return self.trees.get(key)
+
+    def set(self, key, tree):
+        self.trees[key] = self.computed[key] = tree
+
+def validate_weights(graph):
+    unweighted_count = int((~graph.has_weight).sum())
+    if unweighted_count > 0:
+        return {
+            "success": False, 
+            "error": f"Алгоритм неможливий: {unweighted_count} ребер не мають ваги. Встановіть вагу для кожного ребра."
+        }
+    return None
 
 class PathFinder:
-    def __init__(self, nodes, edges, is_directed=False):
-        self.is_directed = is_directed
-        self.raw_edges = edges
-        self.G = nx.MultiDiGraph() if is_directed else nx.MultiGraph()
-        if not nodes:
-            self.node_ids = []
-            return
-        sorted_nodes = sorted(nodes, key=lambda x: x.get('id'))
-        self.node_ids = [str(n['id']) for n in sorted_nodes]
+    def __init__(self, graph, tree_cache=None):
+        self.graph = graph
+        self.tree_cache = tree_cache
+        self.is_directed = graph.is_directed
+        self.order = sorted(range(graph.n), key=lambda i: graph.raw_ids[i])
+        self.node_ids = [graph.ids[i] for i in self.order]
         self.node_to_idx = {n_id: i for i, n_id in enumerate(self.node_ids)}
-        self.idx_to_label = {i: n.get('label', f"v{i+1}") for i, n in enumerate(sorted_nodes)}
-        for node in sorted_nodes:
-            self.G.add_node(str(node['id']), label=node.get('label', f"v{node.get('id')}"))
-        for edge in edges:
-            u, v = str(edge['from']), str(edge['to'])
-            if u in self.node_ids and v in self.node_ids:
-                raw_weight = edge.get('weight')
-                raw_has_weight = edge.get('hasWeight')
-                try:
-                    w = float(raw_weight) if raw_weight is not None else 1.0
-                except (ValueError, TypeError):
-                    w = 1.0
-                has_weight_bool = bool(raw_has_weight) or (raw_weight is not None)
-                self.G.add_edge(
-                    u, v, 
-                    weight=w, 
-                    edge_id=edge.get('id'),
-                    has_weight=has_weight_bool 
-                )
+        self.idx_to_label = {i: graph.labels[u] for i, u in enumerate(self.order)}
+        self._potential = None
+        self._weights = None
+        self._out = None
+
+    @property
+    def G(self):
+        return self.graph.to_networkx()
 
     def _validate_weights(self):
-        unweighted_count = 0
-        for u, v, key, data in self.G.edges(data=True, keys=True):
-            if not data.get('has_weight', False):
-                unweighted_count += 1
-        if unweighted_count > 0:
-            return {
-                "success": False, 
-                "error": f"Алгоритм неможливий: {unweighted_count} ребер не мають ваги. Встановіть вагу для кожного ребра."
-            }
+        return validate_weights(self.graph)
+
+    def _out_lists(self):
+        if self._out is None:
+            g = self.graph
+            self._out = g.out_ptr.tolist(), g.out_nbr.tolist(), g.out_edge.tolist()
+        return self._out
+
+    def _arcs(self):
+        g = self.graph
+        return np.repeat(np.arange(g.n), np.diff(g.out_ptr)), g.out_nbr, g.out_edge
+
+    def _relax_all(self, dist, pred, pred_edge):
+        tail, head, eid = self._arcs()
+        weight = self.graph.weight[eid]
+        for _ in range(self.graph.n + 1):
+            cand = dist[tail] + weight
+            better = cand < dist[head]
+            if not better.any():
+                return dist, pred, pred_edge
+            np.minimum.at(dist, head[better], cand[better])
+            won = better & (cand == dist[head])
+            pred[head[won]], pred_edge[head[won]] = tail[won], eid[won]
+        raise NegativeCycle()
+
+    def bellman_ford(self, source):
+        n = self.graph.n
+        dist = np.full(n, INF)
+        dist[source] = 0.0
+        dist, pred, pred_edge = self._relax_all(dist, np.full(n, -1), np.full(n, -1))
+        return dist.tolist(), pred.tolist(), pred_edge.tolist()
+
+    def potential(self):
+        if self._potential is None:
+            n = self.graph.n
+            self._potential = self._relax_all(np.zeros(n), np.full(n, -1), np.full(n, -1))[0]
+        return self._potential
+
+    def edge_weights(self):
+        if self._weights is None:
+            g = self.graph
+            if (g.weight < 0).any():
+                h = self.potential()
+                self._weights = np.maximum(g.weight + h[g.src] - h[g.dst], 0.0).tolist()
+            else:
+                self._weights = g.weight.tolist()
+        return self._weights
+
+    def _to_real(self, source, target, reduced):
+        if self._potential is None or reduced == INF:
+            return reduced
+        return reduced - float(self._potential[source]) + float(self._potential[target])
+
+    @instrumented
+    def shortest_path_tree(self, source, reverse=False):
+        key = tree_key(self.graph, source, reverse)
+        if self.tree_cache is not None:
+            tree = self.tree_cache.get(key)
+            if tree is not None:
+                return tree
+        g = self.graph
+        arrays = (g.in_ptr, g.in_nbr, g.in_edge) if reverse else (g.out_ptr, g.out_nbr, g.out_edge)
+        ptr, nbr, eid = (a.tolist() for a in arrays)
+        weight = self.edge_weights()
+        dist, pred, pred_edge = [float('inf')] * g.n, [-1] * g.n, [-1] * g.n
+        done = [False] * g.n
+        dist[source] = 0.0
+        heap = [(0.0, source)]
+        while heap:
+            d, u = heapq.heappop(heap)
+            if done[u]:
+                continue
+            done[u] = True
+            for i in range(ptr[u], ptr[u + 1]):
+                v, e = nbr[i], eid[i]
+                nd = d + weight[e]
+                if nd < dist[v]:
+                    dist[v], pred[v], pred_edge[v] = nd, u, e
+                    heapq.heappush(heap, (nd, v))
+        tree = (dist, pred, pred_edge)
+        if self.tree_cache is not None:
+            self.tree_cache.set(key, tree)
+        return tree
+
+    def _bidirectional(self, source, target):
+        g = self.graph
+        weight = self.edge_weights()
+        sides = []
+        for ptr, nbr, eid in ((g.out_ptr, g.out_nbr, g.out_edge), (g.in_ptr, g.in_nbr, g.in_edge)):
+            sides.append((ptr.tolist(), nbr.tolist(), eid.tolist(), {}, {}, set(), []))
+        for side, root in zip(sides, (source, target)):
+            side[3][root], side[4][root] = 0.0, (-1, -1)
+            side[6].append((0.0, root))
+        best, meet = float('inf'), -1
+        while sides[0][6] and sides[1][6]:
+            if sides[0][6][0][0] + sides[1][6][0][0] >= best:
+                break
+            k = 0 if len(sides[0][6]) <= len(sides[1][6]) else 1
+            ptr, nbr, eid, dist, pred, done, heap = sides[k]
+            other_dist = sides[1 - k][3]
+            d, u = heapq.heappop(heap)
+            if u in done:
+                continue
+            done.add(u)
+            for i in range(ptr[u], ptr[u + 1]):
+                v, e = nbr[i], eid[i]
+                nd = d + weight[e]
+                if nd < dist.get(v, float('inf')):
+                    dist[v], pred[v] = nd, (u, e)
+                    heapq.heappush(heap, (nd, v))
+                    if v in other_dist and nd + other_dist[v] < best:
+                        best, meet = nd + other_dist[v], v
+        if meet == -1:
+            return None, None
+        nodes, edges = [meet], []
+        u = meet
+        while sides[0][4][u][0] != -1:
+            u, e = sides[0][4][u]
+            nodes.append(u)
+            edges.append(e)
+        nodes.reverse()
+        edges.reverse()
+        u = meet
+        while sides[1][4][u][0] != -1:
+            u, e = sides[1][4][u]
+            nodes.append(u)
+            edges.append(e)
+        return nodes, edges
+
+    def _path_result(self, nodes, edges, total):
+        g = self.graph
+        return {
+            "success": True,
+            "path_nodes_ids": [g.ids[u] for u in nodes],
+            "path_edges": [
+                {"from": g.ids[u], "to": g.ids[v], "id": g.edge_ids[e]}
+                for u, v, e in zip(nodes, nodes[1:], edges)
+            ],
+            "total_weight": total
+        }
+
+    def _dijkstra_error(self, *node_ids):
+        val_error = self._validate_weights()
+        if val_error: return val_error
+        if any(str(n_id) not in self.graph.index for n_id in node_ids):
+            return {"success": False, "error": "Обрану вершину не знайдено (можливо, її було видалено)."}
+        try:
+            self.edge_weights()
+        except NegativeCycle:
+            return {"success": False, "error": "Граф містить цикл від'ємної ваги: найкоротші шляхи не визначені."}
         return None
 
-    def run_dijkstra(self, start_node, end_node):
+    def _real_total(self, edges, reduced):
+        if self._potential is None:
+            return reduced
+        weight = self.graph.weight.tolist()
+        return float(sum(weight[e] for e in edges))
+
+    @staticmethod
+    def _trace(pred, pred_edge, source, target):
+        nodes, edges = [target], []
+        while nodes[-1] != source:
+            edges.append(pred_edge[nodes[-1]])
+            nodes.append(pred[nodes[-1]])
+        return nodes[::-1], edges[::-1]
+
+    @instrumented
+    def run_dijkstra(self, start_node, end_node, mode='tree', k=None, sources=None):
+        if mode not in DIJKSTRA_MODES:
+            return {"success": False, "error": f"Невідомий режим: {mode}. Доступні: {', '.join(DIJKSTRA_MODES)}."}
+        if mode == 'all':
+            return self.run_dijkstra_all(start_node)
+        if mode == 'multi_source':
+            return self.run_multi_source(sources if sources is not None else [start_node], end_node)
+        if mode == 'bellman_ford':
+            return self.run_bellman_ford(start_node, end_node)
+        if mode == 'k_shortest':
+            return self.run_k_shortest(start_node, end_node, K_SHORTEST_DEFAULT if k is None else k)
+        error = self._dijkstra_error(start_node, end_node)
+        if error: return error
+        source, target = self.graph.index[str(start_node)], self.graph.index[str(end_node)]
+        if source == target:
+            return {"success": True, "path_nodes_ids": [self.graph.ids[source]], "path_edges": [], "total_weight": 0}
+        if mode == 'bidirectional':
+            nodes, edges = self._bidirectional(source, target)
+            if nodes is None:
+                return {"success": False, "error": "Шлях між обраними вершинами не існує."}
+            return self._path_result(nodes, edges, float(sum(self.graph.weight[edges].tolist())))
+        dist, pred, pred_edge = self.shortest_path_tree(source)
+        if pred[target] == -1:
+            return {"success": False, "error": "Шлях між обраними вершинами не існує."}
+        nodes, edges = self._trace(pred, pred_edge, source, target)
+        return self._path_result(nodes, edges, self._real_total(edges, dist[target]))
+
+    def run_dijkstra_all(self, start_node):
+        error = self._dijkstra_error(start_node)
+        if error: return error
+        g = self.graph
+        source = g.index[str(start_node)]
+        dist, pred, pred_edge = self.shortest_path_tree(source)
+        return {
+            "success": True,
+            "source": g.ids[source],
+            "distances": {g.ids[u]: (None if dist[u] == INF else self._to_real(source, u, dist[u])) for u in self.order},
+            "predecessors": {
+                g.ids[u]: {"node": g.ids[pred[u]], "edge": g.edge_ids[pred_edge[u]]}
+                for u in self.order if pred[u] != -1
+            }
+        }
+
+    @instrumented
+    def run_bellman_ford(self, start_node, end_node=None):
         val_error = self._validate_weights()
         if val_error: return val_error
-        for u, v, data in self.G.edges(data=True):
-            if data.get('weight', 0) < 0:
-                return {"success": False, "error": "Алгоритм Дейкстри не працює з від'ємними вагами."}
+        nodes = (start_node,) if end_node is None else (start_node, end_node)
+        if any(str(n_id) not in self.graph.index for n_id in nodes):
+            return {"success": False, "error": "Обрану вершину не знайдено (можливо, її було видалено)."}
+        g = self.graph
+        source = g.index[str(start_node)]
         try:
-            start_node, end_node = str(start_node), str(end_node)
-            if start_node not in self.G or end_node not in self.G:
-                return {"success": False, "error": "Обрану вершину не знайдено (можливо, її було видалено)."}
-            if start_node == end_node:
-                return {"success": True, "path_nodes_ids": [start_node], "path_edges": [], "total_weight": 0}
-            path_nodes = nx.dijkstra_path(self.G, source=start_node, target=end_node, weight='weight')
-            path_weight = nx.dijkstra_path_length(self.G, source=start_node, target=end_node, weight='weight')
-            path_edges = []
-            for i in range(len(path_nodes) - 1):
-                u, v = path_nodes[i], path_nodes[i+1]
-                edge_data = self.G.get_edge_data(u, v)
-                best_key = min(edge_data, key=lambda k: edge_data[k]['weight'])
-                path_edges.append({
-                    "from": u, "to": v, 
-                    "id": edge_data[best_key].get('edge_id')
-                })
+            dist, pred, pred_edge = self.bellman_ford(source)
+        except NegativeCycle:
+            return {"success": False, "error": "Граф містить цикл від'ємної ваги, досяжний з початкової вершини."}
+        if end_node is None:
             return {
                 "success": True,
-                "path_nodes_ids": path_nodes,
-                "path_edges": path_edges,
-                "total_weight": path_weight
+                "source": g.ids[source],
+                "distances": {g.ids[u]: (None if dist[u] == INF else dist[u]) for u in self.order},
+                "predecessors": {
+                    g.ids[u]: {"node": g.ids[pred[u]], "edge": g.edge_ids[pred_edge[u]]}
+                    for u in self.order if pred[u] != -1
+                }
             }
-        except nx.NetworkXNoPath:
+        target = g.index[str(end_node)]
+        if dist[target] == INF:
             return {"success": False, "error": "Шлях між обраними вершинами не існує."}
-        except Exception as e:
-            return {"success": False, "error": str(e)}
-        
-    def run_floyd_warshall(self):
-        val_error = self._validate_weights()
-        if val_error: return val_error
-        n = len(self.node_ids)
-        dist = [[float('inf')] * n for _ in range(n)]
-        pred = [[(i + 1) if i != j else 0 for j in range(n)] for i in range(n)]
-        for i in range(n):
-            dist[i][i] = 0
-        for u_id, v_id, data in self.G.edges(data=True):
-            if u_id not in self.node_to_idx or v_id not in self.node_to_idx:
+        nodes, edges = self._trace(pred, pred_edge, source, target)
+        return self._path_result(nodes, edges, dist[target])
+
+    def multi_source_tree(self, sources):
+        g = self.graph
+        ptr, nbr, eid = self._out_lists()
+        weight = self.edge_weights()
+        dist, pred, pred_edge, origin = [INF] * g.n, [-1] * g.n, [-1] * g.n, [-1] * g.n
+        done = [False] * g.n
+        heap = []
+        for s in sources:
+            start = 0.0 if self._potential is None else -float(self._potential[s])
+            if start < dist[s]:
+                dist[s], origin[s] = start, s
+                heap.append((start, s))
+        heapq.heapify(heap)
+        while heap:
+            d, u = heapq.heappop(heap)
+            if done[u]:
                 continue
-            u = self.node_to_idx[u_id]
-            v = self.node_to_idx[v_id]
-            w = data['weight']
-            if w < dist[u][v]:
-                dist[u][v] = w
-                pred[u][v] = u + 1
-            if not self.is_directed:
-                if w < dist[v][u]:
-                    dist[v][u] = w
-                    pred[v][u] = v + 1
-
-        def get_snapshot(d_mat, p_mat):
-            return {
-                "M": [["∞" if x == float('inf') else (int(x) if x == int(x) else x) for x in row] for row in d_mat],
-                "T": [[x for x in row] for row in p_mat]
-            }
+            done[u] = True
+            for i in range(ptr[u], ptr[u + 1]):
+                v, e = nbr[i], eid[i]
+                nd = d + weight[e]
+                if nd < dist[v]:
+                    dist[v], pred[v], pred_edge[v], origin[v] = nd, u, e, origin[u]
+                    heapq.heappush(heap, (nd, v))
+        if self._potential is not None:
+            dist = [d + float(h) for d, h in zip(dist, self._potential.tolist())]
+        return dist, pred, pred_edge, origin
+
+    @instrumented
+    def run_multi_source(self, source_ids, end_node=None):
+        if not source_ids:
+            return {"success": False, "error": "Не задано жодної початкової вершини."}
+        error = self._dijkstra_error(*source_ids, *(() if end_node is None else (end_node,)))
+        if error: return error
+        g = self.graph
+        sources = [g.index[str(n_id)] for n_id in source_ids]
+        dist, pred, pred_edge, origin = self.multi_source_tree(sources)
+        result = {
+            "success": True,
+            "sources": [g.ids[s] for s in sources],
+            "distances": {g.ids[u]: (None if dist[u] == INF else dist[u]) for u in self.order},
+            "nearest": {g.ids[u]: g.ids[origin[u]] for u in self.order if origin[u] != -1},
+        }
+        if end_node is None:
+            return result
+        target = g.index[str(end_node)]
+        if origin[target] == -1:
+            return {"success": False, "error": "Жодна з початкових вершин не досягає кінцевої."}
+        nodes, edges = self._trace(pred, pred_edge, origin[target], target)
+        return {**result, **self._path_result(nodes, edges, self._real_total(edges, dist[target]))}
 
-        steps = [get_snapshot(dist, pred)]
-        for k in range(n):
-            for i in range(n):
-                for j in range(n):
-                    if dist[i][k] != float('inf') and dist[k][j] != float('inf'):
-                        if dist[i][k] + dist[k][j] < dist[i][j]:
-                            dist[i][j] = dist[i][k] + dist[k][j]
-                            pred[i][j] = pred[k][j]
-            steps.append(get_snapshot(dist, pred))
+    def _spur_path(self, spur, target, blocked_nodes, blocked_edges, to_target, next_hop, next_edge):
+        if to_target[spur] == INF:
+            return None
+        nodes, edges, u = [spur], [], spur
+        while u != target:
+            v, e = next_hop[u], next_edge[u]
+            if v in blocked_nodes or e in blocked_edges:
+                break
+            nodes.append(v)
+            edges.append(e)
+            u = v
+        else:
+            return nodes, edges, to_target[spur]
+        ptr, nbr, eid = self._out_lists()
+        weight = self.edge_weights()
+        dist, pred, closed = {spur: 0.0}, {spur: (-1, -1)}, set()
+        heap = [(to_target[spur], 0.0, spur)]
+        while heap:
+            _, d, u = heapq.heappop(heap)
+            if u in closed:
+                continue
+            if u == target:
+                nodes, edges = [u], []
+                while pred[u][0] != -1:
+                    u, e = pred[u]
+                    nodes.append(u)
+                    edges.append(e)
+                return nodes[::-1], edges[::-1], d
+            closed.add(u)
+            for i in range(ptr[u], ptr[u + 1]):
+                v, e = nbr[i], eid[i]
+                if v in blocked_nodes or e in blocked_edges or v in closed or to_target[v] == INF:
+                    continue
+                nd = d + weight[e]
+                if nd < dist.get(v, INF):
+                    dist[v], pred[v] = nd, (u, e)
+                    heapq.heappush(heap, (nd + to_target[v], nd, v))
+        return None
+
+    def k_shortest_paths(self, source, target, k):
+        weight = self.edge_weights()
+        to_target, next_hop, next_edge = self.shortest_path_tree(target, reverse=True)
+        first = self._spur_path(source, target, (), (), to_target, next_hop, next_edge)
+        if first is None:
+            return []
+        paths = [(first[1], first[0], 0)]
+        candidates, seen, counter = [], {tuple(first[1])}, 0
+        while len(paths) < k:
+            prev_edges, prev_nodes, deviation = paths[-1]
+            root_cost = sum(weight[e] for e in prev_edges[:deviation])
+            for i in range(deviation, len(prev_edges)):
+                spur, root_edges = prev_nodes[i], prev_edges[:i]
+                blocked_edges = {edges[i] for edges, _, _ in paths if len(edges) > i and edges[:i] == root_edges}
+                spur_path = self._spur_path(spur, target, set(prev_nodes[:i]), blocked_edges, to_target, next_hop, next_edge)
+                if spur_path is not None:
+                    edges = root_edges + spur_path[1]
+                    if tuple(edges) not in seen:
+                        seen.add(tuple(edges))
+                        counter += 1
+                        heapq.heappush(candidates, (root_cost + spur_path[2], len(edges), counter, edges, prev_nodes[:i] + spur_path[0], i))
+                root_cost += weight[prev_edges[i]]
+            if not candidates:
+                break
+            _, _, _, edges, nodes, deviation = heapq.heappop(candidates)
+            paths.append((edges, nodes, deviation))
+        return [(nodes, edges) for edges, nodes, _ in paths]
+
+    @instrumented
+    def run_k_shortest(self, start_node, end_node, k=K_SHORTEST_DEFAULT):
+        try:
+            k = int(k)
+        except (TypeError, ValueError):
+            k = 0
+        if not 1 <= k <= K_SHORTEST_MAX:
+            return {"success": False, "error": f"Кількість шляхів має бути від 1 до {K_SHORTEST_MAX}."}
+        error = self._dijkstra_error(start_node, end_node)
+        if error: return error
+        g = self.graph
+        source, target = g.index[str(start_node)], g.index[str(end_node)]
+        if source == target:
+            return {"success": True, "path_nodes_ids": [g.ids[source]], "path_edges": [], "total_weight": 0,
+                    "paths": [{"path_nodes_ids": [g.ids[source]], "path_edges": [], "total_weight": 0}]}
+        found = self.k_shortest_paths(source, target, k)
+        if not found:
+            return {"success": False, "error": "Шлях між обраними вершинами не існує."}
+        weight = g.weight.tolist()
+        paths = [self._path_result(nodes, edges, float(sum(weight[e] for e in edges))) for nodes, edges in found]
+        for path in paths:
+            del path["success"]
+        return {"success": True, **paths[0], "paths": paths}
+
+    def _floyd_init(self):
+        n = len(self.node_ids)
+        g = self.graph
+        pos = np.empty(n, dtype=np.int64)
+        pos[self.order] = np.arange(n)
+        rows, cols = pos[g.src], pos[g.dst]
+        if not self.is_directed:
+            rows, cols = np.concatenate([rows, cols]), np.concatenate([cols, rows])
+        dist = np.full((n, n), np.inf)
+        np.fill_diagonal(dist, 0)
+        np.minimum.at(dist, (rows, cols), np.tile(g.weight, 1 if self.is_directed else 2))
+        pred = np.repeat(np.arange(1, n + 1), n).reshape(n, n)
+        diag = np.arange(n)
+        pred[diag, diag] = np.where(dist[diag, diag] < 0, diag + 1, 0)
+        return dist, pred
+
+    @staticmethod
+    def _floyd_relax(dist, pred, k):
+        via_k = dist[:, k, None] + dist[None, k, :]
+        better = via_k < dist
+        if better.any():
+            dist = np.where(better, via_k, dist)
+            pred = np.where(better, pred[k][None, :], pred)
+        return dist, pred
+
+    @staticmethod
+    def _floyd_snapshot(dist, pred):
+        return {
+            "M": [["∞" if x == float('inf') else (int(x) if x == int(x) else x) for x in row] for row in dist.tolist()],
+            "T": pred.tolist()
+        }
+
+    def iter_floyd_steps(self, start=0):
+        dist, pred = self._floyd_init()
+        if start == 0:
+            yield self._floyd_snapshot(dist, pred)
+        for k in range(len(self.node_ids)):
+            dist, pred = self._floyd_relax(dist, pred, k)
+            if k + 1 >= start:
+                yield self._floyd_snapshot(dist, pred)
+
+    def floyd_header(self):
         return {
             "success": True,
-            "steps": steps,
-            "labels": [self.idx_to_label[i] for i in range(n)],
+            "labels": [self.idx_to_label[i] for i in range(len(self.node_ids))],
             "node_ids": self.node_ids
         }
 
-def run_floyd(nodes, edges, is_directed):
-    finder = PathFinder(nodes, edges, is_directed)
-    return finder.run_floyd_warshall()
+    @instrumented
+    def run_floyd_warshall(self, mode='every_k', offset=0, limit=None):
+        val_error = self._validate_weights()
+        if val_error: return val_error
+        if mode not in FLOYD_MODES:
+            return {"success": False, "error": f"Невідомий режим: {mode}. Доступні: {', '.join(FLOYD_MODES)}."}
+        if mode == 'final_only':
+            dist, pred = self._floyd_init()
+            for k in range(len(self.node_ids)):
+                dist, pred = self._floyd_relax(dist, pred, k)
+            steps = [self._floyd_snapshot(dist, pred)]
+        elif limit is not None:
+            total = len(self.node_ids) + 1
+            steps = list(islice(self.iter_floyd_steps(offset), limit))
+            end = offset + len(steps)
+            return {**self.floyd_header(), "steps": steps, "offset": offset,
+                    "next_offset": end if end < total else None, "total_steps": total}
+        else:
+            steps = self.iter_floyd_steps()
+            if mode == 'every_k':
+                steps = list(steps)
+        return {**self.floyd_header(), "steps": steps}
+
+def run_floyd(nodes, edges, is_directed, mode='every_k', offset=0, limit=None):
+    finder = PathFinder(compile_graph(nodes, edges, is_directed))
+    return finder.run_floyd_warshall(mode, offset, limit)
 
-def run_dijkstra(nodes, edges, is_directed, start_node, end_node):
-    finder = PathFinder(nodes, edges, is_directed)
-    return finder.run_dijkstra(start_node, end_node)
\ No newline at end of file
+def run_dijkstra(nodes, edges, is_directed, start_node, end_node, mode='tree', tree_cache=None, k=None, sources=None):
+    finder = PathFinder(compile_graph(nodes, edges, is_directed), tree_cache)
+    return finder.run_dijkstra(start_node, end_node, mode, k, sources)
\ No newline at end of file
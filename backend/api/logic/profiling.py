@@ -0,0 +1,78 @@
+import contextvars
+import functools
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+_recorder = contextvars.ContextVar('graph_phase_recorder', default=None)
+_parent = contextvars.ContextVar('graph_phase_parent', default='')
+
+
+class PhaseRecorder:
+    def __init__(self, memory=False, profile=False):
+        self.memory = memory
+        self.profile = profile
+        self.phases = []
+        self.profiles = []
+        self._lock = threading.Lock()
+
+    def add(self, name, wall_ms, cpu_ms, alloc_kb=None):
+        entry = {'name': name, 'wall_ms': round(wall_ms, 3), 'cpu_ms': round(cpu_ms, 3)}
+        if alloc_kb is not None:
+            entry['alloc_kb'] = round(alloc_kb, 1)
+        with self._lock:
+            self.phases.append(entry)
+
+    def report(self):
+        with self._lock:
+            return list(self.phases)
+
+
+def activate(recorder):
+    return _recorder.set(recorder)
+
+
+def deactivate(token):
+    _recorder.reset(token)
+
+
+def current():
+    return _recorder.get()
+
+
+def record(name, wall_ms, cpu_ms, alloc_kb=None):
+    recorder = _recorder.get()
+    if recorder is not None:
+        parent = _parent.get()
+        recorder.add(f"{parent}.{name}" if parent else name, wall_ms, cpu_ms, alloc_kb)
+
+
+@contextmanager
+def phase(name):
+    recorder = _recorder.get()
+    if recorder is None:
+        yield
+        return
+    parent = _parent.get()
+    token = _parent.set(f"{parent}.{name}" if parent else name)
+    traced = recorder.memory and tracemalloc.is_tracing()
+    mem_before = tracemalloc.get_traced_memory()[0] if traced else 0
+    wall, cpu = time.perf_counter(), time.thread_time()
+    try:
+        yield
+    finally:
+        wall, cpu = time.perf_counter() - wall, time.thread_time() - cpu
+        alloc = (tracemalloc.get_traced_memory()[0] - mem_before) / 1024 if traced else None
+        recorder.add(_parent.get(), wall * 1000, cpu * 1000, alloc)
+        _parent.reset(token)
+
+
+def instrumented(fn):
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        if _recorder.get() is None:
+            return fn(*args, **kwargs)
+        with phase(fn.__name__):
+            return fn(*args, **kwargs)
+    return wrapper
@@ -0,0 +1,149 @@
+from .euler import EULER_MODES
+from .graph_engine import GraphAnalyzer, MATRIX_FORMATS, parse_fields
+from .hamiltonian import TIME_BUDGET, STEP_BUDGET
+from .solvers import GraphSolvers
+from .tasks import DEFAULT_MATRIX_FORMAT
+
+TOPOLOGY = ('structure', 'ids', 'labels')
+PATHS = TOPOLOGY + ('edge_ids',)
+
+
+def _analyzer(graph, params):
+    analyzer = params.get('analyzer')
+    return analyzer if analyzer is not None and analyzer.graph is graph else GraphAnalyzer(graph)
+
+def _matrices(graph, params):
+    analyzer, fmt = _analyzer(graph, params), params['matrix_format']
+    return {'adjacency_matrix': analyzer.get_adjacency_matrix(fmt), 'incidence_matrix': analyzer.get_incidence_matrix(fmt)}
+
+def _degrees(graph, params):
+    degrees, is_regular = _analyzer(graph, params).get_degrees_info()
+    return {'degrees': degrees, 'is_regular': is_regular}
+
+def _cycles(graph, params):
+    info = _analyzer(graph, params).get_cycle_info()
+    return {'has_cycle': info['has_cycle'], 'girth': info['girth'], 'cycle_path': info['cycle_path'],
+            'cycle_edges': info['cycle_edges'], 'girth_time_ms': info['time_ms']}
+
+def _solver(graph, params):
+    return GraphSolvers(graph, params.get('time_budget', TIME_BUDGET), params.get('step_budget', STEP_BUDGET))
+
+
+# name: (aspects the value depends on, compute, result field or None to merge the dict)
+SECTIONS = {
+    'matrices': (('structure',), _matrices, None),
+    'adjacency_list': (TOPOLOGY, lambda graph, params: _analyzer(graph, params).get_adjacency_list(), 'adjacency_list'),
+    'degrees': (TOPOLOGY, _degrees, None),
+    'connectivity': (('structure',), lambda graph, params: _analyzer(graph, params).get_connectivity_info(), 'connectivity'),
+    'cycles': (PATHS, _cycles, None),
+    'euler': (PATHS, lambda graph, params: _solver(graph, params).get_eulerian_info(), 'euler'),
+    'postman': (PATHS + ('weights',), lambda graph, params: _solver(graph, params).get_eulerian_info('postman'), 'euler'),
+    'hamilton': (PATHS, lambda graph, params: _solver(graph, params).get_hamiltonian_info(), 'hamilton'),
+    'invariants': (PATHS, lambda graph, params: _solver(graph, params).get_graph_invariants(), 'invariants'),
+}
+
+# analyze fields each section provides
+SECTION_FIELDS = {
+    'matrices': ('adjacency_matrix', 'incidence_matrix'),
+    'adjacency_list': ('adjacency_list',),
+    'degrees': ('degrees', 'is_regular'),
+    'connectivity': ('connectivity',),
+    'cycles': ('has_cycle', 'girth', 'cycle_path', 'cycle_edges', 'girth_time_ms'),
+}
+
+# sections whose value is undecided when the search budget runs out
+BUDGETED = ('hamilton', 'invariants')
+
+KINDS = {
+    'analyze': ('matrices', 'adjacency_list', 'degrees', 'connectivity', 'cycles'),
+    'solve': ('euler', 'hamilton', 'invariants'),
+}
+
+
+def section_key(name, params):
+    if name != 'matrices':
+        return name
+    fmt = params.get('matrix_format', DEFAULT_MATRIX_FORMAT)
+    if fmt not in MATRIX_FORMATS:
+        raise ValueError(f"Невідомий формат матриці: {fmt}. Доступні: {', '.join(MATRIX_FORMATS)}.")
+    return f"matrices:{fmt}"
+
+
+def stamp(key, fingerprints):
+    return {aspect: fingerprints[aspect] for aspect in SECTIONS[key.split(':')[0]][0]}
+
+
+def fresh(properties, fingerprints):
+    return {key: entry for key, entry in properties.items() if entry.get('stamp') == stamp(key, fingerprints)}
+
+
+def _budget(params):
+    return [params.get('time_budget', TIME_BUDGET), params.get('step_budget', STEP_BUDGET)]
+
+
+def _decided(value):
+    exact = value.get('exact', True)
+    return all(exact.values()) if isinstance(exact, dict) else exact
+
+
+def usable(key, entry, fingerprints, params):
+    if entry is None or entry.get('stamp') != stamp(key, fingerprints):
+        return False
+    # an undecided search only stands for budgets no larger than the one it ran with
+    return 'budget' not in entry or all(want <= have for want, have in zip(_budget(params), entry['budget']))
+
+
+def _entry(name, key, graph, params, fingerprints):
+    entry = {'stamp': stamp(key, fingerprints), 'value': SECTIONS[name][1](graph, params)}
+    if name in BUDGETED and not _decided(entry['value']):
+        entry['budget'] = _budget(params)
+    return entry
+
+
+def _plan(kind, params):
+    if kind not in KINDS:
+        raise ValueError(f"Невідома операція: {kind}. Доступні: {', '.join(KINDS)}.")
+    params = {'matrix_format': DEFAULT_MATRIX_FORMAT, **params}
+    names, fields = KINDS[kind], None
+    if kind == 'analyze':
+        fields = parse_fields(params.get('fields'))
+        names = [name for name in names if set(SECTION_FIELDS[name]) & set(fields)]
+    elif params.get('euler_mode', 'auto') != 'auto':
+        if params['euler_mode'] not in EULER_MODES:
+            raise ValueError(f"Невідомий режим Ейлера: {params['euler_mode']}. Доступні: {', '.join(EULER_MODES)}.")
+        names = ['postman' if name == 'euler' else name for name in names]
+    return params, [(name, section_key(name, params)) for name in names], fields
+
+
+def missing(kind, params, properties, fingerprints):
+    params, sections, _ = _plan(kind, params)
+    return [key for _, key in sections if not usable(key, properties.get(key), fingerprints, params)]
+
+
+def compute(graph, kind, params, keys, fingerprints=None):
+    fingerprints = fingerprints or graph.fingerprints()
+    params, sections, _ = _plan(kind, params)
+    if kind == 'analyze':
+        params['analyzer'] = GraphAnalyzer(graph)
+    return {key: _entry(name, key, graph, params, fingerprints) for name, key in sections if key in keys}
+
+
+def assemble(kind, params, properties, is_directed):
+    params, sections, fields = _plan(kind, params)
+    result = {}
+    for name, key in sections:
+        field, value = SECTIONS[name][2], properties[key]['value']
+        if field is None:
+            result.update(value)
+        else:
+            result[field] = value
+    if kind == 'analyze':
+        result['is_directed'] = is_directed
+        result = {field: result[field] for field in fields}
+    return result
+
+
+def resolve(graph, kind, params, properties, fingerprints=None):
+    fingerprints = fingerprints or graph.fingerprints()
+    computed = compute(graph, kind, params, missing(kind, params, properties, fingerprints), fingerprints)
+    return assemble(kind, params, {**properties, **computed}, graph.is_directed), computed
@@ -0,0 +1,139 @@
+import multiprocessing
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import util
+from .hamiltonian import BudgetExceeded
+
+PARALLEL_MIN_VERTICES = 24
+CHUNKS_PER_WORKER = 4
+OWNER_BITS = 24
+
+# generation, lowest part index holding a witness, packed incumbent (size, owner)
+_state = None
+
+
+def _attach(state):
+    global _state
+    _state = state
+
+
+def _key(size, owner):
+    return size << OWNER_BITS | ((1 << OWNER_BITS) - 1 - owner)
+
+
+def beats(size, owner):
+    return _state is None or _key(size, owner) > _state[2]
+
+
+def offer(size, owner):
+    if _state is None:
+        return
+    with _state.get_lock():
+        if _key(size, owner) > _state[2]:
+            _state[2] = _key(size, owner)
+
+
+def _ping():
+    return True
+
+
+def _run_chunk(generation, engine, method, common, parts, first, deadline, step_limit, stop_on_witness):
+    results = []
+    for index, part in enumerate(parts, first):
+        def aborted(index=index):
+            return _state[0] != generation or (stop_on_witness and _state[1] < index)
+        if aborted():
+            break
+        engine.steps, engine._step_limit = 0, step_limit
+        engine._deadline = time.monotonic() + deadline - time.time()
+        engine._abort = aborted
+        try:
+            status, value = getattr(engine, method)(*common, index, part)
+        except BudgetExceeded:
+            if aborted():
+                break
+            status, value = 'budget', None
+        results.append((index, status, value))
+        if status == 'found' and stop_on_witness:
+            with _state.get_lock():
+                _state[1] = min(_state[1], index)
+            break
+    return results
+
+
+class SearchPool:
+    def __init__(self, workers=1, min_vertices=PARALLEL_MIN_VERTICES):
+        self.workers = workers
+        self.min_vertices = min_vertices
+        method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+        self._ctx = multiprocessing.get_context(method)
+        self._state = None
+        self._executor = None
+        self._lock = threading.Lock()
+
+    @property
+    def parallel(self):
+        return self.workers > 1
+
+    def configure(self, workers):
+        if workers != self.workers:
+            self.shutdown()
+        self.workers = workers
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _executor_locked(self):
+        if self._executor is None:
+            if self._state is None:
+                self._state = self._ctx.Array('q', 3)
+            self._executor = ProcessPoolExecutor(
+                self.workers, mp_context=self._ctx, initializer=_attach, initargs=(self._state,)
+            )
+            for _ in range(self.workers):
+                self._executor.submit(_ping)
+            # registered here, not in __init__: a forked child clears the finalizer registry
+            util.Finalize(self._executor, self._executor.shutdown, kwargs={'cancel_futures': True}, exitpriority=100)
+        return self._executor
+
+    def run(self, engine, method, common, parts, deadline, step_limit, stop_on_witness=False, incumbent=0):
+        if not parts:
+            return []
+        with self._lock:
+            executor = self._executor_locked()
+            state = self._state
+            with state.get_lock():
+                state[0] += 1
+                generation, state[1], state[2] = state[0], len(parts), _key(incumbent, 0)
+            size = -(-len(parts) // (self.workers * CHUNKS_PER_WORKER))
+            futures = {
+                executor.submit(_run_chunk, generation, engine, method, common, parts[i:i + size], i,
+                                deadline, step_limit, stop_on_witness): i
+                for i in range(0, len(parts), size)
+            }
+            results, pending = [], set(futures)
+            try:
+                while pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        results += future.result()
+                    if stop_on_witness:
+                        for future in [f for f in pending if futures[f] > state[1]]:
+                            if future.cancel():
+                                pending.discard(future)
+            except BrokenProcessPool:
+                self._executor = None
+                executor.shutdown(wait=False, cancel_futures=True)
+                raise
+            finally:
+                with state.get_lock():
+                    state[0] += 1
+        return sorted(results, key=lambda item: item[0])
+
+
+search_pool = SearchPool()
@@ -0,0 +1,42 @@
+from .graph_engine import parse_fields
+
+PAGED_KINDS = ('floyd', 'dfs', 'bfs', 'kruskal', 'prim')
+
+
+def row_cells(kind, n, params):
+    if kind == 'floyd':
+        return 2 * n * n
+    if kind in ('dfs', 'bfs'):
+        return 5 + (n if params.get('view', 'full') == 'full' else 1)
+    if kind in ('kruskal', 'prim'):
+        return 5 + (2 if params.get('view', 'full') == 'full' else 0)
+    return 1
+
+
+def total_rows(kind, n, params):
+    if kind == 'floyd':
+        return 1 if params.get('mode') == 'final_only' else n + 1
+    if kind in ('dfs', 'bfs'):
+        return 2 * n
+    if kind in ('kruskal', 'prim'):
+        return n
+    return 1
+
+
+def estimate(kind, n, m, params):
+    if kind in PAGED_KINDS:
+        return total_rows(kind, n, params) * row_cells(kind, n, params) + 3 * n
+    if kind == 'analyze':
+        fields = parse_fields(params.get('fields'))
+        dense = params.get('matrix_format') == 'dense'
+        cells = 4 * n + 2 * m
+        if 'adjacency_matrix' in fields:
+            cells += n * n if dense else 6 * m
+        if 'incidence_matrix' in fields:
+            cells += n * m if dense else 6 * m
+        return cells
+    return n + m
+
+
+def page_limit(kind, n, params, budget):
+    return max(1, budget // row_cells(kind, n, params))
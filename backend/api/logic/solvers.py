@@ -1,110 +1,120 @@
-import networkx as nx
+import time
+from .euler import EulerEngine, EULER_MODES
+from .graph_core import compile_graph
+from .hamiltonian import HamiltonianEngine, TIME_BUDGET, STEP_BUDGET
+from .invariants import InvariantsEngine
+from .search import search_pool
+from .profiling import instrumented
 
 class GraphSolvers:
-    def __init__(self, nodes, edges, is_directed=False):
-        self.is_directed = is_directed
-        self.G = nx.MultiDiGraph() if is_directed else nx.MultiGraph()
-        self.labels = {}
-        for node in nodes:
-            n_id = str(node.get('id'))
-            self.labels[n_id] = node.get('label', f"v{n_id}")
-            self.G.add_node(n_id)
-        for edge in edges:
-            u, v = str(edge.get('from')), str(edge.get('to'))
-            if u in self.G and v in self.G:
-                self.G.add_edge(u, v, weight=float(edge.get('weight', 1)), id=edge.get('id'))
+    def __init__(self, graph, time_budget=TIME_BUDGET, step_budget=STEP_BUDGET):
+        self.graph = graph
+        self.time_budget = time_budget
+        self.step_budget = step_budget
+        self.is_directed = graph.is_directed
+        self.labels = dict(zip(graph.ids, graph.labels))
+
+    @property
+    def G(self):
+        return self.graph.to_networkx()
 
     def _get_path_edges(self, path_ids):
-        edge_ids = []
-        for i in range(len(path_ids) - 1):
-            u, v = path_ids[i], path_ids[i+1]
-            for key, data in self.G.get_edge_data(u, v).items():
-                if data['id'] not in edge_ids:
-                    edge_ids.append(data['id'])
-                    break
-        return edge_ids
+        g = self.graph
+        return [g.edge_ids[e] for e in g.path_edge_indices([g.index[n] for n in path_ids])]
+
+    @instrumented
+    def get_eulerian_info(self, mode='auto'):
+        if mode not in EULER_MODES:
+            raise ValueError(f"Невідомий режим Ейлера: {mode}. Доступні: {', '.join(EULER_MODES)}.")
+        g, engine = self.graph, EulerEngine(self.graph)
+        if mode == 'postman':
+            return self._postman_info(engine)
+        kind, path, edges = engine.trail()
+        if kind is None:
+            return {"type": "none", "path": [], "edge_ids": [], "message": "Ейлерових структур не знайдено"}
+        return {
+            "type": kind,
+            "path": [g.labels[u] for u in path],
+            "edge_ids": [g.edge_ids[e] for e in edges],
+            "message": "Знайдено Ейлерів цикл" if kind == "cycle" else "Знайдено Ейлерів шлях"
+        }
 
-    def get_eulerian_info(self):
-        result = {"type": "none", "path": [], "edge_ids": [], "message": "Ейлерових структур не знайдено"}
-        nodes_with_edges = [n for n, d in self.G.degree() if d > 0]
-        if not nodes_with_edges: return result
-        sub = self.G.subgraph(nodes_with_edges)
-        try:
-            if nx.is_eulerian(sub):
-                circuit = list(nx.eulerian_circuit(sub, keys=True))
-                path_ids = [u for u, v, k in circuit] + [circuit[0][0]]
-                edge_ids = [sub[u][v][k]['id'] for u, v, k in circuit]
-                return {
-                    "type": "cycle",
-                    "path": [self.labels[n] for n in path_ids],
-                    "edge_ids": edge_ids,
-                    "message": "Знайдено Ейлерів цикл"
-                }
-            if nx.has_eulerian_path(sub):
-                path_edges = list(nx.eulerian_path(sub, keys=True))
-                path_ids = [u for u, v, k in path_edges] + [path_edges[-1][1]]
-                edge_ids = [sub[u][v][k]['id'] for u, v, k in path_edges]
-                return {
-                    "type": "path",
-                    "path": [self.labels[n] for n in path_ids],
-                    "edge_ids": edge_ids,
-                    "message": "Знайдено Ейлерів шлях"
-                }
-        except Exception: pass
-        return result
+    def _postman_info(self, engine):
+        g = self.graph
+        kind, path, edges, duplicated = engine.postman()
+        if kind is None:
+            message = ("Від'ємні ваги не підтримуються" if (g.weight < 0).any()
+                       else "Маршрут листоноші неможливий: граф не зв'язний")
+            return {"type": "none", "path": [], "edge_ids": [], "duplicated_edge_ids": [], "message": message}
+        weight = g.weight.tolist()
+        return {
+            "type": kind,
+            "path": [g.labels[u] for u in path],
+            "edge_ids": [g.edge_ids[e] for e in edges],
+            "duplicated_edge_ids": [g.edge_ids[e] for e in duplicated],
+            "total_weight": sum(weight[e] for e in edges),
+            "extra_weight": sum(weight[e] for e in duplicated),
+            "message": "Знайдено Ейлерів цикл" if kind == "cycle" else "Знайдено маршрут листоноші"
+        }
 
+    @instrumented
     def get_hamiltonian_info(self):
-        nodes = list(self.G.nodes())
-        n = len(nodes)
-        if n == 0 or n > 20: return {"type": "none", "path": [], "edge_ids": [], "message": "Завеликий або порожній граф"}
-        def find_ham(curr, path, looking_for_cycle):
-            if len(path) == n:
-                if not looking_for_cycle: return path
-                if not self.is_directed and n < 3: return None
-                if self.G.has_edge(path[-1], path[0]): return path + [path[0]]
-                return None
-            for neighbor in set(self.G.neighbors(curr)):
-                if neighbor not in path:
-                    res = find_ham(neighbor, path + [neighbor], looking_for_cycle)
-                    if res: return res
-            return None
-        for start in nodes:
-            res = find_ham(start, [start], True)
-            if res:
-                return {"type": "cycle", "path": [self.labels[n] for n in res], "edge_ids": self._get_path_edges(res), "message": "Знайдено Гамільтонів цикл"}
-        for start in nodes:
-            res = find_ham(start, [start], False)
-            if res:
-                return {"type": "path", "path": [self.labels[n] for n in res], "edge_ids": self._get_path_edges(res), "message": "Знайдено Гамільтонів шлях"}
-        return {"type": "none", "path": [], "edge_ids": [], "message": "Гамільтонових структур не знайдено"}
+        if not self.graph.n:
+            return {"type": "none", "path": [], "edge_ids": [], "exact": True, "message": "Порожній граф"}
+        engine = HamiltonianEngine(self.graph, self.time_budget, self.step_budget, search_pool)
+        kind, path = engine.search()
+        if kind == "unknown":
+            return {"type": "unknown", "path": [], "edge_ids": [], "exact": False, "message": "Невідомо: перевищено бюджет обчислень"}
+        if kind == "none":
+            return {"type": "none", "path": [], "edge_ids": [], "exact": True, "message": "Гамільтонових структур не знайдено"}
+        g = self.graph
+        message = "Знайдено Гамільтонів цикл" if kind == "cycle" else "Знайдено Гамільтонів шлях"
+        if not engine.cycle_known:
+            message += " (наявність циклу невідома: перевищено бюджет обчислень)"
+        return {
+            "type": kind,
+            "path": [g.labels[u] for u in path],
+            "edge_ids": [g.edge_ids[e] for e in g.path_edge_indices(path)],
+            "exact": kind == "cycle" or engine.cycle_known,
+            "message": message
+        }
 
+    @instrumented
     def get_graph_invariants(self):
-        simple_G = nx.Graph(self.G.to_undirected())
-        simple_G.remove_edges_from(nx.selfloop_edges(simple_G))
-        coloring = nx.coloring.greedy_color(simple_G, strategy="largest_first")
-        chromatic_number = max(coloring.values(), default=-1) + 1
-        try:
-            from networkx.algorithms import approximation
-            clique_number = len(approximation.max_clique(simple_G))
-            independence_set = approximation.maximum_independent_set(simple_G)
-            independence_number = len(independence_set)
-        except Exception:
-            clique_number = 0
-            independence_number = 0
+        started = time.monotonic()
+        g = self.graph
+        engine = InvariantsEngine(g, self.time_budget, self.step_budget, search_pool)
+        clique, clique_upper, clique_exact = engine.clique(0.25, started)
+        independent, independent_upper, independent_exact = engine.independent_set(1 / 3, started)
+        coloring, chromatic, chromatic_lower, chromatic_exact = engine.coloring(clique, 1.0, started)
         return {
-            "chromatic_number": chromatic_number,
-            "clique_number": clique_number,
-            "independence_number": independence_number,
-            "coloring": coloring
+            "chromatic_number": chromatic,
+            "clique_number": len(clique),
+            "independence_number": len(independent),
+            "coloring": {g.ids[u]: c for u, c in enumerate(coloring)},
+            "max_clique": [g.labels[u] for u in clique],
+            "max_independent_set": [g.labels[u] for u in independent],
+            "exact": {
+                "chromatic_number": chromatic_exact,
+                "clique_number": clique_exact,
+                "independence_number": independent_exact
+            },
+            "bounds": {
+                "chromatic_number": [chromatic_lower, chromatic],
+                "clique_number": [len(clique), clique_upper],
+                "independence_number": [len(independent), independent_upper]
+            },
+            "time_budget": self.time_budget
         }
 
-    def get_all_solutions(self):
+    @instrumented
+    def get_all_solutions(self, euler_mode='auto'):
         return {
-            "euler": self.get_eulerian_info(),
+            "euler": self.get_eulerian_info(euler_mode),
             "hamilton": self.get_hamiltonian_info(),
             "invariants": self.get_graph_invariants()
         }
 
-def run_solve(nodes, edges, is_directed):
-    solver = GraphSolvers(nodes, edges, is_directed)
-    return solver.get_all_solutions()
\ No newline at end of file
+def run_solve(nodes, edges, is_directed, time_budget=TIME_BUDGET, step_budget=STEP_BUDGET, euler_mode='auto'):
+    solver = GraphSolvers(compile_graph(nodes, edges, is_directed), time_budget, step_budget)
+    return solver.get_all_solutions(euler_mode)
\ No newline at end of file
@@ -0,0 +1,152 @@
+import heapq
+from itertools import chain
+import numpy as np
+from .graph_core import _csr, compile_graph
+from .pathfinding import validate_weights
+from .profiling import instrumented
+from .traversals import GraphTraverser
+
+SPANNING_ALGORITHMS = ('kruskal', 'prim')
+
+
+def _find(parent, x):
+    root = x
+    while parent[root] != root:
+        root = parent[root]
+    while parent[x] != root:
+        parent[x], x = root, parent[x]
+    return root
+
+
+class SpanningTree(GraphTraverser):
+    def __init__(self, graph):
+        super().__init__(graph)
+        self._candidates = None
+
+    def _validate(self):
+        if not self.graph.n:
+            return {"error": "Граф пустий. Алгоритм неможливий."}
+        return validate_weights(self.graph)
+
+    def prepare(self, start_node_id=None, view='full'):
+        if start_node_id in (None, '') and self.graph.n:
+            start_node_id = self.graph.ids[0]
+        return super().prepare(start_node_id, view)
+
+    def candidates(self):
+        # loops dropped, parallel edges collapsed to the lightest one (lowest index on ties), sorted by (weight, index)
+        if self._candidates is None:
+            g = self.graph
+            keep = np.flatnonzero(g.src != g.dst)
+            order = np.lexsort((keep, g.weight[keep]))
+            keep = keep[order]
+            lo, hi = np.minimum(g.src[keep], g.dst[keep]), np.maximum(g.src[keep], g.dst[keep])
+            _, first = np.unique(lo.astype(np.int64) * g.n + hi, return_index=True)
+            self._candidates = keep[np.sort(first)]
+        return self._candidates
+
+    def _tree_edge(self, e, u, v, weight, tree_edges):
+        g = self.graph
+        edge_id = g.edge_ids[e]
+        tree_edges.append({"from": g.ids[u], "to": g.ids[v], "id": edge_id, "weight": weight})
+        return self._edge_label(u, v), edge_id
+
+    def iter_kruskal(self, start, tree_edges, view='full'):
+        g = self.graph
+        full = view == 'full'
+        edges = self.candidates()
+        parent, size = list(range(g.n)), [1] * g.n
+        components = g.n
+        remaining = g.n - g.components_count()
+        counter, total, skipped = 0, 0.0, 0
+        for e, u, v, weight in zip(edges.tolist(), g.src[edges].tolist(), g.dst[edges].tolist(), g.weight[edges].tolist()):
+            if not remaining:
+                break
+            ru = u if parent[u] == u else _find(parent, u)
+            rv = v if parent[v] == v else _find(parent, v)
+            if ru == rv:
+                skipped += 1
+                continue
+            if size[ru] < size[rv]:
+                ru, rv = rv, ru
+            parent[rv] = ru
+            size[ru] += size[rv]
+            label, edge_id = self._tree_edge(e, u, v, weight, tree_edges)
+            counter += 1
+            total += weight
+            components -= 1
+            remaining -= 1
+            row = {"kruskal_num": counter, "tree_edge": label, "edge_id": edge_id, "weight": weight, "skipped": skipped}
+            if full:
+                row.update({"total_weight": total, "components": components})
+            skipped = 0
+            yield row
+
+    def iter_prim(self, start, tree_edges, view='full'):
+        g = self.graph
+        labels = g.labels
+        full = view == 'full'
+        edges = self.candidates()
+        src, dst = g.src[edges], g.dst[edges]
+        ptr, nbr, slot = _csr(g.n, np.concatenate([src, dst]), np.concatenate([dst, src]), np.concatenate([edges, edges]))
+        ptr, nbr, slot = ptr.tolist(), nbr.tolist(), slot.tolist()
+        weight, origin = g.weight.tolist(), g.src.tolist()
+        # lightest known (weight, edge) into each vertex; only improvements enter the heap
+        best_w, best_e = [float('inf')] * g.n, [-1] * g.n
+        in_tree = bytearray(g.n)
+        counter, total = 0, 0.0
+        for root in chain([start], range(g.n)):
+            if in_tree[root]:
+                continue
+            heap = []
+            u, row = root, {"vertex": labels[root], "prim_num": counter + 1, "tree_edge": "—", "edge_id": None, "weight": None}
+            while True:
+                in_tree[u] = 1
+                counter += 1
+                for i in range(ptr[u], ptr[u + 1]):
+                    v, e = nbr[i], slot[i]
+                    w = weight[e]
+                    if not in_tree[v] and (w < best_w[v] or w == best_w[v] and e < best_e[v]):
+                        best_w[v], best_e[v] = w, e
+                        heapq.heappush(heap, (w, e, u, v))
+                if full:
+                    row.update({"total_weight": total, "heap": len(heap)})
+                yield row
+                while heap and in_tree[heap[0][3]]:
+                    heapq.heappop(heap)
+                if not heap:
+                    break
+                w, e, parent, u = heapq.heappop(heap)
+                if self.is_directed and origin[e] != parent:
+                    label, edge_id = self._tree_edge(e, u, parent, w, tree_edges)
+                else:
+                    label, edge_id = self._tree_edge(e, parent, u, w, tree_edges)
+                total += w
+                row = {"vertex": labels[u], "prim_num": counter + 1, "tree_edge": label, "edge_id": edge_id, "weight": w}
+
+    def _run(self, iterate, start_node_id, view, offset=0, limit=None):
+        error, start = self.prepare(start_node_id, view)
+        if error:
+            return error
+        tree_edges = []
+        components = self.graph.components_count()
+        total = self.graph.n if iterate == self.iter_prim else self.graph.n - components
+        result = self._page(iterate(start, tree_edges, view), tree_edges, view, offset, limit, total)
+        result.update({"components": components, "is_forest": components > 1})
+        if limit is None:
+            result["total_weight"] = sum(edge["weight"] for edge in tree_edges)
+        return result
+
+    @instrumented
+    def run_kruskal(self, view='full', offset=0, limit=None):
+        return self._run(self.iter_kruskal, None, view, offset, limit)
+
+    @instrumented
+    def run_prim(self, start_node_id=None, view='full', offset=0, limit=None):
+        return self._run(self.iter_prim, start_node_id, view, offset, limit)
+
+def run_kruskal(nodes, edges, is_directed, view='full', offset=0, limit=None):
+    return SpanningTree(compile_graph(nodes, edges, is_directed)).run_kruskal(view, offset, limit)
+
+def run_prim(nodes, edges, is_directed, start_node=None, view='full', offset=0, limit=None):
+    return SpanningTree(compile_graph(nodes, edges, is_directed)).run_prim(start_node, view, offset, limit)
@@ -0,0 +1,112 @@
+from .graph_core import compile_graph
+from .graph_engine import GraphAnalyzer, ANALYSIS_FIELDS, parse_fields
+from .hamiltonian import TIME_BUDGET, STEP_BUDGET
+from .pathfinding import PathFinder, TreeCarrier
+from .solvers import GraphSolvers
+from .spanning import SpanningTree
+from .traversals import GraphTraverser
+
+DEFAULT_MATRIX_FORMAT = 'coo'
+
+
+def _analyze(graph, params):
+    matrix_format = params.get('matrix_format', DEFAULT_MATRIX_FORMAT)
+    return [(None, lambda: GraphAnalyzer(graph).get_all_properties(matrix_format, params.get('fields')))]
+
+def _solve(graph, params):
+    solver = GraphSolvers(graph, params.get('time_budget', TIME_BUDGET), params.get('step_budget', STEP_BUDGET))
+    return [
+        ('euler', lambda: solver.get_eulerian_info(params.get('euler_mode', 'auto'))),
+        ('hamilton', solver.get_hamiltonian_info),
+        ('invariants', solver.get_graph_invariants),
+    ]
+
+def _dijkstra(graph, params):
+    trees = params.get('tree_cache')
+    finder = PathFinder(graph, trees)
+
+    def run():
+        result = finder.run_dijkstra(
+            params.get('start_node'), params.get('end_node'), params.get('mode', 'tree'), params.get('k'), params.get('sources')
+        )
+        if isinstance(trees, TreeCarrier) and trees.computed:
+            result['_trees'] = trees.computed
+        return result
+    return [(None, run)]
+
+def _floyd(graph, params):
+    mode = params.get('mode', 'every_k')
+    if mode == 'stream':
+        mode = 'every_k'
+    return [(None, lambda: PathFinder(graph).run_floyd_warshall(mode, params.get('offset', 0), params.get('limit')))]
+
+def _dfs(graph, params):
+    return [(None, lambda: GraphTraverser(graph).run_dfs(
+        params.get('start_node'), params.get('view', 'full'), params.get('offset', 0), params.get('limit')
+    ))]
+
+def _bfs(graph, params):
+    return [(None, lambda: GraphTraverser(graph).run_bfs(
+        params.get('start_node'), params.get('view', 'full'), params.get('offset', 0), params.get('limit')
+    ))]
+
+def _kruskal(graph, params):
+    return [(None, lambda: SpanningTree(graph).run_kruskal(
+        params.get('view', 'full'), params.get('offset', 0), params.get('limit')
+    ))]
+
+def _prim(graph, params):
+    return [(None, lambda: SpanningTree(graph).run_prim(
+        params.get('start_node'), params.get('view', 'full'), params.get('offset', 0), params.get('limit')
+    ))]
+
+
+TASKS = {
+    'analyze': _analyze,
+    'solve': _solve,
+    'dijkstra': _dijkstra,
+    'floyd': _floyd,
+    'dfs': _dfs,
+    'bfs': _bfs,
+    'kruskal': _kruskal,
+    'prim': _prim,
+}
+
+
+def cache_namespace(kind, params):
+    if kind == 'analyze':
+        namespace = f"analyze:{params.get('matrix_format', DEFAULT_MATRIX_FORMAT)}"
+        fields = parse_fields(params.get('fields'))
+        return namespace if fields == tuple(ANALYSIS_FIELDS) else f"{namespace}:{','.join(fields)}"
+    if kind == 'solve' and params.get('euler_mode', 'auto') != 'auto':
+        return f"solve:{params['euler_mode']}"
+    return kind
+
+
+def run_task(kind, graph, params, report=None):
+    steps = TASKS[kind](graph, params)
+    result = {}
+    for i, (key, fn) in enumerate(steps):
+        value = fn()
+        if key is None:
+            result = value
+        else:
+            result[key] = value
+        if report:
+            report((i + 1) / len(steps))
+    return result
+
+
+def run_payload(kind, payload, report=None):
+    graph = compile_graph(payload.get('nodes', []), payload.get('edges', []), payload.get('is_directed', False))
+    return run_task(kind, graph, payload, report)
+
+
+def process_main(kind, payload, conn):
+    try:
+        result = run_payload(kind, payload, lambda progress: conn.send(('progress', progress)))
+        conn.send(('done', result))
+    except Exception as e:
+        conn.send(('error', str(e)))
+    finally:
+        conn.close()
@@ -1,148 +1,160 @@
-import networkx as nx
+from collections import deque
+from itertools import islice
+from .graph_core import compile_graph
+from .profiling import instrumented
+
+TRAVERSAL_VIEWS = ('full', 'delta')
 
 class GraphTraverser:
-    def __init__(self, nodes, edges, is_directed=False):
-        self.is_directed = is_directed
-        self.raw_nodes = nodes
-        self.nodes_dict = {str(n['id']): n.get('label', f"v{n['id']}") for n in nodes}
-        self.G = nx.MultiDiGraph() if is_directed else nx.MultiGraph()
-        for node in nodes: 
-            self.G.add_node(str(node['id']))
-        for edge in edges: 
-            u, v = str(edge['from']), str(edge['to'])
-            if u in self.nodes_dict and v in self.nodes_dict:
-                self.G.add_edge(u, v, id=edge.get('id'))
+    def __init__(self, graph):
+        self.graph = graph
+        self.is_directed = graph.is_directed
+        self.nodes_dict = dict(zip(graph.ids, graph.labels))
+        self._adj = None
 
     def _validate(self):
-        if not self.raw_nodes:
+        if not self.graph.n:
             return {"error": "Граф пустий. Алгоритм неможливий."}
-        if self.is_directed:
-            comp_count = nx.number_weakly_connected_components(self.G)
-        else:
-            comp_count = nx.number_connected_components(self.G)
+        comp_count = self.graph.components_count()
         if comp_count > 1:
             return {"error": f"Граф незв'язний (компонент: {comp_count}). Для обходу граф має бути зв'язним."}
         return None
 
-    def run_dfs(self, start_node_id):
+    def _sorted_adjacency(self):
+        if self._adj is None:
+            g = self.graph
+            self._adj = [
+                [(v, g.edge_ids[e]) for v, e in sorted(g.neighbor_edges(u), key=lambda ve: g.labels[ve[0]])]
+                for u in range(g.n)
+            ]
+        return self._adj
+
+    def _edge_label(self, u, v):
+        labels = self.graph.labels
+        return f"({labels[u]}, {labels[v]})" if self.is_directed else f"{{{labels[u]}, {labels[v]}}}"
+
+    def prepare(self, start_node_id, view='full'):
         val_error = self._validate()
         if val_error:
-            return val_error
+            return val_error, None
+        if view not in TRAVERSAL_VIEWS:
+            return {"error": f"Невідомий режим протоколу: {view}. Доступні: {', '.join(TRAVERSAL_VIEWS)}."}, None
         start_node_id = str(start_node_id)
         if start_node_id not in self.nodes_dict:
-            return {"error": f"Початкову вершину не знайдено (можливо, її було видалено)"}
-        protocol = []
-        visited = set()
-        stack = [start_node_id]
-        tree_edges = []
+            return {"error": f"Початкову вершину не знайдено (можливо, її було видалено)"}, None
+        return None, self.graph.index[start_node_id]
+
+    def iter_dfs(self, start, tree_edges, view='full'):
+        g, adj = self.graph, self._sorted_adjacency()
+        labels, ids = g.labels, g.ids
+        full = view == 'full'
+        cursor = [0] * g.n
+        visited = [False] * g.n
+        visited[start] = True
+        stack, stack_labels = [start], [labels[start]]
         counter = 1
-        visited.add(start_node_id)
-        protocol.append({
-            "vertex": self.nodes_dict[start_node_id],
-            "dfs_num": counter,
-            "stack": [self.nodes_dict[n] for n in stack],
-            "tree_edge": "—",
-            "edge_id": None
-        })
+        row = {"vertex": labels[start], "dfs_num": counter, "tree_edge": "—", "edge_id": None}
+        row.update({"stack": list(stack_labels)} if full else {"push": labels[start]})
+        yield row
         while stack:
             u = stack[-1]
-            unvisited_neighbor = None
-            found_edge_id = None
-            neighbors = sorted(list(self.G.neighbors(u)), key=lambda x: self.nodes_dict.get(x, x))
-            for v in neighbors:
-                if v not in visited:
-                    unvisited_neighbor = v
-                    edge_data = self.G.get_edge_data(u, v)
-                    key = list(edge_data.keys())[0]
-                    found_edge_id = edge_data[key].get('id')
-                    break
-            if unvisited_neighbor:
+            nbrs, i = adj[u], cursor[u]
+            while i < len(nbrs) and visited[nbrs[i][0]]:
+                i += 1
+            cursor[u] = i
+            if i < len(nbrs):
+                v, edge_id = nbrs[i]
                 counter += 1
-                v = unvisited_neighbor
-                visited.add(v)
+                visited[v] = True
                 stack.append(v)
-                edge_label = f"({self.nodes_dict[u]}, {self.nodes_dict[v]})" if self.is_directed else f"{{{self.nodes_dict[u]}, {self.nodes_dict[v]}}}"
-                tree_edges.append({"from": u, "to": v, "id": found_edge_id})
-                protocol.append({
-                    "vertex": self.nodes_dict[v],
-                    "dfs_num": counter,
-                    "stack": [self.nodes_dict[n] for n in stack],
-                    "tree_edge": edge_label,
-                    "edge_id": found_edge_id
-                })
+                stack_labels.append(labels[v])
+                tree_edges.append({"from": ids[u], "to": ids[v], "id": edge_id})
+                row = {"vertex": labels[v], "dfs_num": counter, "tree_edge": self._edge_label(u, v), "edge_id": edge_id}
+                row.update({"stack": list(stack_labels)} if full else {"push": labels[v]})
             else:
                 stack.pop()
-                if stack:
-                    protocol.append({
-                        "vertex": "—",
-                        "dfs_num": "—",
-                        "stack": [self.nodes_dict[n] for n in stack],
-                        "tree_edge": "backtrack",
-                        "edge_id": None
-                    })
+                stack_labels.pop()
+                row = {"vertex": "—", "dfs_num": "—", "tree_edge": "backtrack" if stack else "—", "edge_id": None}
+                if full:
+                    row["stack"] = list(stack_labels) if stack else "∅"
                 else:
-                    protocol.append({
-                        "vertex": "—",
-                        "dfs_num": "—",
-                        "stack": "∅",
-                        "tree_edge": "—",
-                        "edge_id": None
-                    })
-        return {"protocol": protocol, "tree_edges": tree_edges}
+                    row["pop"] = 1
+            yield row
 
-    def run_bfs(self, start_node_id):
-        val_error = self._validate()
-        if val_error:
-            return val_error
-        start_node_id = str(start_node_id)
-        if start_node_id not in self.nodes_dict:
-            return {"error": f"Початкову вершину не знайдено (можливо, її було видалено)"}
-        protocol = []
-        visited = {start_node_id}
-        queue = [start_node_id]
-        tree_edges = []
+    def iter_bfs(self, start, tree_edges, view='full'):
+        g, adj = self.graph, self._sorted_adjacency()
+        labels, ids = g.labels, g.ids
+        full = view == 'full'
+        visited = [False] * g.n
+        visited[start] = True
+        queue, queue_labels = deque([start]), deque([labels[start]])
         counter = 1
-        protocol.append({
-            "vertex": self.nodes_dict[start_node_id],
-            "bfs_num": counter,
-            "queue": [self.nodes_dict[n] for n in queue],
-            "tree_edge": "—",
-            "edge_id": None
-        })
-        head_idx = 0
-        while head_idx < len(queue):
-            u = queue[head_idx]
-            neighbors = sorted(list(self.G.neighbors(u)), key=lambda x: self.nodes_dict.get(x, x))
-            for v in neighbors:
-                if v not in visited:
-                    counter += 1
-                    visited.add(v)
-                    queue.append(v)
-                    edge_data = self.G.get_edge_data(u, v)
-                    key = list(edge_data.keys())[0]
-                    found_edge_id = edge_data[key].get('id')
-                    edge_label = f"({self.nodes_dict[u]}, {self.nodes_dict[v]})" if self.is_directed else f"{{{self.nodes_dict[u]}, {self.nodes_dict[v]}}}"
-                    tree_edges.append({"from": u, "to": v, "id": found_edge_id})
-                    protocol.append({
-                        "vertex": self.nodes_dict[v],
-                        "bfs_num": counter,
-                        "queue": [self.nodes_dict[n] for n in queue[head_idx:]],
-                        "tree_edge": edge_label,
-                        "edge_id": found_edge_id
-                    })
-            head_idx += 1
-            current_queue = [self.nodes_dict[n] for n in queue[head_idx:]]
-            protocol.append({
-                "vertex": "—",
-                "bfs_num": "—",
-                "queue": current_queue if current_queue else "∅",
-                "tree_edge": "—",
-                "edge_id": None
-            })
-        return {"protocol": protocol, "tree_edges": tree_edges}
+        row = {"vertex": labels[start], "bfs_num": counter, "tree_edge": "—", "edge_id": None}
+        row.update({"queue": list(queue_labels)} if full else {"push": labels[start]})
+        yield row
+        while queue:
+            u = queue[0]
+            for v, edge_id in adj[u]:
+                if visited[v]:
+                    continue
+                counter += 1
+                visited[v] = True
+                queue.append(v)
+                queue_labels.append(labels[v])
+                tree_edges.append({"from": ids[u], "to": ids[v], "id": edge_id})
+                row = {"vertex": labels[v], "bfs_num": counter, "tree_edge": self._edge_label(u, v), "edge_id": edge_id}
+                row.update({"queue": list(queue_labels)} if full else {"push": labels[v]})
+                yield row
+            queue.popleft()
+            queue_labels.popleft()
+            row = {"vertex": "—", "bfs_num": "—", "tree_edge": "—", "edge_id": None}
+            if full:
+                row["queue"] = list(queue_labels) if queue_labels else "∅"
+            else:
+                row["pop"] = 1
+            yield row
+
+    def _reachable(self, start):
+        if not self.is_directed:
+            return self.graph.n
+        # weak connectivity does not mean every vertex is reachable from start
+        adj = self._sorted_adjacency()
+        seen, frontier = {start}, [start]
+        while frontier:
+            for v, _ in adj[frontier.pop()]:
+                if v not in seen:
+                    seen.add(v)
+                    frontier.append(v)
+        return len(seen)
+
+    def _run(self, iterate, start_node_id, view, offset=0, limit=None):
+        error, start = self.prepare(start_node_id, view)
+        if error:
+            return error
+        tree_edges = []
+        total = 2 * self._reachable(start) if limit is not None else None
+        return self._page(iterate(start, tree_edges, view), tree_edges, view, offset, limit, total)
+
+    def _page(self, rows, tree_edges, view, offset, limit, total):
+        if limit is None:
+            return {"protocol": list(rows), "tree_edges": tree_edges, "view": view}
+        deque(islice(rows, offset), maxlen=0)
+        before = len(tree_edges)
+        protocol = list(islice(rows, limit))
+        end = offset + len(protocol)
+        return {"protocol": protocol, "tree_edges": tree_edges[before:], "view": view, "offset": offset,
+                "next_offset": end if len(protocol) == limit and end < total else None, "total_rows": total}
+
+    @instrumented
+    def run_dfs(self, start_node_id, view='full', offset=0, limit=None):
+        return self._run(self.iter_dfs, start_node_id, view, offset, limit)
+
+    @instrumented
+    def run_bfs(self, start_node_id, view='full', offset=0, limit=None):
+        return self._run(self.iter_bfs, start_node_id, view, offset, limit)
 
-def run_dfs(nodes, edges, is_directed, start_node):
-    return GraphTraverser(nodes, edges, is_directed).run_dfs(start_node)
+def run_dfs(nodes, edges, is_directed, start_node, view='full', offset=0, limit=None):
+    return GraphTraverser(compile_graph(nodes, edges, is_directed)).run_dfs(start_node, view, offset, limit)
 
-def run_bfs(nodes, edges, is_directed, start_node):
-    return GraphTraverser(nodes, edges, is_directed).run_bfs(start_node)
\ No newline at end of file
+def run_bfs(nodes, edges, is_directed, start_node, view='full', offset=0, limit=None):
+    return GraphTraverser(compile_graph(nodes, edges, is_directed)).run_bfs(start_node, view, offset, limit)
@@ -0,0 +1,69 @@
+import cProfile
+import os
+import signal
+import time
+import tracemalloc
+from . import profiling, tasks  # noqa: F401  (forkserver preloads the engines through tasks)
+from .search import search_pool
+
+_flags = None
+_pids = None
+_slot = None
+
+
+class TaskCancelled(BaseException):
+    pass
+
+
+def _interrupt(signum, frame):
+    if _slot is not None and _flags[_slot]:
+        raise TaskCancelled()
+
+
+def warm(flags, pids, search_workers=1):
+    global _flags, _pids
+    _flags, _pids = flags, pids
+    search_pool.configure(search_workers)
+    import networkx, numpy, scipy.sparse.csgraph  # noqa: F401
+    if hasattr(signal, 'SIGUSR1'):
+        signal.signal(signal.SIGUSR1, _interrupt)
+
+
+def ping():
+    return os.getpid()
+
+
+def execute(slot, trace, fn, *args):
+    # a worker runs one task at a time, so its thread clock, tracemalloc and profiler see only this task
+    global _slot
+    memory, profile = trace
+    recorder = profiling.PhaseRecorder(memory)
+    token = profiling.activate(recorder)
+    profiler = cProfile.Profile() if profile else None
+    if memory:
+        tracemalloc.start()
+    cpu, alloc, result = time.thread_time(), None, None
+    try:
+        _slot = slot
+        _pids[slot] = os.getpid()
+        if _flags[slot]:
+            raise TaskCancelled()
+        if profiler:
+            profiler.enable()
+        result = fn(*args)
+    except TaskCancelled:
+        pass
+    finally:
+        if profiler:
+            profiler.disable()
+        if memory:
+            alloc = tracemalloc.get_traced_memory()[0] / 1024
+            tracemalloc.stop()
+        _slot = None
+        _pids[slot] = 0
+        profiling.deactivate(token)
+    report = {'phases': recorder.report(), 'cpu_ms': (time.thread_time() - cpu) * 1000, 'alloc_kb': alloc}
+    if profiler:
+        profiler.create_stats()
+        report['profile'] = profiler.stats
+    return result, report
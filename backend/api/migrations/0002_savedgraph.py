@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:25
+
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SavedGraph',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('name', models.CharField(blank=True, default='', max_length=200)),
+                ('is_directed', models.BooleanField(default=False)),
+                ('nodes', models.JSONField(default=dict)),
+                ('edges', models.JSONField(default=dict)),
+                ('nodes_count', models.PositiveIntegerField(default=0)),
+                ('edges_count', models.PositiveIntegerField(default=0)),
+                ('content_hash', models.CharField(db_index=True, max_length=40)),
+                ('fingerprints', models.JSONField(default=dict)),
+                ('properties', models.JSONField(default=dict)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['-updated_at'],
+            },
+        ),
+    ]
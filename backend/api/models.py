@@ -0,0 +1,43 @@
+import uuid
+from django.db import models
+
+
+class AnalysisJob(models.Model):
+    STATUS_CHOICES = [
+        ('queued', 'queued'),
+        ('running', 'running'),
+        ('done', 'done'),
+        ('failed', 'failed'),
+        ('timeout', 'timeout'),
+        ('cancelled', 'cancelled'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    kind = models.CharField(max_length=32)
+    status = models.CharField(max_length=16, choices=STATUS_CHOICES, default='queued')
+    progress = models.FloatField(default=0)
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-created_at']
+
+
+class SavedGraph(models.Model):
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    name = models.CharField(max_length=200, blank=True, default='')
+    is_directed = models.BooleanField(default=False)
+    nodes = models.JSONField(default=dict)
+    edges = models.JSONField(default=dict)
+    nodes_count = models.PositiveIntegerField(default=0)
+    edges_count = models.PositiveIntegerField(default=0)
+    content_hash = models.CharField(max_length=40, db_index=True)
+    fingerprints = models.JSONField(default=dict)
+    properties = models.JSONField(default=dict)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-updated_at']
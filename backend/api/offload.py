@@ -0,0 +1,140 @@
+import asyncio
+import math
+import multiprocessing
+import os
+import signal
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from django.conf import settings
+from .cache import result_cache
+from .logic import profiling, tasks, workers
+
+
+class Overloaded(Exception):
+    def __init__(self, retry_after):
+        super().__init__("Сервер перевантажено, повторіть запит пізніше.")
+        self.retry_after = retry_after
+
+
+class ComputePool:
+    def __init__(self, workers=2, queue=8, search_workers=1):
+        self.workers = workers
+        self.search_workers = search_workers
+        self.limit = workers + queue
+        method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+        self._ctx = multiprocessing.get_context(method)
+        if method == 'forkserver':
+            self._ctx.set_forkserver_preload(['api.logic.workers'])
+        self._flags = self._ctx.Array('b', self.limit, lock=False)
+        self._pids = self._ctx.Array('i', self.limit, lock=False)
+        self._free = list(range(self.limit))
+        self._durations = deque(maxlen=64)
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    self.workers, mp_context=self._ctx, initializer=workers.warm,
+                    initargs=(self._flags, self._pids, self.search_workers)
+                )
+                for _ in range(self.workers):
+                    self._executor.submit(workers.ping)
+            return self._executor
+
+    def _reset(self, executor):
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def retry_after(self):
+        with self._lock:
+            average = sum(self._durations) / len(self._durations) if self._durations else 1.0
+        return max(1, math.ceil(average * self.limit / self.workers))
+
+    def _acquire(self):
+        with self._lock:
+            if self._free:
+                slot = self._free.pop()
+                self._flags[slot] = 0
+                return slot
+        raise Overloaded(self.retry_after())
+
+    def _release(self, slot, started):
+        with self._lock:
+            self._durations.append(time.perf_counter() - started)
+            self._flags[slot] = 0
+            self._free.append(slot)
+
+    def _cancel(self, slot, future):
+        if future.cancel():
+            return
+        with self._lock:
+            if future.done():
+                return
+            self._flags[slot] = 1
+        pid = self._pids[slot]
+        if pid and hasattr(signal, 'SIGUSR1'):
+            try:
+                os.kill(pid, signal.SIGUSR1)
+            except ProcessLookupError:
+                pass
+
+    def pending(self):
+        with self._lock:
+            return self.limit - len(self._free)
+
+    async def run(self, kind, graph, params):
+        return await self.call(tasks.run_task, kind, graph, params)
+
+    async def call(self, fn, *args):
+        slot = self._acquire()
+        started = time.perf_counter()
+        executor = self.executor()
+        recorder = profiling.current()
+        trace = (recorder.memory, recorder.profile) if recorder is not None else (False, False)
+        try:
+            future = executor.submit(workers.execute, slot, trace, fn, *args)
+        except BrokenProcessPool:
+            self._release(slot, started)
+            self._reset(executor)
+            raise
+        future.add_done_callback(lambda _: self._release(slot, started))
+        try:
+            result, report = await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            self._cancel(slot, future)
+            raise
+        except BrokenProcessPool:
+            self._reset(executor)
+            raise
+        if recorder is not None:
+            # cpu and memory come from the worker: the event loop's clock is shared by every request it serves
+            profiling.record('offload', (time.perf_counter() - started) * 1000, report['cpu_ms'], report.get('alloc_kb'))
+            for item in report['phases']:
+                profiling.record(f"offload.{item['name']}", item['wall_ms'], item['cpu_ms'], item.get('alloc_kb'))
+            if 'profile' in report:
+                recorder.profiles.append(report['profile'])
+        return result
+
+    async def run_cached(self, kind, graph, params):
+        namespace = tasks.cache_namespace(kind, params)
+        result = result_cache.lookup(namespace, graph.content_hash())
+        if result is not None:
+            return result, True
+        result = await self.run(kind, graph, params)
+        result_cache.put(namespace, graph.content_hash(), result)
+        return result, False
+
+
+def _build_pool():
+    conf = getattr(settings, 'GRAPH_COMPUTE', {})
+    return ComputePool(conf.get('WORKERS', 2), conf.get('QUEUE', 8), conf.get('SEARCH_WORKERS', 1))
+
+
+compute_pool = _build_pool()
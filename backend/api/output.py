@@ -0,0 +1,59 @@
+from django.conf import settings
+from django.core import signing
+from .logic import sizing
+
+
+class OutputGuard:
+    def __init__(self, budgets=None, salt='graph-output'):
+        self.budgets = budgets or {}
+        self.salt = salt
+
+    def over(self, kind, n, m, params):
+        budget = self.budgets.get(kind)
+        return budget is not None and sizing.estimate(kind, n, m, params) > budget
+
+    def limit(self, kind, n, params):
+        budget = self.budgets.get(kind)
+        return None if budget is None else sizing.page_limit(kind, n, params, budget)
+
+    def compact(self, n, m, params):
+        if params.get('matrix_format') == 'dense' and self.over('analyze', n, m, params):
+            return {**params, 'matrix_format': 'csr'}
+        return params
+
+    def bound(self, kind, n, m, params):
+        if kind == 'analyze':
+            return self.compact(n, m, params), False
+        if kind == 'floyd':
+            if params.get('mode', 'every_k') not in ('every_k', 'stream'):
+                return params, False
+            params = {**params, 'mode': 'every_k'}
+        if kind in sizing.PAGED_KINDS and self.over(kind, n, m, params):
+            return {**params, 'offset': 0, 'limit': self.limit(kind, n, params)}, True
+        return params, False
+
+    def token(self, kind, graph_hash, offset, params):
+        return signing.dumps({'kind': kind, 'hash': graph_hash, 'offset': offset, 'params': params},
+                             salt=self.salt, compress=True)
+
+    def resume(self, token, kind, graph_hash):
+        try:
+            state = signing.loads(token, salt=self.salt)
+        except signing.BadSignature:
+            raise ValueError("Недійсний токен продовження.")
+        if state.get('kind') != kind or state.get('hash') != graph_hash:
+            raise ValueError("Токен продовження не відповідає графу або операції.")
+        return state['offset'], state['params']
+
+    def continued(self, kind, graph_hash, result, params):
+        if result.get('next_offset') is not None:
+            result['continuation'] = self.token(kind, graph_hash, result['next_offset'], params)
+        return result
+
+
+def _build_guard():
+    conf = getattr(settings, 'GRAPH_OUTPUT', {})
+    return OutputGuard(conf.get('BUDGETS'))
+
+
+output_guard = _build_guard()
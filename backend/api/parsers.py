@@ -0,0 +1,27 @@
+import struct
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser, JSONParser
+from .logic.binary import decode_graph
+from .renderers import orjson
+
+GRAPH_MEDIA_TYPE = 'application/x-graph'
+
+
+class FastJSONParser(JSONParser):
+    def parse(self, stream, media_type=None, parser_context=None):
+        if orjson is None or stream is None:
+            return super().parse(stream, media_type, parser_context)
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f"JSON parse error - {exc}")
+
+
+class BinaryGraphParser(BaseParser):
+    media_type = GRAPH_MEDIA_TYPE
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return decode_graph(stream.read() if stream is not None else b'')
+        except (ValueError, struct.error) as exc:
+            raise ParseError(f"Binary graph parse error - {exc}")
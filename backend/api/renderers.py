@@ -0,0 +1,96 @@
+import json
+import types
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+MATRIX_MEDIA_TYPE = 'application/x-graph-matrix'
+ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS if orjson else 0
+
+
+def _default(value):
+    if hasattr(value, 'tolist'):
+        return value.tolist()
+    return JSONEncoder().default(value)
+
+
+def dumps(value):
+    if orjson is not None:
+        return orjson.dumps(value, default=_default, option=ORJSON_OPTIONS)
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':'), default=_default).encode()
+
+
+def _streamable(value):
+    return isinstance(value, (list, tuple, types.GeneratorType)) or (
+        hasattr(value, '__next__') and not isinstance(value, (str, bytes, dict))
+    )
+
+
+def _encode(value):
+    if isinstance(value, dict):
+        yield b'{'
+        for i, (key, item) in enumerate(value.items()):
+            yield (b',' if i else b'') + dumps(str(key)) + b':'
+            yield from _encode(item)
+        yield b'}'
+    elif _streamable(value):
+        yield b'['
+        for i, item in enumerate(value):
+            yield (b',' if i else b'') + dumps(item)
+        yield b']'
+    else:
+        yield dumps(value)
+
+
+def iter_json(value, chunk_size=None):
+    chunk_size = chunk_size or settings.GRAPH_STREAMING['CHUNK_SIZE']
+    buffer, size = [], 0
+    for piece in _encode(value):
+        buffer.append(piece)
+        size += len(piece)
+        if size >= chunk_size:
+            yield b''.join(buffer)
+            buffer, size = [], 0
+    if buffer:
+        yield b''.join(buffer)
+
+
+async def aiter_json(value, chunk_size=None):
+    # async views run under ASGI, where Django buffers sync iterators in full before sending
+    for chunk in iter_json(value, chunk_size):
+        yield chunk
+
+
+def streaming_json(value, **headers):
+    response = StreamingHttpResponse(aiter_json(value), content_type='application/json')
+    for key, item in headers.items():
+        response[key.replace('_', '-')] = item
+    return response
+
+
+def is_large(cells):
+    return cells >= settings.GRAPH_STREAMING['MIN_CELLS']
+
+
+class FastJSONRenderer(JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None:
+            return super().render(data, accepted_media_type, renderer_context)
+        return dumps(data)
+
+
+class BinaryMatrixRenderer(BaseRenderer):
+    media_type = MATRIX_MEDIA_TYPE
+    format = 'matrix'
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if isinstance(data, (bytes, bytearray)):
+            return data
+        return dumps(data)
@@ -0,0 +1,280 @@
+import threading
+import uuid
+from django.conf import settings
+from .cache import MemoryBackend
+from .logic.graph_core import compile_graph, edge_dicts, node_dicts, parse_weight
+
+
+def _item(op, key, message):
+    item = op[key]
+    if not isinstance(item, dict):
+        raise ValueError(message)
+    return item
+
+
+class GraphSession:
+    def __init__(self, nodes, edges, is_directed=False):
+        self.id = uuid.uuid4().hex
+        self.lock = threading.RLock()
+        self.is_directed = bool(is_directed)
+        self.version = 0
+        self.nodes = {}
+        self.edges = {}
+        self.in_deg = {}
+        self.out_deg = {}
+        self.adjacency = {}
+        self.incident = {}
+        self._parent = {}
+        self._components = 0
+        self._components_valid = True
+        self._graph = None
+        self._edge_pos = None
+        self._auto_edge_id = 0
+        for node in node_dicts(nodes):
+            if str(node['id']) not in self.nodes:
+                self._add_node(node)
+        for edge in edge_dicts(edges):
+            if str(edge.get('from')) in self.nodes and str(edge.get('to')) in self.nodes:
+                self._add_edge(edge)
+
+    def _find(self, x):
+        parent = self._parent
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    def _union(self, a, b):
+        ra, rb = self._find(a), self._find(b)
+        if ra != rb:
+            self._parent[ra] = rb
+            self._components -= 1
+
+    def _rebuild_components(self):
+        self._parent = {n_id: n_id for n_id in self.nodes}
+        self._components = len(self.nodes)
+        for edge in self.edges.values():
+            self._union(str(edge['from']), str(edge['to']))
+        self._components_valid = True
+
+    def components_count(self):
+        if not self._components_valid:
+            self._rebuild_components()
+        return self._components
+
+    def _add_node(self, node):
+        n_id = str(node['id'])
+        if n_id in self.nodes:
+            raise ValueError(f"Вершина {n_id} вже існує.")
+        self.nodes[n_id] = node
+        self.in_deg[n_id] = self.out_deg[n_id] = 0
+        self.adjacency[n_id] = []
+        self.incident[n_id] = set()
+        if self._components_valid:
+            self._parent[n_id] = n_id
+            self._components += 1
+
+    def _add_edge(self, edge):
+        u, v = str(edge.get('from')), str(edge.get('to'))
+        if u not in self.nodes or v not in self.nodes:
+            raise ValueError("Ребро посилається на неіснуючу вершину.")
+        if edge.get('id') is None:
+            self._auto_edge_id += 1
+            edge = {**edge, 'id': f"auto-{self._auto_edge_id}"}
+        key = str(edge['id'])
+        if key in self.edges:
+            raise ValueError(f"Ребро {key} вже існує.")
+        self.edges[key] = edge
+        self.out_deg[u] += 1
+        self.in_deg[v] += 1
+        self.adjacency[u].append((v, key))
+        if not self.is_directed and u != v:
+            self.adjacency[v].append((u, key))
+        self.incident[u].add(key)
+        self.incident[v].add(key)
+        if self._components_valid:
+            self._union(u, v)
+        return key
+
+    def _remove_edge(self, key):
+        edge = self.edges.pop(str(key), None)
+        if edge is None:
+            raise ValueError(f"Ребро {key} не знайдено.")
+        key, u, v = str(key), str(edge['from']), str(edge['to'])
+        self.out_deg[u] -= 1
+        self.in_deg[v] -= 1
+        self.adjacency[u] = [item for item in self.adjacency[u] if item[1] != key]
+        if u != v and not self.is_directed:
+            self.adjacency[v] = [item for item in self.adjacency[v] if item[1] != key]
+        self.incident[u].discard(key)
+        self.incident[v].discard(key)
+        self._components_valid = False
+
+    def _remove_node(self, n_id):
+        n_id = str(n_id)
+        if n_id not in self.nodes:
+            raise ValueError(f"Вершину {n_id} не знайдено.")
+        for key in list(self.incident[n_id]):
+            self._remove_edge(key)
+        del self.nodes[n_id], self.in_deg[n_id], self.out_deg[n_id], self.adjacency[n_id], self.incident[n_id]
+        self._components_valid = False
+
+    def _set_weight(self, key, weight):
+        key = str(key)
+        if key not in self.edges:
+            raise ValueError(f"Ребро {key} не знайдено.")
+        self.edges[key] = {**self.edges[key], 'weight': weight, 'hasWeight': weight is not None}
+        if self._graph is not None:
+            w, has_w = parse_weight(self.edges[key])
+            self._graph.set_weight(self._edge_pos[key], w, has_w)
+
+    def apply(self, ops):
+        if not isinstance(ops, list):
+            raise ValueError("Список операцій має бути масивом.")
+        with self.lock:
+            self._check(ops)
+            for op in ops:
+                self._apply_one(op)
+            return self.summary()
+
+    def _check(self, ops):
+        # dry run over ids only, so a rejected batch leaves the session untouched
+        nodes, edges, ends = {}, {}, {}
+        auto_edge_id = self._auto_edge_id
+        has_node = lambda n_id: nodes.get(n_id, n_id in self.nodes)
+        has_edge = lambda key: edges.get(key, key in self.edges)
+        for i, op in enumerate(ops):
+            try:
+                if not isinstance(op, dict):
+                    raise ValueError("операція має бути об'єктом")
+                kind = op.get('op')
+                if kind == 'add_node':
+                    node = _item(op, 'node', "вершина має бути об'єктом")
+                    n_id = str(node['id'])
+                    if has_node(n_id):
+                        raise ValueError(f"Вершина {n_id} вже існує.")
+                    nodes[n_id] = True
+                elif kind == 'remove_node':
+                    n_id = str(op['id'])
+                    if not has_node(n_id):
+                        raise ValueError(f"Вершину {n_id} не знайдено.")
+                    nodes[n_id] = False
+                    for key in list(self.incident.get(n_id, ())) + [k for k, uv in ends.items() if n_id in uv]:
+                        edges[key] = False
+                elif kind == 'add_edge':
+                    edge = _item(op, 'edge', "ребро має бути об'єктом")
+                    u, v = str(edge.get('from')), str(edge.get('to'))
+                    if not has_node(u) or not has_node(v):
+                        raise ValueError("Ребро посилається на неіснуючу вершину.")
+                    if edge.get('id') is None:
+                        auto_edge_id += 1
+                        key = f"auto-{auto_edge_id}"
+                    else:
+                        key = str(edge['id'])
+                    if has_edge(key):
+                        raise ValueError(f"Ребро {key} вже існує.")
+                    edges[key], ends[key] = True, (u, v)
+                elif kind in ('remove_edge', 'set_weight'):
+                    key = str(op['id'])
+                    if not has_edge(key):
+                        raise ValueError(f"Ребро {key} не знайдено.")
+                    if kind == 'remove_edge':
+                        edges[key] = False
+                else:
+                    raise ValueError(f"Невідома операція: {kind}.")
+            except (KeyError, ValueError) as e:
+                raise ValueError(f"Операція #{i + 1} не виконана ({e}); жодну операцію не застосовано.")
+
+    def _apply_one(self, op):
+        kind = op.get('op')
+        if kind == 'add_node':
+            self._add_node(op['node'])
+        elif kind == 'remove_node':
+            self._remove_node(op['id'])
+        elif kind == 'add_edge':
+            self._add_edge(op['edge'])
+        elif kind == 'remove_edge':
+            self._remove_edge(op['id'])
+        elif kind == 'set_weight':
+            self._set_weight(op['id'], op.get('weight'))
+            self.version += 1
+            return
+        else:
+            raise ValueError(f"Невідома операція: {kind}.")
+        self._graph = None
+        self.version += 1
+
+    def graph(self):
+        with self.lock:
+            if self._graph is None:
+                self._graph = compile_graph(list(self.nodes.values()), list(self.edges.values()), self.is_directed)
+                self._edge_pos = {key: i for i, key in enumerate(self.edges)}
+            return self._graph
+
+    def degrees_info(self):
+        degree_list, values = [], []
+        for n_id, node in self.nodes.items():
+            label = node.get('label', f"v{node['id']}")
+            in_deg, out_deg = self.in_deg[n_id], self.out_deg[n_id]
+            if self.is_directed:
+                degree_list.append({'label': label, 'in_degree': in_deg, 'out_degree': out_deg, 'total': in_deg + out_deg})
+                values.append((in_deg, out_deg))
+            else:
+                degree_list.append({'label': label, 'degree': in_deg + out_deg})
+                values.append(in_deg + out_deg)
+        return degree_list, bool(values) and all(d == values[0] for d in values)
+
+    def adjacency_list(self):
+        rows = []
+        for n_id in sorted(self.nodes):
+            labels = {}
+            for v, _ in self.adjacency[n_id]:
+                labels.setdefault(v, self.nodes[v].get('label', f"v{self.nodes[v]['id']}"))
+            rows.append({
+                'vertex': self.nodes[n_id].get('label', f"v{self.nodes[n_id]['id']}"),
+                'neighbors': ", ".join(labels.values()) if labels else "—"
+            })
+        return rows
+
+    def summary(self, full=False):
+        with self.lock:
+            result = {
+                'id': self.id,
+                'version': self.version,
+                'is_directed': self.is_directed,
+                'nodes_count': len(self.nodes),
+                'edges_count': len(self.edges),
+                # removals defer the union-find rebuild until a full summary asks for it
+                'components_count': self.components_count() if full or self._components_valid else None,
+            }
+            if full:
+                result['degrees'], result['is_regular'] = self.degrees_info()
+                result['adjacency_list'] = self.adjacency_list()
+            return result
+
+
+class SessionStore:
+    def __init__(self, max_sessions=128, ttl=3600):
+        self._sessions = MemoryBackend(max_sessions, ttl)
+
+    def create(self, nodes, edges, is_directed):
+        session = GraphSession(nodes, edges, is_directed)
+        self._sessions.set(session.id, session)
+        return session
+
+    def get(self, session_id):
+        session = self._sessions.get(session_id)
+        if session is not None:
+            self._sessions.set(session_id, session)
+        return session
+
+    def delete(self, session_id):
+        return self._sessions.delete(session_id)
+
+
+def _build_store():
+    conf = getattr(settings, 'GRAPH_SESSIONS', {})
+    return SessionStore(conf.get('MAX_SESSIONS', 128), conf.get('TTL', 3600))
+
+
+session_store = _build_store()
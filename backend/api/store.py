@@ -0,0 +1,140 @@
+import asyncio
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from rest_framework.exceptions import NotFound
+from .logic import properties
+from .logic.graph_core import compile_graph, edge_dicts, node_dicts
+from .models import SavedGraph
+from .offload import Overloaded, compute_pool
+
+
+def _compact(graph):
+    raw = graph.raw_ids
+    return (
+        {'id': raw, 'label': graph.labels},
+        {
+            'from': [raw[u] for u in graph.src.tolist()],
+            'to': [raw[v] for v in graph.dst.tolist()],
+            'weight': [w if has_w else None for w, has_w in zip(graph.weight.tolist(), graph.has_weight.tolist())],
+            'hasWeight': graph.has_weight.tolist(),
+            'id': graph.edge_ids,
+        },
+    )
+
+
+class GraphStore:
+    def __init__(self, pool, precompute=('analyze', 'solve')):
+        self.pool = pool
+        self.precompute = precompute
+
+    def get(self, graph_id):
+        try:
+            return SavedGraph.objects.get(pk=graph_id)
+        except (SavedGraph.DoesNotExist, ValidationError):
+            return None
+
+    def require(self, graph_id):
+        record = self.get(graph_id)
+        if record is None:
+            raise NotFound({"error": "Граф не знайдено"})
+        return record
+
+    def list(self, limit=100):
+        return [self.summary(record) for record in SavedGraph.objects.defer('nodes', 'edges', 'properties')[:limit]]
+
+    def graph(self, record):
+        return compile_graph(record.nodes, record.edges, record.is_directed)
+
+    def _assign(self, record, graph):
+        record.nodes, record.edges = _compact(graph)
+        record.is_directed = graph.is_directed
+        record.nodes_count, record.edges_count = graph.n, graph.m
+        record.content_hash = graph.content_hash()
+        record.fingerprints = graph.fingerprints()
+        record.properties = properties.fresh(record.properties or {}, record.fingerprints)
+        if not record.properties:
+            twin = SavedGraph.objects.filter(content_hash=record.content_hash).exclude(pk=record.pk).first()
+            if twin is not None:
+                record.properties = properties.fresh(twin.properties, record.fingerprints)
+
+    async def create(self, data, params):
+        graph = await asyncio.to_thread(
+            compile_graph, data.get('nodes', []), data.get('edges', []), data.get('is_directed', False)
+        )
+        record = SavedGraph(name=str(data.get('name') or ''))
+        await sync_to_async(self._assign)(record, graph)
+        try:
+            for kind in self.precompute:
+                keys = properties.missing(kind, params, record.properties, record.fingerprints)
+                if keys:
+                    record.properties.update(
+                        await self.pool.call(properties.compute, graph, kind, params, keys, record.fingerprints)
+                    )
+        except Overloaded:
+            pass  # precompute is best effort; whatever is missing gets computed on first read
+        await sync_to_async(record.save)()
+        return record
+
+    def update(self, record, data):
+        if 'name' in data:
+            record.name = str(data.get('name') or '')
+        if any(key in data for key in ('nodes', 'edges', 'is_directed')):
+            self._assign(record, compile_graph(
+                data.get('nodes', record.nodes),
+                data.get('edges', record.edges),
+                data.get('is_directed', record.is_directed)
+            ))
+        record.save()
+        return record
+
+    def _keep(self, record, computed):
+        with transaction.atomic():
+            current = SavedGraph.objects.select_for_update().filter(
+                pk=record.pk, content_hash=record.content_hash
+            ).only('properties').first()
+            if current is not None:
+                current.properties.update(computed)
+                current.save(update_fields=['properties'])
+        record.properties.update(computed)
+
+    async def resolve(self, record, kind, params):
+        keys = properties.missing(kind, params, record.properties, record.fingerprints)
+        computed = {}
+        if keys:
+            graph = await asyncio.to_thread(self.graph, record)
+            computed = await self.pool.call(properties.compute, graph, kind, params, keys, record.fingerprints)
+            await sync_to_async(self._keep)(record, computed)
+        return properties.assemble(kind, params, {**record.properties, **computed}, record.is_directed), not computed
+
+    def payload(self, data):
+        if not data.get('graph_id'):
+            return data
+        record = self.require(data['graph_id'])
+        return {**data, 'nodes': record.nodes, 'edges': record.edges, 'is_directed': record.is_directed}
+
+    def summary(self, record, full=False):
+        summary = {
+            'id': str(record.id),
+            'name': record.name,
+            'is_directed': record.is_directed,
+            'nodes_count': record.nodes_count,
+            'edges_count': record.edges_count,
+            'content_hash': record.content_hash,
+            'created_at': record.created_at,
+            'updated_at': record.updated_at,
+        }
+        if full:
+            summary['nodes'] = node_dicts(record.nodes)
+            summary['edges'] = edge_dicts(record.edges)
+            summary['properties'] = sorted(record.properties)
+        return summary
+
+
+def _build_store():
+    conf = getattr(settings, 'GRAPH_STORE', {})
+    return GraphStore(compute_pool, tuple(conf.get('PRECOMPUTE', ('analyze', 'solve'))))
+
+
+graph_store = _build_store()
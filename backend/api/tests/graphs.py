@@ -0,0 +1,34 @@
+import random
+import networkx as nx
+
+
+def random_graph(seed, n, m, directed=False, weights=(1, 9), loops=True, parallel=True):
+    rnd = random.Random(seed)
+    nodes = [{'id': i, 'label': f"v{i}"} for i in range(n)]
+    edges, seen = [], set()
+    for k in range(m if n else 0):
+        u, v = rnd.randrange(n), rnd.randrange(n)
+        key = (u, v) if directed else frozenset((u, v))
+        if (u == v and not loops) or (key in seen and not parallel):
+            continue
+        seen.add(key)
+        edge = {'id': f"e{k}", 'from': u, 'to': v}
+        if weights is not None:
+            edge['weight'] = rnd.randint(*weights)
+        edges.append(edge)
+    return nodes, edges
+
+
+def to_networkx(nodes, edges, directed=False, multi=True):
+    G = (nx.MultiDiGraph() if directed else nx.MultiGraph()) if multi else (nx.DiGraph() if directed else nx.Graph())
+    G.add_nodes_from(node['id'] for node in nodes)
+    for edge in edges:
+        G.add_edge(edge['from'], edge['to'], weight=edge.get('weight', 1), id=edge['id'])
+    return G
+
+
+def cases(count, seed=0, sizes=(1, 9), density=2.0, **kwargs):
+    rnd = random.Random(seed)
+    for i in range(count):
+        n = rnd.randint(*sizes)
+        yield random_graph(seed * 100_003 + i, n, rnd.randint(0, int(density * n) + 1), **kwargs)
@@ -0,0 +1,63 @@
+import networkx as nx
+from django.test import SimpleTestCase
+from api.logic.graph_core import compile_graph
+from api.logic.graph_engine import ANALYSIS_FIELDS, GraphAnalyzer
+from .graphs import cases, to_networkx
+
+
+def _edge_connectivity(G):
+    # parallel edges add capacity; loops never help
+    flow = nx.DiGraph()
+    for u, v in G.edges():
+        if u != v:
+            for a, b in ((u, v), (v, u)):
+                capacity = flow.edges[a, b]['capacity'] if flow.has_edge(a, b) else 0
+                flow.add_edge(a, b, capacity=capacity + 1)
+    first = next(iter(G))
+    return min(nx.minimum_cut_value(flow, first, t) for t in G if t != first)
+
+
+class ConnectivityTests(SimpleTestCase):
+    def test_matches_networkx(self):
+        for directed in (False, True):
+            for nodes, edges in cases(200, seed=10, density=1.5, directed=directed):
+                info = GraphAnalyzer(compile_graph(nodes, edges, directed)).get_connectivity_info()
+                G = to_networkx(nodes, edges, False)
+                simple = nx.Graph(G)
+                simple.remove_edges_from(nx.selfloop_edges(simple))
+                self.assertEqual(info['components_count'], nx.number_connected_components(G), edges)
+                if len(G) < 2 or not nx.is_connected(G):
+                    self.assertEqual((info['vertex_connectivity'], info['edge_connectivity']), (0, 0), edges)
+                    continue
+                self.assertEqual(info['vertex_connectivity'], nx.node_connectivity(simple), (directed, edges))
+                self.assertEqual(info['edge_connectivity'], _edge_connectivity(G), (directed, edges))
+
+
+class CycleTests(SimpleTestCase):
+    def test_girth_matches_networkx(self):
+        for nodes, edges in cases(200, seed=11, loops=False, parallel=False):
+            info = GraphAnalyzer(compile_graph(nodes, edges, False)).get_cycle_info()
+            G = to_networkx(nodes, edges, False, multi=False)
+            girth = nx.girth(G)
+            if girth == float('inf'):
+                self.assertIsNone(info['cycle_path'] or None, edges)
+                continue
+            self.assertEqual(info['girth'], girth, edges)
+            self.assertEqual(len(info['cycle_edges']), girth)
+            path = [int(label[1:]) for label in info['cycle_path']]
+            self.assertEqual(path[0], path[-1])
+            for u, v in zip(path, path[1:]):
+                self.assertTrue(G.has_edge(u, v), (edges, path))
+
+
+class FieldSelectionTests(SimpleTestCase):
+    def test_selected_fields_match_full_analysis(self):
+        for nodes, edges in cases(20, seed=12):
+            full = GraphAnalyzer(compile_graph(nodes, edges, False)).get_all_properties('coo')
+            self.assertEqual(list(full), list(ANALYSIS_FIELDS))
+            picked = GraphAnalyzer(compile_graph(nodes, edges, False)).get_all_properties('coo', 'degrees,girth')
+            self.assertEqual(picked, {'degrees': full['degrees'], 'girth': full['girth']})
+
+    def test_unknown_field_is_rejected(self):
+        with self.assertRaises(ValueError):
+            GraphAnalyzer(compile_graph([{'id': 0}], [], False)).get_all_properties('coo', 'nope')
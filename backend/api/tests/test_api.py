@@ -0,0 +1,105 @@
+import asyncio
+import json
+from unittest import mock
+from django.test import SimpleTestCase
+from rest_framework.test import APIClient
+from api.cache import path_tree_cache
+from api.logic.graph_core import compile_graph
+from api.logic.pathfinding import tree_key
+from api.offload import Overloaded, compute_pool
+from api.output import output_guard
+from .graphs import random_graph
+
+
+def _lines(response):
+    async def collect():
+        return b''.join([chunk async for chunk in response.streaming_content])
+    return [json.loads(line) for line in asyncio.run(collect()).splitlines()]
+
+
+class ErrorPathTests(SimpleTestCase):
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_floyd_without_nodes_is_bad_request(self):
+        response = self.client.post('/api/floyd/', {'edges': []}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('error', response.json())
+
+    def test_session_delta_with_malformed_op_is_bad_request(self):
+        created = self.client.post('/api/sessions/', {'nodes': [{'id': 0}], 'edges': []}, format='json')
+        self.assertEqual(created.status_code, 201)
+        session_id = created.json()['id']
+        for ops in ([1], 'add_node', [{'op': 'add_edge', 'edge': {'from': 0, 'to': 7}}], [{'op': 'add_node', 'node': 5}],
+                    [{'op': 'add_node', 'node': {'id': 1}}, {'op': 'add_edge', 'edge': [1, 2]}]):
+            response = self.client.post(f'/api/sessions/{session_id}/delta/', {'ops': ops}, format='json')
+            self.assertEqual(response.status_code, 400, ops)
+            self.assertIn('error', response.json())
+        self.assertEqual(self.client.get(f'/api/sessions/{session_id}/').json()['nodes_count'], 1)
+
+
+class PathTreeCacheTests(SimpleTestCase):
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_dijkstra_reuses_trees_across_requests(self):
+        nodes, edges = random_graph(71, 6, 12, directed=True)
+        payload = {'nodes': nodes, 'edges': edges, 'is_directed': True, 'start_node': 0, 'mode': 'all'}
+        first = self.client.post('/api/dijkstra/', payload, format='json').json()
+        self.assertNotIn('_trees', first)
+        key = tree_key(compile_graph(nodes, edges, True), 0)
+        dist, pred, pred_edge = path_tree_cache.get(key)
+        path_tree_cache.set(key, ([42.0] * len(dist), pred, pred_edge))
+        second = self.client.post('/api/dijkstra/', payload, format='json').json()
+        self.assertEqual(set(second['distances'].values()), {42.0})
+        path_tree_cache.delete(key)
+
+
+class StreamingTests(SimpleTestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.nodes, self.edges = random_graph(70, 8, 20, directed=True)
+
+    def test_floyd_stream_is_paged_under_budget(self):
+        payload = {'nodes': self.nodes, 'edges': self.edges, 'is_directed': True}
+        full = self.client.post('/api/floyd/', payload, format='json').json()
+        steps, body = [], {**payload, 'mode': 'stream'}
+        with mock.patch.dict(output_guard.budgets, {'floyd': 2 * 8 * 8 * 3}):
+            while True:
+                response = self.client.post('/api/floyd/', body, format='json')
+                self.assertTrue(response.is_async)
+                head, *rows = _lines(response)
+                self.assertLessEqual(len(rows), 3)
+                self.assertEqual([row.pop('k') for row in rows], list(range(head['offset'], head['offset'] + len(rows))))
+                steps += rows
+                if head['next_offset'] is None:
+                    break
+                body = {**payload, 'mode': 'stream', 'continuation': head['continuation']}
+        self.assertEqual(steps, full['steps'])
+
+    def test_traversal_stream_is_paged_under_budget(self):
+        nodes = [{'id': i} for i in range(12)]
+        edges = [{'id': f"e{i}", 'from': i, 'to': (i * 5 + 1) % 12} for i in range(12)]
+        edges += [{'id': f"f{i}", 'from': i, 'to': i + 1} for i in range(11)]
+        payload = {'nodes': nodes, 'edges': edges, 'is_directed': True, 'start_node': 0}
+        full = self.client.post('/api/traverse/dfs/', payload, format='json').json()
+        protocol, tree_edges, body = [], [], payload
+        with mock.patch.dict(output_guard.budgets, {'dfs': 4 * (5 + 12)}):
+            while True:
+                response = self.client.post('/api/traverse/dfs/?stream=1', body, format='json')
+                head, *rows, tail = _lines(response)
+                self.assertLessEqual(len(rows), 4)
+                protocol += rows
+                tree_edges += tail['tree_edges']
+                if head['next_offset'] is None:
+                    break
+                body = {**payload, 'continuation': head['continuation']}
+        self.assertEqual((protocol, tree_edges), (full['protocol'], full['tree_edges']))
+
+    def test_streams_are_admitted_by_the_pool(self):
+        payload = {'nodes': self.nodes, 'edges': self.edges, 'start_node': 0}
+        with mock.patch.object(compute_pool, '_acquire', side_effect=Overloaded(3)):
+            for url in ('/api/traverse/bfs/?stream=1', '/api/floyd/?mode=stream'):
+                response = self.client.post(url, payload, format='json')
+                self.assertEqual(response.status_code, 503, url)
+                self.assertEqual(response['Retry-After'], '3')
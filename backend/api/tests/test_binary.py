@@ -0,0 +1,29 @@
+from django.test import SimpleTestCase
+from rest_framework.test import APIClient
+from api.logic.binary import decode_graph, encode_graph
+from api.logic.graph_core import compile_graph
+from api.parsers import GRAPH_MEDIA_TYPE
+from .graphs import cases
+
+
+class BinaryGraphTests(SimpleTestCase):
+    def test_round_trip_compiles_to_the_same_graph(self):
+        for directed in (False, True):
+            for nodes, edges in cases(30, seed=80, directed=directed):
+                ids = [node['id'] for node in nodes]
+                blob = encode_graph(ids, [e['from'] for e in edges], [e['to'] for e in edges], [e['weight'] for e in edges],
+                                    [node['label'] for node in nodes], directed, {'start_node': 0})
+                payload = decode_graph(blob)
+                self.assertEqual(payload['start_node'], 0)
+                packed = compile_graph(payload['nodes'], payload['edges'], payload['is_directed'])
+                plain = compile_graph(nodes, [{**e, 'id': i} for i, e in enumerate(edges)], directed)
+                self.assertEqual(packed.content_hash(), plain.content_hash())
+
+    def test_options_must_be_an_object(self):
+        client = APIClient()
+        for options in ([1], 3, "x"):
+            blob = encode_graph([0, 1], [0], [1], options=options)
+            with self.assertRaises(ValueError):
+                decode_graph(blob)
+            response = client.post('/api/dijkstra/', blob, content_type=GRAPH_MEDIA_TYPE)
+            self.assertEqual(response.status_code, 400, options)
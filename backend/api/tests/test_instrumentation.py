@@ -0,0 +1,30 @@
+import json
+from django.test import AsyncClient, Client, SimpleTestCase
+from .graphs import random_graph
+
+
+class WorkerInstrumentationTests(SimpleTestCase):
+    def setUp(self):
+        nodes, edges = random_graph(100, 40, 120)
+        self.body = json.dumps({'nodes': nodes, 'edges': edges, 'start_node': 0, 'end_node': 39})
+
+    async def test_async_requests_report_worker_memory_and_cpu(self):
+        response = await AsyncClient().post('/api/dijkstra/?timings=1', self.body, content_type='application/json')
+        phases = {item['name']: item for item in json.loads(response.content)['_timings']}
+        self.assertIn('alloc_kb', phases['offload'])
+        self.assertIn('alloc_kb', phases['offload.run_dijkstra'])
+        self.assertGreater(phases['offload']['cpu_ms'], 0)
+        total = response['Server-Timing'].split(', ')[-1]
+        self.assertTrue(total.startswith('total;'), total)
+
+    async def test_async_profile_comes_from_the_worker(self):
+        with self.settings(GRAPH_INSTRUMENTATION={'ENABLED': True, 'ALLOW_PROFILE': True, 'PROFILE_LINES': 40}):
+            response = await AsyncClient().post('/api/dijkstra/?profile=1', self.body, content_type='application/json')
+        profile = '\n'.join(json.loads(response.content)['_profile'])
+        self.assertIn('run_dijkstra', profile)
+        self.assertNotIn('wrap_future', profile)
+
+    def test_sync_requests_keep_thread_measurements(self):
+        response = Client().post('/api/dijkstra/?timings=1', self.body, content_type='application/json')
+        names = [item['name'] for item in response.json()['_timings']]
+        self.assertIn('offload', names)
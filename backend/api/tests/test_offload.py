@@ -0,0 +1,33 @@
+from concurrent.futures import Future
+from django.test import SimpleTestCase
+from api.offload import ComputePool, Overloaded
+
+
+class ComputePoolSlotTests(SimpleTestCase):
+    def setUp(self):
+        self.pool = ComputePool(workers=1, queue=1)
+
+    def test_cancel_after_completion_leaves_flag_clear(self):
+        slot = self.pool._acquire()
+        future = Future()
+        future.set_running_or_notify_cancel()
+        future.set_result(None)
+        self.pool._cancel(slot, future)
+        self.assertEqual(self.pool._flags[slot], 0)
+
+    def test_cancel_of_queued_future_leaves_flag_clear(self):
+        slot = self.pool._acquire()
+        future = Future()
+        self.pool._cancel(slot, future)
+        self.assertTrue(future.cancelled())
+        self.assertEqual(self.pool._flags[slot], 0)
+
+    def test_acquire_clears_stale_flag(self):
+        for slot in range(self.pool.limit):
+            self.pool._flags[slot] = 1
+        slots = [self.pool._acquire() for _ in range(self.pool.limit)]
+        self.assertTrue(all(self.pool._flags[slot] == 0 for slot in slots))
+        with self.assertRaises(Overloaded):
+            self.pool._acquire()
+        self.pool._release(slots[0], 0.0)
+        self.assertEqual(self.pool.pending(), self.pool.limit - 1)
@@ -0,0 +1,84 @@
+import math
+from itertools import islice
+import networkx as nx
+from django.test import SimpleTestCase
+from api.logic.graph_core import compile_graph
+from api.logic.pathfinding import PathFinder
+from .graphs import cases, to_networkx
+
+
+def _finder(nodes, edges, directed):
+    return PathFinder(compile_graph(nodes, edges, directed))
+
+
+class DijkstraTests(SimpleTestCase):
+    def test_all_distances_match_networkx(self):
+        for directed in (False, True):
+            for nodes, edges in cases(150, seed=1, directed=directed):
+                result = _finder(nodes, edges, directed).run_dijkstra('0', None, 'all')
+                expected = nx.single_source_dijkstra_path_length(to_networkx(nodes, edges, directed), 0)
+                for node in nodes:
+                    got = result['distances'][str(node['id'])]
+                    self.assertEqual(got, expected.get(node['id']), (nodes, edges, directed))
+
+    def test_tree_and_bidirectional_paths_are_shortest(self):
+        for directed in (False, True):
+            for nodes, edges in cases(150, seed=2, directed=directed):
+                G = to_networkx(nodes, edges, directed)
+                target = nodes[-1]['id']
+                for mode in ('tree', 'bidirectional'):
+                    result = _finder(nodes, edges, directed).run_dijkstra('0', str(target), mode)
+                    if not nx.has_path(G, 0, target):
+                        self.assertFalse(result['success'])
+                        continue
+                    self.assertEqual(result['total_weight'], nx.dijkstra_path_length(G, 0, target), (mode, edges))
+
+    def test_bellman_ford_handles_negative_weights(self):
+        for nodes, edges in cases(150, seed=3, directed=True, weights=(-3, 9), loops=False):
+            G = to_networkx(nodes, edges, True)
+            target = nodes[-1]['id']
+            result = _finder(nodes, edges, True).run_dijkstra('0', str(target), 'bellman_ford')
+            if nx.negative_edge_cycle(G):
+                continue
+            if not nx.has_path(G, 0, target):
+                self.assertFalse(result['success'])
+                continue
+            self.assertEqual(result['total_weight'], nx.bellman_ford_path_length(G, 0, target), edges)
+
+    def test_k_shortest_matches_simple_paths(self):
+        for nodes, edges in cases(100, seed=4, directed=True, loops=False, parallel=False):
+            G = to_networkx(nodes, edges, True, multi=False)
+            target = nodes[-1]['id']
+            if target == 0 or not nx.has_path(G, 0, target):
+                continue
+            result = _finder(nodes, edges, True).run_dijkstra('0', str(target), 'k_shortest', 3)
+            expected = [nx.path_weight(G, path, 'weight') for path in islice(nx.shortest_simple_paths(G, 0, target, 'weight'), 3)]
+            self.assertEqual([path['total_weight'] for path in result['paths']], expected, edges)
+
+
+class FloydTests(SimpleTestCase):
+    def test_final_matrix_matches_networkx(self):
+        for directed in (False, True):
+            for nodes, edges in cases(100, seed=5, directed=directed):
+                result = _finder(nodes, edges, directed).run_floyd_warshall('final_only')
+                expected = nx.floyd_warshall(to_networkx(nodes, edges, directed))
+                order = [int(node_id) for node_id in result['node_ids']]
+                for i, u in enumerate(order):
+                    for j, v in enumerate(order):
+                        got = result['steps'][-1]['M'][i][j]
+                        want = expected[u][v]
+                        self.assertEqual(math.inf if got == "∞" else got, want, (edges, u, v))
+
+    def test_paged_steps_match_full_run(self):
+        for nodes, edges in cases(30, seed=6, directed=True):
+            full = _finder(nodes, edges, True).run_floyd_warshall('every_k')['steps']
+            steps, offset = [], 0
+            while offset is not None:
+                page = _finder(nodes, edges, True).run_floyd_warshall('every_k', offset, 2)
+                steps += page['steps']
+                offset = page['next_offset']
+            self.assertEqual(steps, full)
+
+    def test_unweighted_edges_are_rejected(self):
+        nodes, edges = [{'id': 0}, {'id': 1}], [{'id': 'a', 'from': 0, 'to': 1}]
+        self.assertFalse(_finder(nodes, edges, False).run_floyd_warshall()['success'])
@@ -0,0 +1,33 @@
+from django.test import SimpleTestCase
+from api.logic.graph_core import compile_graph
+from api.logic.hamiltonian import HamiltonianEngine
+from api.logic.invariants import InvariantsEngine
+from api.logic.search import SearchPool
+from .graphs import cases
+
+
+class ParallelSearchTests(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.pool = SearchPool(workers=2, min_vertices=4)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.pool.shutdown()
+        super().tearDownClass()
+
+    def test_hamiltonian_matches_sequential(self):
+        for directed in (False, True):
+            for nodes, edges in cases(25, seed=40, sizes=(5, 9), density=2.0, directed=directed):
+                graph = compile_graph(nodes, edges, directed)
+                sequential = HamiltonianEngine(graph).search()
+                parallel = HamiltonianEngine(graph, pool=self.pool).search()
+                self.assertEqual(parallel[0], sequential[0], (directed, edges))
+
+    def test_cliques_match_sequential(self):
+        for nodes, edges in cases(25, seed=41, sizes=(5, 12), density=3.0):
+            graph = compile_graph(nodes, edges, False)
+            sequential, parallel = InvariantsEngine(graph), InvariantsEngine(graph, pool=self.pool)
+            self.assertEqual(len(parallel.clique()[0]), len(sequential.clique()[0]), edges)
+            self.assertEqual(len(parallel.independent_set()[0]), len(sequential.independent_set()[0]), edges)
@@ -0,0 +1,71 @@
+import random
+import networkx as nx
+from django.test import SimpleTestCase
+from api.sessions import GraphSession
+from .graphs import random_graph, to_networkx
+
+
+class SessionDeltaTests(SimpleTestCase):
+    def test_components_follow_random_deltas(self):
+        rng = random.Random(50)
+        for seed in range(60):
+            nodes, edges = random_graph(seed, rng.randint(1, 8), rng.randint(0, 10))
+            session = GraphSession(nodes, edges)
+            next_id = len(nodes)
+            for step in range(15):
+                choice = rng.random()
+                if choice < 0.3 or not session.edges:
+                    ids = list(session.nodes)
+                    op = {'op': 'add_edge', 'edge': {'id': f"d{seed}-{step}", 'from': rng.choice(ids), 'to': rng.choice(ids), 'weight': 1}}
+                elif choice < 0.6:
+                    op = {'op': 'remove_edge', 'id': rng.choice(list(session.edges))}
+                elif choice < 0.8 or len(session.nodes) < 2:
+                    op = {'op': 'add_node', 'node': {'id': next_id}}
+                    next_id += 1
+                else:
+                    op = {'op': 'remove_node', 'id': rng.choice(list(session.nodes))}
+                summary = session.apply([op])
+                G = to_networkx(list(session.nodes.values()), list(session.edges.values()))
+                G = nx.relabel_nodes(G, str)
+                G.add_nodes_from(session.nodes)
+                expected = nx.number_connected_components(G)
+                self.assertIn(summary['components_count'], (expected, None))
+                self.assertEqual(session.summary(full=True)['components_count'], expected, (seed, step))
+                self.assertEqual(session.graph().components_count(), expected)
+
+    def test_malformed_ops_raise_value_error(self):
+        session = GraphSession([{'id': 0}], [])
+        for ops in ([1], ['add_node'], {'op': 'add_node'}, [{'op': 'add_node'}], [{'op': 'nope'}],
+                    [{'op': 'add_node', 'node': 5}], [{'op': 'add_edge', 'edge': [1, 2]}],
+                    [{'op': 'add_edge', 'edge': {'from': 0, 'to': 1}}], [{'op': 'set_weight', 'id': 'x'}]):
+            with self.assertRaises(ValueError):
+                session.apply(ops)
+        self.assertEqual(session.summary()['nodes_count'], 1)
+
+    def test_rejected_batch_changes_nothing(self):
+        session = GraphSession([{'id': 0}, {'id': 1}], [{'id': 'a', 'from': 0, 'to': 1, 'weight': 1}])
+        graph = session.graph()
+        before = (dict(session.nodes), dict(session.edges), session.version, session.summary(full=True))
+        batches = [
+            [{'op': 'add_node', 'node': {'id': 2}}, {'op': 'add_edge', 'edge': {'from': 2, 'to': 3}}],
+            [{'op': 'remove_node', 'id': 1}, {'op': 'set_weight', 'id': 'a', 'weight': 5}],
+            [{'op': 'set_weight', 'id': 'a', 'weight': 5}, {'op': 'remove_edge', 'id': 'a'}, {'op': 'remove_edge', 'id': 'a'}],
+            [{'op': 'add_edge', 'edge': {'from': 0, 'to': 0}}, {'op': 'add_edge', 'edge': {'id': 'auto-1', 'from': 0, 'to': 1}}],
+            [{'op': 'remove_node', 'id': 0}, {'op': 'add_node', 'node': {'id': 0}}, {'op': 'remove_edge', 'id': 'a'}],
+        ]
+        for ops in batches:
+            with self.assertRaises(ValueError):
+                session.apply(ops)
+            self.assertEqual((dict(session.nodes), dict(session.edges), session.version, session.summary(full=True)), before)
+            self.assertIs(session.graph(), graph)
+            self.assertEqual(graph.weight.tolist(), [1.0])
+
+    def test_dependent_ops_in_one_batch_are_accepted(self):
+        session = GraphSession([{'id': 0}], [])
+        session.apply([
+            {'op': 'add_node', 'node': {'id': 1}}, {'op': 'add_edge', 'edge': {'from': 0, 'to': 1}},
+            {'op': 'remove_node', 'id': 1}, {'op': 'add_node', 'node': {'id': 1}},
+            {'op': 'add_edge', 'edge': {'id': 'auto-1', 'from': 1, 'to': 0}}, {'op': 'set_weight', 'id': 'auto-1', 'weight': 2},
+        ])
+        self.assertEqual(list(session.edges), ['auto-1'])
+        self.assertEqual(session.summary(full=True)['components_count'], 1)
@@ -0,0 +1,128 @@
+from itertools import combinations, permutations, product
+import networkx as nx
+from django.test import SimpleTestCase
+from api.logic.graph_core import compile_graph
+from api.logic.solvers import GraphSolvers
+from .graphs import cases, to_networkx
+
+
+def _solver(nodes, edges, directed):
+    return GraphSolvers(compile_graph(nodes, edges, directed))
+
+
+def _walk_is_valid(test, result, edges, directed):
+    by_id = {edge['id']: edge for edge in edges}
+    path = [int(label[1:]) for label in result['path']]
+    test.assertEqual(len(path), len(result['edge_ids']) + 1)
+    for u, v, edge_id in zip(path, path[1:], result['edge_ids']):
+        edge = by_id[edge_id]
+        ends = (edge['from'], edge['to'])
+        test.assertTrue(ends == (u, v) or (not directed and ends == (v, u)), (result, edges))
+    return path
+
+
+def _postman_cost(G):
+    odd = [v for v, d in G.degree() if d % 2]
+    if not odd:
+        return 0
+    dist = dict(nx.all_pairs_dijkstra_path_length(G))
+    complete = nx.Graph()
+    for u, v in combinations(odd, 2):
+        complete.add_edge(u, v, weight=dist[u][v])
+    return sum(dist[u][v] for u, v in nx.min_weight_matching(complete))
+
+
+class EulerTests(SimpleTestCase):
+    def test_existence_and_trail_match_networkx(self):
+        for directed in (False, True):
+            for nodes, edges in cases(300, seed=20, sizes=(1, 7), directed=directed):
+                result = _solver(nodes, edges, directed).get_eulerian_info()
+                G = to_networkx([], edges, directed)
+                if not edges:
+                    continue
+                if nx.is_eulerian(G):
+                    expected = 'cycle'
+                elif nx.has_eulerian_path(G):
+                    expected = 'path'
+                else:
+                    expected = 'none'
+                self.assertEqual(result['type'], expected, (directed, edges))
+                if expected != 'none':
+                    path = _walk_is_valid(self, result, edges, directed)
+                    self.assertEqual(sorted(result['edge_ids']), sorted(edge['id'] for edge in edges))
+                    self.assertEqual(path[0] == path[-1], expected == 'cycle')
+
+    def test_postman_route_is_optimal(self):
+        for nodes, edges in cases(200, seed=21, sizes=(2, 7)):
+            G = to_networkx([], edges, False)
+            result = _solver(nodes, edges, False).get_eulerian_info('postman')
+            if not edges or not nx.is_connected(G):
+                continue
+            path = _walk_is_valid(self, result, edges, False)
+            self.assertEqual(path[0], path[-1])
+            self.assertTrue(set(edge['id'] for edge in edges) <= set(result['edge_ids']))
+            weights = {edge['id']: edge['weight'] for edge in edges}
+            self.assertEqual(result['total_weight'], sum(weights[e] for e in result['edge_ids']))
+            self.assertEqual(result['extra_weight'], _postman_cost(G), edges)
+
+    def test_postman_covers_directed_graphs(self):
+        for nodes, edges in cases(200, seed=22, sizes=(2, 6), directed=True):
+            G = to_networkx([], edges, True)
+            result = _solver(nodes, edges, True).get_eulerian_info('postman')
+            if not edges or not nx.is_strongly_connected(G):
+                continue
+            path = _walk_is_valid(self, result, edges, True)
+            self.assertEqual(path[0], path[-1])
+            self.assertTrue(set(edge['id'] for edge in edges) <= set(result['edge_ids']), edges)
+
+
+def _hamiltonian(G, n, directed):
+    simple = nx.DiGraph(G) if directed else nx.Graph(G)
+    has = lambda order: all(simple.has_edge(u, v) for u, v in zip(order, order[1:]))
+    orders = list(permutations(range(n)))
+    if (n > 2 or (n == 2 and directed)) and any(has(order + (order[0],)) for order in orders if order[0] == 0):
+        return 'cycle'
+    return 'path' if any(has(order) for order in orders) else 'none'
+
+
+class HamiltonianTests(SimpleTestCase):
+    def test_matches_brute_force(self):
+        for directed in (False, True):
+            for nodes, edges in cases(250, seed=23, sizes=(2, 7), density=3.0, directed=directed):
+                G = to_networkx(nodes, edges, directed)
+                G.remove_edges_from(list(nx.selfloop_edges(G)))
+                result = _solver(nodes, edges, directed).get_hamiltonian_info()
+                self.assertEqual(result['type'], _hamiltonian(G, len(nodes), directed), (directed, edges))
+                self.assertTrue(result['exact'])
+                if result['type'] == 'none':
+                    continue
+                path = _walk_is_valid(self, result, edges, directed)
+                cycle = result['type'] == 'cycle'
+                self.assertEqual(sorted(path[:-1] if cycle else path), list(range(len(nodes))))
+
+
+def _chromatic(G, n):
+    for k in range(1, n + 1):
+        for colors in product(range(k), repeat=n):
+            if all(colors[u] != colors[v] for u, v in G.edges() if u != v):
+                return k
+    return 0
+
+
+class InvariantsTests(SimpleTestCase):
+    def test_match_networkx(self):
+        for nodes, edges in cases(150, seed=24, sizes=(1, 7), density=1.5):
+            G = nx.Graph(to_networkx(nodes, edges, False))
+            G.remove_edges_from(list(nx.selfloop_edges(G)))
+            result = _solver(nodes, edges, False).get_graph_invariants()
+            self.assertTrue(all(result['exact'].values()))
+            self.assertEqual(result['clique_number'], max(len(c) for c in nx.find_cliques(G)), edges)
+            complement = nx.complement(G)
+            self.assertEqual(result['independence_number'], max(len(c) for c in nx.find_cliques(complement)), edges)
+            self.assertEqual(result['chromatic_number'], _chromatic(G, len(nodes)), edges)
+            coloring = {int(node_id): color for node_id, color in result['coloring'].items()}
+            self.assertTrue(all(coloring[u] != coloring[v] for u, v in G.edges()))
+            clique = [int(label[1:]) for label in result['max_clique']]
+            self.assertTrue(all(G.has_edge(u, v) for u, v in combinations(clique, 2)))
+            independent = [int(label[1:]) for label in result['max_independent_set']]
+            self.assertFalse(any(G.has_edge(u, v) for u, v in combinations(independent, 2)))
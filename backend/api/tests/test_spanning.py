@@ -0,0 +1,54 @@
+import networkx as nx
+from django.test import SimpleTestCase
+from api.logic.graph_core import compile_graph
+from api.logic.spanning import SpanningTree
+from .graphs import cases, to_networkx
+
+
+def _run(nodes, edges, directed, algorithm, view='full', offset=0, limit=None):
+    tree = SpanningTree(compile_graph(nodes, edges, directed))
+    if algorithm == 'kruskal':
+        return tree.run_kruskal(view, offset, limit)
+    return tree.run_prim(None, view, offset, limit)
+
+
+class SpanningTreeTests(SimpleTestCase):
+    def test_minimum_spanning_forest_matches_networkx(self):
+        for directed in (False, True):
+            for nodes, edges in cases(200, seed=30, sizes=(1, 12), weights=(-3, 9), directed=directed):
+                G = to_networkx(nodes, edges, False)
+                weight = sum(data['weight'] for *_, data in nx.minimum_spanning_edges(G, keys=False))
+                components = nx.number_connected_components(G)
+                for algorithm in ('kruskal', 'prim'):
+                    result = _run(nodes, edges, directed, algorithm)
+                    self.assertEqual(result['total_weight'], weight, (algorithm, edges))
+                    self.assertEqual(result['components'], components)
+                    forest = nx.Graph()
+                    forest.add_nodes_from(G)
+                    forest.add_edges_from((int(e['from']), int(e['to'])) for e in result['tree_edges'])
+                    self.assertTrue(nx.is_forest(forest))
+                    self.assertEqual(forest.number_of_edges(), len(nodes) - components)
+
+    def test_parallel_edges_pick_lightest_id(self):
+        nodes = [{'id': 0}, {'id': 1}]
+        edges = [{'id': 'a', 'from': 0, 'to': 1, 'weight': 5}, {'id': 'b', 'from': 1, 'to': 0, 'weight': 2},
+                 {'id': 'c', 'from': 0, 'to': 1, 'weight': 2}]
+        for algorithm in ('kruskal', 'prim'):
+            self.assertEqual([e['id'] for e in _run(nodes, edges, False, algorithm)['tree_edges']], ['b'])
+
+    def test_pages_reassemble_full_protocol(self):
+        for nodes, edges in cases(40, seed=31, sizes=(1, 12)):
+            for algorithm in ('kruskal', 'prim'):
+                for view in ('full', 'delta'):
+                    full = _run(nodes, edges, False, algorithm, view)
+                    protocol, tree_edges, offset = [], [], 0
+                    while offset is not None:
+                        page = _run(nodes, edges, False, algorithm, view, offset, 3)
+                        protocol += page['protocol']
+                        tree_edges += page['tree_edges']
+                        offset = page['next_offset']
+                    self.assertEqual((protocol, tree_edges), (full['protocol'], full['tree_edges']))
+
+    def test_unweighted_edges_are_rejected(self):
+        result = _run([{'id': 0}, {'id': 1}], [{'id': 'a', 'from': 0, 'to': 1}], False, 'kruskal')
+        self.assertIn('error', result)
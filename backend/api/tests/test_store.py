@@ -0,0 +1,62 @@
+from unittest import mock
+import networkx as nx
+from django.test import SimpleTestCase, TestCase
+from rest_framework.test import APIClient
+from api.logic import properties
+from api.logic.graph_core import compile_graph
+from api.models import SavedGraph
+from api.offload import Overloaded, compute_pool
+from .graphs import random_graph
+
+
+def _petersen():
+    G = nx.petersen_graph()
+    return compile_graph([{'id': u} for u in G], [{'id': i, 'from': u, 'to': v} for i, (u, v) in enumerate(G.edges())])
+
+
+class StoredPropertiesTests(SimpleTestCase):
+    def test_undecided_results_are_recomputed_under_a_larger_budget(self):
+        graph = _petersen()
+        small, large = {'time_budget': 5.0, 'step_budget': 1}, {'time_budget': 5.0, 'step_budget': 2_000_000}
+        result, stored = properties.resolve(graph, 'solve', small, {})
+        self.assertEqual(result['hamilton']['type'], 'unknown')
+        self.assertEqual(stored['hamilton']['budget'], [5.0, 1])
+        self.assertEqual(properties.resolve(graph, 'solve', small, stored)[1], {})
+        result, computed = properties.resolve(graph, 'solve', large, stored)
+        self.assertEqual(result['hamilton']['type'], 'path')
+        self.assertTrue(result['hamilton']['exact'])
+        self.assertNotIn('budget', computed['hamilton'])
+        self.assertNotIn('euler', computed)
+        stored.update(computed)
+        self.assertNotIn('hamilton', properties.resolve(graph, 'solve', small, stored)[1])
+
+
+class GraphStoreApiTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        nodes, edges = random_graph(90, 6, 9)
+        self.payload = {'name': 'g', 'nodes': nodes, 'edges': edges}
+
+    def test_saved_graph_serves_precomputed_results(self):
+        created = self.client.post('/api/graphs/', self.payload, format='json')
+        self.assertEqual(created.status_code, 201)
+        graph_id = created.json()['id']
+        self.assertIn('hamilton', SavedGraph.objects.get(pk=graph_id).properties)
+        for url in ('/api/solve/', '/api/analyze/'):
+            response = self.client.post(url, {'graph_id': graph_id}, format='json')
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response['X-Cache'], 'HIT', url)
+        fresh = self.client.post('/api/solve/', {**self.payload, 'is_directed': False}, format='json').json()
+        self.assertEqual(self.client.post('/api/solve/', {'graph_id': graph_id}, format='json').json(), fresh)
+
+    def test_precompute_and_reads_go_through_the_pool(self):
+        with mock.patch.object(compute_pool, '_acquire', side_effect=Overloaded(2)):
+            created = self.client.post('/api/graphs/', self.payload, format='json')
+            self.assertEqual(created.status_code, 201)
+            graph_id = created.json()['id']
+            self.assertEqual(SavedGraph.objects.get(pk=graph_id).properties, {})
+            response = self.client.post('/api/solve/', {'graph_id': graph_id}, format='json')
+            self.assertEqual(response.status_code, 503)
+        response = self.client.post('/api/solve/', {'graph_id': graph_id}, format='json')
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(self.client.post('/api/solve/', {'graph_id': graph_id}, format='json')['X-Cache'], 'HIT')
@@ -0,0 +1,42 @@
+import networkx as nx
+from django.test import SimpleTestCase
+from api.logic.graph_core import compile_graph
+from api.logic.traversals import GraphTraverser
+from .graphs import cases, to_networkx
+
+
+def _pages(graph, kind, start, view, limit):
+    run = getattr(GraphTraverser(graph), f'run_{kind}')
+    protocol, tree_edges, offset, seen = [], [], 0, 0
+    while offset is not None:
+        page = run(start, view, offset, limit)
+        protocol += page['protocol']
+        tree_edges += page['tree_edges']
+        offset = page['next_offset']
+        seen += 1
+        assert seen < 1000, page
+    return protocol, tree_edges, page['total_rows']
+
+
+class TraversalPagingTests(SimpleTestCase):
+    def test_unreachable_vertices_end_paging(self):
+        nodes = [{'id': i} for i in range(1, 6)]
+        edges = [{'id': f"e{i}", 'from': u, 'to': v} for i, (u, v) in enumerate([(2, 1), (2, 3), (3, 4), (4, 5)])]
+        graph = compile_graph(nodes, edges, True)
+        protocol, _, total = _pages(graph, 'dfs', '1', 'full', 3)
+        self.assertEqual(len(protocol), 2)
+        self.assertEqual(total, 2)
+
+    def test_pages_match_full_run(self):
+        for directed in (False, True):
+            for nodes, edges in cases(80, seed=60, sizes=(1, 10), density=1.5, directed=directed):
+                G = to_networkx(nodes, edges, directed)
+                if not nx.is_weakly_connected(G) if directed else not nx.is_connected(G):
+                    continue
+                graph = compile_graph(nodes, edges, directed)
+                for kind in ('dfs', 'bfs'):
+                    for view in ('full', 'delta'):
+                        full = getattr(GraphTraverser(graph), f'run_{kind}')('0', view)
+                        protocol, tree_edges, total = _pages(graph, kind, '0', view, 3)
+                        self.assertEqual((protocol, tree_edges), (full['protocol'], full['tree_edges']), edges)
+                        self.assertEqual(total, 2 * len(nx.descendants(G, 0) | {0}) if directed else 2 * len(nodes))
@@ -1,16 +1,42 @@
 from django.urls import path
 from .views import (
     AnalyzeGraphView, 
+    MatrixTileView,
     SolveGraphView, 
     DijkstraView, 
     FloydView,
-    TraverseView
+    TraverseView,
+    SpanningTreeView,
+    CacheStatsView,
+    MetricsView,
+    BatchView,
+    JobListView,
+    JobDetailView,
+    SessionListView,
+    SessionDetailView,
+    SessionDeltaView,
+    SessionQueryView,
+    GraphListView,
+    GraphDetailView
 )
 
 urlpatterns = [
     path('analyze/', AnalyzeGraphView.as_view()),
+    path('matrix/<str:kind>/', MatrixTileView.as_view()),
     path('solve/', SolveGraphView.as_view()),
     path('dijkstra/', DijkstraView.as_view()),
     path('floyd/', FloydView.as_view(), name='floyd'),
     path('traverse/<str:type>/', TraverseView.as_view()),
+    path('spanning/<str:type>/', SpanningTreeView.as_view()),
+    path('cache/stats/', CacheStatsView.as_view()),
+    path('metrics/', MetricsView.as_view()),
+    path('batch/', BatchView.as_view()),
+    path('jobs/', JobListView.as_view()),
+    path('jobs/<uuid:job_id>/', JobDetailView.as_view()),
+    path('sessions/', SessionListView.as_view()),
+    path('sessions/<str:session_id>/', SessionDetailView.as_view()),
+    path('sessions/<str:session_id>/delta/', SessionDeltaView.as_view()),
+    path('sessions/<str:session_id>/<str:operation>/', SessionQueryView.as_view()),
+    path('graphs/', GraphListView.as_view()),
+    path('graphs/<uuid:graph_id>/', GraphDetailView.as_view()),
 ]
\ No newline at end of file
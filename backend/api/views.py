@@ -1,73 +1,412 @@
+import asyncio
+import logging
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import StreamingHttpResponse
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 import networkx as nx
-import traceback
+from .cache import carry_trees, keep_trees, result_cache, path_tree_cache
+from .batch import batch_runner
+from .instrumentation import metrics
+from .jobs import job_runner
+from .offload import Overloaded, compute_pool
+from .output import output_guard
+from .renderers import MATRIX_MEDIA_TYPE, BinaryMatrixRenderer, FastJSONRenderer, dumps, is_large, streaming_json
+from .sessions import session_store
+from .store import graph_store
+from .logic.binary import encode_matrix
+from .logic.graph_core import compile_graph, node_count
 from .logic.graph_engine import GraphAnalyzer
-from .logic.solvers import GraphSolvers
-from .logic import pathfinding, traversals
+from .logic import spanning, tasks
 
-class AnalyzeGraphView(APIView):
-    def post(self, request):
+logger = logging.getLogger(__name__)
+
+def _solver_budget():
+    budget = settings.GRAPH_SOLVER_BUDGET
+    return budget['TIME'], budget['STEPS']
+
+class AsyncAPIView(APIView):
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
         try:
-            analyzer = GraphAnalyzer(
+            self.initial(request, *args, **kwargs)
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+            response = handler(request, *args, **kwargs)
+            if asyncio.iscoroutine(response):
+                response = await response
+        except Exception as exc:
+            response = self.handle_exception(exc)
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+
+def _busy(error):
+    return Response({"error": str(error)}, status=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    headers={'Retry-After': str(error.retry_after)})
+
+
+async def _payload(request):
+    if not request.data.get('graph_id'):
+        return request.data
+    return await sync_to_async(graph_store.payload)(request.data)
+
+
+def _hashed_graph(nodes, edges, is_directed):
+    graph = compile_graph(nodes, edges, is_directed)
+    graph.content_hash()
+    return graph
+
+
+async def _compile(nodes, edges, is_directed):
+    return await asyncio.to_thread(_hashed_graph, nodes, edges, is_directed)
+
+
+class AnalyzeGraphView(AsyncAPIView):
+    async def post(self, request):
+        params = {
+            'matrix_format': request.data.get('matrix_format', tasks.DEFAULT_MATRIX_FORMAT),
+            'fields': request.data.get('fields') or request.query_params.get('fields'),
+        }
+        if request.data.get('graph_id'):
+            return await _stored_result(request, 'analyze', params)
+        try:
+            graph = await _compile(
                 request.data.get('nodes', []), 
                 request.data.get('edges', []), 
                 request.data.get('is_directed', False)
             )
-            return Response(analyzer.get_all_properties())
+            params = output_guard.compact(graph.n, graph.m, params)
+            result, hit = await compute_pool.run_cached('analyze', graph, params)
+            headers = {'X-Cache': 'HIT' if hit else 'MISS', 'X-Matrix-Format': params['matrix_format']}
+            if is_large(graph.n * (graph.n + graph.m)):
+                return streaming_json(result, **{key.replace('-', '_'): value for key, value in headers.items()})
+            return Response(result, headers=headers)
+        except Overloaded as e:
+            return _busy(e)
         except Exception as e:
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
-class SolveGraphView(APIView):
-    def post(self, request):
+async def _stored_result(request, kind, params):
+    record = await sync_to_async(graph_store.require)(request.data['graph_id'])
+    try:
+        if kind == 'analyze':
+            params = output_guard.compact(record.nodes_count, record.edges_count, params)
+        result, hit = await graph_store.resolve(record, kind, params)
+    except Overloaded as e:
+        return _busy(e)
+    except Exception as e:
+        return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    headers = {'X-Cache': 'HIT' if hit else 'MISS', 'X-Graph-Hash': record.content_hash}
+    if kind == 'analyze':
+        headers['X-Matrix-Format'] = params['matrix_format']
+    if kind == 'analyze' and is_large(record.nodes_count * (record.nodes_count + record.edges_count)):
+        return streaming_json(result, **{key.replace('-', '_'): value for key, value in headers.items()})
+    return Response(result, headers=headers)
+
+class MatrixTileView(APIView):
+    renderer_classes = [FastJSONRenderer, BinaryMatrixRenderer]
+
+    def post(self, request, kind):
+        data = graph_store.payload(request.data)
         try:
-            solver = GraphSolvers(
+            analyzer = GraphAnalyzer(compile_graph(
+                data.get('nodes', []),
+                data.get('edges', []),
+                data.get('is_directed', False)
+            ))
+            fmt = data.get('format', 'dense')
+            if request.accepted_media_type == MATRIX_MEDIA_TYPE:
+                shape, rows, cols, tile = analyzer.matrix_window(kind, data.get('rows'), data.get('cols'), fmt)
+                return Response(encode_matrix(tile, fmt), headers={
+                    'X-Matrix-Shape': f"{shape[0]}x{shape[1]}",
+                    'X-Matrix-Window': f"{rows[0]}:{rows[1]},{cols[0]}:{cols[1]}",
+                })
+            return Response(analyzer.get_matrix_tile(kind, data.get('rows'), data.get('cols'), fmt))
+        except Exception as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST, content_type='application/json')
+
+class SolveGraphView(AsyncAPIView):
+    async def post(self, request):
+        budget = dict(zip(('time_budget', 'step_budget'), _solver_budget()))
+        budget['euler_mode'] = request.data.get('euler_mode', 'auto')
+        if request.data.get('graph_id'):
+            return await _stored_result(request, 'solve', budget)
+        try:
+            graph = await _compile(
                 request.data.get('nodes', []),
                 request.data.get('edges', []),
                 request.data.get('is_directed', False)
             )
-            return Response(solver.get_all_solutions())
+            result, hit = await compute_pool.run_cached('solve', graph, budget)
+            return Response(result, headers={'X-Cache': 'HIT' if hit else 'MISS'})
+        except Overloaded as e:
+            return _busy(e)
         except Exception as e:
-            print(f"DEBUG: Error in SolveGraphView: {str(e)}")
-            traceback.print_exc()
-            return Response({"error": str(e)}, status=400)
+            logger.exception("SolveGraphView failed")
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
-class DijkstraView(APIView):
-    def post(self, request):
-        data = request.data
-        result = pathfinding.run_dijkstra(
-            data['nodes'], 
-            data['edges'], 
-            data.get('is_directed', False),
-            data['start_node'],
-            data['end_node']
-        )
-        return Response(result)
+class DijkstraView(AsyncAPIView):
+    async def post(self, request):
+        data = await _payload(request)
+        try:
+            graph = await _compile(data['nodes'], data['edges'], data.get('is_directed', False))
+            params = {key: data.get(key) for key in ('start_node', 'end_node', 'k', 'sources')}
+            params = carry_trees(graph, {**params, 'mode': data.get('mode', 'tree')})
+            return Response(keep_trees(await compute_pool.run('dijkstra', graph, params)))
+        except Overloaded as e:
+            return _busy(e)
+        except Exception as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
     
-class FloydView(APIView):
-    def post(self, request):
-        data = request.data
+class FloydView(AsyncAPIView):
+    async def post(self, request):
+        data = await _payload(request)
         is_directed = data.get('is_directed', data.get('isDirected', False))
-        result = pathfinding.run_floyd(
-            data['nodes'], 
-            data['edges'], 
-            is_directed
-        )
-        return Response(result)
+        mode = data.get('mode', request.query_params.get('mode', 'every_k'))
+        # stream writes the same snapshots as every_k, page by page under the same budget
+        params = {'mode': 'every_k' if mode == 'stream' else mode}
+        try:
+            n = node_count(data['nodes'])
+            graph = await _compile(data['nodes'], data['edges'], is_directed)
+            paged = data.get('continuation') or (params['mode'] == 'every_k' and output_guard.over('floyd', n, 0, params))
+            if paged:
+                result = await _page('floyd', graph, params, data.get('continuation'))
+            else:
+                result = await compute_pool.run('floyd', graph, params)
+            if mode == 'stream' and result.get('success'):
+                return StreamingHttpResponse(_ndjson_floyd(result), content_type='application/x-ndjson')
+            if not paged and mode == 'every_k' and is_large(n ** 3) and result.get('success'):
+                return streaming_json(result)
+            return Response(result)
+        except Overloaded as e:
+            return _busy(e)
+        except Exception as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
-class TraverseView(APIView):
-    def post(self, request, type):
+
+async def _page(kind, graph, params, token=None):
+    offset = 0
+    if token:
+        offset, params = output_guard.resume(token, kind, graph.content_hash())
+    limit = output_guard.limit(kind, graph.n, params)
+    result = await compute_pool.run(kind, graph, {**params, 'offset': offset, 'limit': limit})
+    return output_guard.continued(kind, graph.content_hash(), result, params)
+
+
+async def _ndjson_floyd(result):
+    steps = result.pop('steps')
+    yield dumps(result) + b"\n"
+    for k, step in enumerate(steps, result.get('offset', 0)):
+        yield dumps({"k": k, **step}) + b"\n"
+
+class TraverseView(AsyncAPIView):
+    kinds = ('dfs', 'bfs')
+    fallback = 'bfs'
+
+    async def post(self, request, type):
+        kind = type if type in self.kinds else self.fallback
+        if kind is None:
+            return Response({"error": f"Невідомий алгоритм: {type}. Доступні: {', '.join(self.kinds)}."},
+                            status=status.HTTP_400_BAD_REQUEST)
+        data = await _payload(request)
         try:
-            data = request.data
-            nodes = data.get('nodes', [])
-            edges = data.get('edges', [])
-            is_directed = data.get('is_directed', False)
-            start_node = data.get('start_node')
-            if type == 'dfs':
-                result = traversals.run_dfs(nodes, edges, is_directed, start_node)
+            graph = await _compile(
+                data.get('nodes', []),
+                data.get('edges', []),
+                data.get('is_directed', False)
+            )
+            view = data.get('view', request.query_params.get('view', 'full'))
+            stream = data.get('stream', request.query_params.get('stream')) in (True, '1', 'true')
+            params = {'start_node': data.get('start_node'), 'view': view}
+            paged = data.get('continuation') or output_guard.over(kind, graph.n, graph.m, params)
+            if paged:
+                result = await _page(kind, graph, params, data.get('continuation'))
             else:
-                result = traversals.run_bfs(nodes, edges, is_directed, start_node)
+                result = await compute_pool.run(kind, graph, params)
+            if 'protocol' not in result:
+                return Response(result)
+            if stream:
+                return StreamingHttpResponse(_ndjson_traversal(result), content_type='application/x-ndjson')
+            if not paged and is_large(graph.n + graph.m):
+                return streaming_json(result)
             return Response(result)
+        except Overloaded as e:
+            return _busy(e)
+        except Exception as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+
+class SpanningTreeView(TraverseView):
+    kinds = spanning.SPANNING_ALGORITHMS
+    fallback = None
+
+
+async def _ndjson_traversal(result):
+    protocol, tree_edges = result.pop('protocol'), result.pop('tree_edges')
+    yield dumps(result) + b"\n"
+    for row in protocol:
+        yield dumps(row) + b"\n"
+    yield dumps({"tree_edges": tree_edges}) + b"\n"
+
+class CacheStatsView(APIView):
+    def get(self, request):
+        return Response(result_cache.stats())
+
+    def delete(self, request):
+        result_cache.clear()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class MetricsView(APIView):
+    def get(self, request):
+        return Response({**metrics.snapshot(), 'cache': result_cache.stats()})
+
+    def delete(self, request):
+        metrics.reset()
+        return Response(metrics.snapshot())
+
+
+class BatchView(AsyncAPIView):
+    async def post(self, request):
+        data = await _payload(request)
+        try:
+            graph = await _compile(
+                data.get('nodes', []),
+                data.get('edges', []),
+                data.get('is_directed', False)
+            )
+            defaults = dict(zip(('time_budget', 'step_budget'), _solver_budget()))
+            return Response(await batch_runner.run(graph, data.get('operations'), defaults))
+        except Overloaded as e:
+            return _busy(e)
         except Exception as e:
-            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
\ No newline at end of file
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+
+class JobListView(APIView):
+    def post(self, request):
+        kind = request.data.get('kind')
+        if kind not in tasks.TASKS:
+            return Response(
+                {"error": f"Невідомий тип задачі: {kind}. Доступні: {', '.join(tasks.TASKS)}."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            timeout = job_runner.time_limit(request.data.get('timeout'))
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        budget = settings.GRAPH_JOBS['SOLVER_BUDGET']
+        payload = {**graph_store.payload(request.data), 'time_budget': min(budget['TIME'], timeout), 'step_budget': budget['STEPS']}
+        job_id = job_runner.submit(kind, payload, timeout)
+        return Response({'id': job_id, 'kind': kind, 'status': 'queued', 'timeout': timeout}, status=status.HTTP_202_ACCEPTED)
+
+class JobDetailView(APIView):
+    def get(self, request, job_id):
+        job = job_runner.store.get(job_id)
+        if job is None:
+            return Response({"error": "Задачу не знайдено"}, status=status.HTTP_404_NOT_FOUND)
+        return Response(job)
+
+    def delete(self, request, job_id):
+        job = job_runner.cancel(job_id)
+        if job is None:
+            return Response({"error": "Задачу не знайдено"}, status=status.HTTP_404_NOT_FOUND)
+        return Response(job)
+
+
+class SessionListView(APIView):
+    def post(self, request):
+        data = graph_store.payload(request.data)
+        session = session_store.create(
+            data.get('nodes', []),
+            data.get('edges', []),
+            data.get('is_directed', False)
+        )
+        return Response(session.summary(), status=status.HTTP_201_CREATED)
+
+class SessionDetailView(APIView):
+    def get(self, request, session_id):
+        session = session_store.get(session_id)
+        if session is None:
+            return Response({"error": "Сесію не знайдено або вона застаріла"}, status=status.HTTP_404_NOT_FOUND)
+        return Response(session.summary(full=True))
+
+    def delete(self, request, session_id):
+        session_store.delete(session_id)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+class SessionDeltaView(APIView):
+    def post(self, request, session_id):
+        session = session_store.get(session_id)
+        if session is None:
+            return Response({"error": "Сесію не знайдено або вона застаріла"}, status=status.HTTP_404_NOT_FOUND)
+        try:
+            return Response(session.apply(request.data.get('ops', [])))
+        except ValueError as e:
+            return Response({"error": str(e), **session.summary()}, status=status.HTTP_400_BAD_REQUEST)
+
+class SessionQueryView(APIView):
+    def post(self, request, session_id, operation):
+        session = session_store.get(session_id)
+        if session is None:
+            return Response({"error": "Сесію не знайдено або вона застаріла"}, status=status.HTTP_404_NOT_FOUND)
+        if operation not in tasks.TASKS:
+            return Response(
+                {"error": f"Невідома операція: {operation}. Доступні: {', '.join(tasks.TASKS)}."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            params = dict(request.data)
+            params['time_budget'], params['step_budget'] = _solver_budget()
+            with session.lock:
+                graph = session.graph()
+                bounded, paged = output_guard.bound(operation, graph.n, graph.m, params)
+                bounded = {**bounded, 'tree_cache': path_tree_cache}
+                result, hit = result_cache.get_or_compute(
+                    tasks.cache_namespace(operation, bounded), graph.content_hash(),
+                    lambda: tasks.run_task(operation, graph, bounded)
+                ) if operation in ('analyze', 'solve') else (tasks.run_task(operation, graph, bounded), False)
+                if paged:
+                    result = output_guard.continued(operation, graph.content_hash(), result, params)
+            return Response(result, headers={'X-Cache': 'HIT' if hit else 'MISS', 'X-Session-Version': str(session.version)})
+        except Exception as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+
+class GraphListView(AsyncAPIView):
+    async def get(self, request):
+        return Response(await sync_to_async(graph_store.list)())
+
+    async def post(self, request):
+        try:
+            record = await graph_store.create(request.data, dict(zip(('time_budget', 'step_budget'), _solver_budget())))
+        except Exception as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(graph_store.summary(record), status=status.HTTP_201_CREATED)
+
+class GraphDetailView(APIView):
+    def get(self, request, graph_id):
+        return Response(graph_store.summary(graph_store.require(graph_id), full=True))
+
+    def patch(self, request, graph_id):
+        record = graph_store.require(graph_id)
+        try:
+            graph_store.update(record, request.data)
+        except Exception as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(graph_store.summary(record, full=True))
+
+    put = patch
+
+    def delete(self, request, graph_id):
+        graph_store.require(graph_id).delete()
+        return Response(status=status.HTTP_204_NO_CONTENT)
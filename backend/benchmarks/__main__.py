@@ -0,0 +1,42 @@
+import argparse
+import json
+import sys
+from .generators import GENERATORS
+from .suite import METHODS, compare, run
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description='Benchmarks for api.logic modules')
+    parser.add_argument('--methods', help=f"comma-separated subset of: {', '.join(METHODS)}")
+    parser.add_argument('--generators', help=f"comma-separated subset of: {', '.join(GENERATORS)}")
+    parser.add_argument('--quick', action='store_true', help='only the smaller sizes of each sweep')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='write results as JSON to this file')
+    parser.add_argument('--baseline', help='compare against a previously written results file')
+    parser.add_argument('--threshold', type=float, default=1.25, help='slowdown ratio treated as a regression')
+    parser.add_argument('--min-ms', type=float, default=1.0, help='ignore slowdowns smaller than this')
+    args = parser.parse_args(argv)
+
+    split = lambda value: set(value.split(',')) if value else None
+    results = run(
+        split(args.methods), split(args.generators), args.quick, args.repeat, args.seed,
+        log=lambda name, r: print(f"{name:<70} {r['min_ms']:>10.2f} ms {r['peak_kb']:>10.1f} KiB", flush=True)
+    )
+    if args.output:
+        with open(args.output, 'w') as fh:
+            json.dump(results, fh, indent=2)
+
+    if not args.baseline:
+        return 0
+    with open(args.baseline) as fh:
+        report = compare(results, json.load(fh), args.threshold, args.min_ms)
+    regressions = [r for r in report if r['regressed']]
+    for r in regressions:
+        print(f"REGRESSION {r['name']}: {r['baseline_ms']} ms -> {r['current_ms']} ms (x{r['ratio']})")
+    print(f"{len(report)} cases compared, {len(regressions)} regressions")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
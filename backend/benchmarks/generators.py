@@ -0,0 +1,80 @@
+import math
+import random
+
+
+def _nodes(n):
+    return [{'id': i, 'label': f"v{i}"} for i in range(n)]
+
+
+def _edge(rnd, k, u, v):
+    return {'id': f"e{k}", 'from': u, 'to': v, 'weight': rnd.randint(1, 20), 'hasWeight': True}
+
+
+def _pack(rnd, n, pairs, directed):
+    edges = [_edge(rnd, k, u, v) for k, (u, v) in enumerate(pairs)]
+    return {'nodes': _nodes(n), 'edges': edges, 'is_directed': directed}
+
+
+def erdos_renyi(n, p, directed=False, seed=0):
+    rnd = random.Random(seed)
+    pairs = []
+    for u in range(n):
+        for v in (range(n) if directed else range(u + 1, n)):
+            if u != v and rnd.random() < p:
+                pairs.append((u, v))
+    return _pack(rnd, n, pairs, directed)
+
+
+def grid(rows, cols, directed=False, seed=0):
+    rnd = random.Random(seed)
+    pairs = []
+    for r in range(rows):
+        for c in range(cols):
+            u = r * cols + c
+            if c + 1 < cols:
+                pairs.append((u, u + 1))
+            if r + 1 < rows:
+                pairs.append((u, u + cols))
+    return _pack(rnd, rows * cols, pairs, directed)
+
+
+def scale_free(n, m=2, directed=False, seed=0):
+    rnd = random.Random(seed)
+    pairs, targets = [], list(range(min(m, n)))
+    pool = []
+    for u in range(len(targets), n):
+        for v in set(targets):
+            pairs.append((u, v))
+            pool += [u, v]
+        targets = [rnd.choice(pool) for _ in range(m)]
+    return _pack(rnd, n, pairs, directed)
+
+
+def complete(n, directed=False, seed=0):
+    rnd = random.Random(seed)
+    pairs = [(u, v) for u in range(n) for v in range(n) if u != v and (directed or u < v)]
+    return _pack(rnd, n, pairs, directed)
+
+
+def multigraph(n, m, directed=False, seed=0, loop_rate=0.05, parallel_rate=0.2):
+    rnd = random.Random(seed)
+    pairs = [(u - 1, u) for u in range(1, n)]
+    while len(pairs) < m:
+        roll = rnd.random()
+        if roll < loop_rate:
+            u = rnd.randrange(n)
+            pairs.append((u, u))
+        elif roll < loop_rate + parallel_rate:
+            pairs.append(rnd.choice(pairs))
+        else:
+            pairs.append((rnd.randrange(n), rnd.randrange(n)))
+    return _pack(rnd, n, pairs, directed)
+
+
+GENERATORS = {
+    'erdos_renyi': lambda n, directed, seed: erdos_renyi(n, min(1.0, 2 * math.log(max(n, 2)) / max(n, 1)), directed, seed),
+    'grid': lambda n, directed, seed: grid(max(1, int(n ** 0.5)), max(1, n // max(1, int(n ** 0.5))), directed, seed),
+    'scale_free': lambda n, directed, seed: scale_free(n, 2, directed, seed),
+    'complete': lambda n, directed, seed: complete(n, directed, seed),
+    'multigraph': lambda n, directed, seed: multigraph(n, 3 * n, directed, seed),
+}
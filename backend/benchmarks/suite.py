@@ -0,0 +1,116 @@
+import gc
+import platform
+import statistics
+import time
+import tracemalloc
+import networkx as nx
+import numpy as np
+from api.logic.graph_core import compile_graph
+from api.logic.graph_engine import GraphAnalyzer
+from api.logic.pathfinding import PathFinder
+from api.logic.solvers import GraphSolvers
+from api.logic.traversals import GraphTraverser
+from .generators import GENERATORS
+
+GENERATOR_LIMITS = {'complete': 200}
+SOLVER_TIME_BUDGET = 2.0
+
+
+def _graph(payload):
+    return compile_graph(payload['nodes'], payload['edges'], payload['is_directed'])
+
+
+def _last_id(payload):
+    return payload['nodes'][-1]['id']
+
+
+METHODS = {
+    'compile_graph': ((1000, 10000, 50000), lambda p: lambda: _graph(p)),
+    'get_all_properties': ((50, 200, 800), lambda p: GraphAnalyzer(_graph(p)).get_all_properties),
+    'run_floyd_warshall': ((50, 150, 400), lambda p: lambda g=PathFinder(_graph(p)): g.run_floyd_warshall('final_only')),
+    'run_floyd_warshall_every_k': ((20, 50, 100), lambda p: lambda g=PathFinder(_graph(p)): g.run_floyd_warshall('every_k')),
+    'run_dijkstra': ((200, 2000, 20000), lambda p: lambda g=PathFinder(_graph(p)): g.run_dijkstra(0, _last_id(p))),
+    'get_all_solutions': ((8, 12, 16), lambda p: GraphSolvers(_graph(p), time_budget=SOLVER_TIME_BUDGET).get_all_solutions),
+    'run_dfs': ((200, 2000, 20000), lambda p: lambda g=GraphTraverser(_graph(p)): g.run_dfs(0)),
+    'run_bfs': ((200, 2000, 20000), lambda p: lambda g=GraphTraverser(_graph(p)): g.run_bfs(0)),
+}
+
+QUICK_SIZES = 2
+
+
+def cases(methods=None, generators=None, quick=False, seed=0):
+    for method, (sizes, setup) in METHODS.items():
+        if methods and method not in methods:
+            continue
+        for generator, build in GENERATORS.items():
+            if generators and generator not in generators:
+                continue
+            for n in sizes[:QUICK_SIZES] if quick else sizes:
+                if n > GENERATOR_LIMITS.get(generator, n):
+                    continue
+                for directed in (False, True):
+                    name = f"{method}/{generator}/{'directed' if directed else 'undirected'}/n={n}"
+                    yield name, setup, (lambda n=n, d=directed, b=build: b(n, d, seed))
+
+
+def measure(setup, payload, repeat):
+    timings = []
+    for _ in range(repeat):
+        fn = setup(payload)
+        gc.collect()
+        started = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    fn = setup(payload)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {
+        'min_ms': round(min(timings), 3),
+        'median_ms': round(statistics.median(timings), 3),
+        'peak_kb': round(peak / 1024, 1),
+    }
+
+
+def run(methods=None, generators=None, quick=False, repeat=3, seed=0, log=None):
+    results = {}
+    for name, setup, build in cases(methods, generators, quick, seed):
+        payload = build()
+        results[name] = {'nodes': len(payload['nodes']), 'edges': len(payload['edges']), **measure(setup, payload, repeat)}
+        if log:
+            log(name, results[name])
+    return {
+        'meta': {
+            'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'networkx': nx.__version__,
+            'machine': platform.machine(),
+            'repeat': repeat,
+            'seed': seed,
+        },
+        'results': results,
+    }
+
+
+def compare(current, baseline, threshold=1.25, min_ms=1.0):
+    report = []
+    for name, now in current['results'].items():
+        before = baseline['results'].get(name)
+        if before is None:
+            continue
+        ratio = now['min_ms'] / before['min_ms'] if before['min_ms'] else float('inf')
+        regressed = ratio > threshold and now['min_ms'] - before['min_ms'] > min_ms
+        report.append({
+            'name': name,
+            'baseline_ms': before['min_ms'],
+            'current_ms': now['min_ms'],
+            'ratio': round(ratio, 3),
+            'peak_ratio': round(now['peak_kb'] / before['peak_kb'], 3) if before['peak_kb'] else None,
+            'regressed': regressed,
+        })
+    return report
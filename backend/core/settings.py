@@ -22,6 +22,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'api.instrumentation.InstrumentationMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -59,6 +60,66 @@ DATABASES = {
     }
 }
 
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'graph_results': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': BASE_DIR / 'graph_cache',
+        'TIMEOUT': 600,
+        'OPTIONS': {'MAX_ENTRIES': 1000},
+    },
+}
+
+GRAPH_RESULT_CACHE = {
+    'BACKEND': os.environ.get('GRAPH_CACHE_BACKEND', 'memory'),
+    'ALIAS': 'graph_results',
+    'MAX_ENTRIES': 256,
+    'PATH_TREES': 512,
+    'TTL': 600,
+}
+
+GRAPH_SOLVER_BUDGET = {
+    'TIME': 5.0,
+    'STEPS': 2_000_000,
+}
+
+GRAPH_JOBS = {
+    'STORE': os.environ.get('GRAPH_JOBS_STORE', 'memory'),
+    'WORKERS': 2,
+    'TIMEOUT': 120,
+    'RETENTION': 3600,
+    'SOLVER_BUDGET': {'TIME': 60.0, 'STEPS': 50_000_000},
+}
+
+GRAPH_COMPUTE = {
+    'WORKERS': int(os.environ.get('GRAPH_COMPUTE_WORKERS', min(4, os.cpu_count() or 1))),
+    'QUEUE': int(os.environ.get('GRAPH_COMPUTE_QUEUE', 16)),
+    'SEARCH_WORKERS': int(os.environ.get('GRAPH_SEARCH_WORKERS', max(1, (os.cpu_count() or 1) // min(4, os.cpu_count() or 1)))),
+}
+
+GRAPH_BATCH = {
+    'WORKERS': 4,
+    'MAX_OPERATIONS': 32,
+}
+
+GRAPH_INSTRUMENTATION = {
+    'ENABLED': True,
+    'ALLOW_PROFILE': DEBUG,
+    'PROFILE_DIR': os.environ.get('GRAPH_PROFILE_DIR'),
+    'PROFILE_LINES': 30,
+}
+
+GRAPH_STORE = {
+    'PRECOMPUTE': ('analyze', 'solve'),
+}
+
+GRAPH_SESSIONS = {
+    'MAX_SESSIONS': 128,
+    'TTL': 3600,
+}
+
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator'},
     {'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator'},
@@ -92,7 +153,30 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.AllowAny',
     ],
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
-        'rest_framework.renderers.BrowsableAPIRenderer',
+        'api.renderers.FastJSONRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'api.parsers.FastJSONParser',
+        'api.parsers.BinaryGraphParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
     ]
+}
+
+GRAPH_STREAMING = {
+    'MIN_CELLS': int(os.environ.get('GRAPH_STREAM_MIN_CELLS', 1_000_000)),
+    'CHUNK_SIZE': 64 * 1024,
+}
+
+GRAPH_OUTPUT_BUDGET = int(os.environ.get('GRAPH_OUTPUT_BUDGET', 20_000_000))
+
+GRAPH_OUTPUT = {
+    'BUDGETS': {
+        'analyze': int(os.environ.get('GRAPH_OUTPUT_BUDGET_ANALYZE', GRAPH_OUTPUT_BUDGET)),
+        'floyd': int(os.environ.get('GRAPH_OUTPUT_BUDGET_FLOYD', GRAPH_OUTPUT_BUDGET)),
+        'dfs': int(os.environ.get('GRAPH_OUTPUT_BUDGET_TRAVERSE', GRAPH_OUTPUT_BUDGET)),
+        'bfs': int(os.environ.get('GRAPH_OUTPUT_BUDGET_TRAVERSE', GRAPH_OUTPUT_BUDGET)),
+        'kruskal': int(os.environ.get('GRAPH_OUTPUT_BUDGET_SPANNING', GRAPH_OUTPUT_BUDGET)),
+        'prim': int(os.environ.get('GRAPH_OUTPUT_BUDGET_SPANNING', GRAPH_OUTPUT_BUDGET)),
+    },
 }
\ No newline at end of file
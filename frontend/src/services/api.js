@@ -25,7 +25,10 @@ const formatGraphData = (nodes, edges, isDirected) => {
 export const graphApi = {
   analyze: async (nodes, edges, isDirected) => {
     try {
-      const response = await apiClient.post('/analyze/', formatGraphData(nodes, edges, isDirected));
+      const response = await apiClient.post('/analyze/', {
+        ...formatGraphData(nodes, edges, isDirected),
+        matrix_format: 'dense'
+      });
       return response.data;
     } catch (error) {
       console.error("Помилка при аналізі графа:", error);